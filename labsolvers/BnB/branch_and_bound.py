@@ -0,0 +1,329 @@
+import time
+from math import isclose
+from labsolvers.common.problem import ProblemHandler
+from labsolvers.common.lp_backend import LPSolveError
+from labsolvers.common.local_search import improve_clique, round_to_clique
+from labsolvers.common.reduced_cost import reduced_cost_fixings
+from labsolvers.common.stats import SolverStats
+from labsolvers.common.checkpoint import open_nodes, save_checkpoint
+from labsolvers.common.events import SearchStopped, global_bound
+from labsolvers.common.node_store import NodeStore
+
+
+class BnBTimeoutException(Exception):
+    pass
+
+
+class BranchAndBound:
+
+    def __init__(self, problem: ProblemHandler, initial_obj_value: float, initial_solution: list,
+                 abs_tol: float = 1e-4, time_limit: int = None, stats: SolverStats = None,
+                 checkpoint_path: str = None, checkpoint_interval: float = 600, reduced_cost_fixing: bool = True,
+                 shared_incumbent=None, primal_interval: int = 10, primal_steps: int = 50,
+                 node_store: NodeStore = None):
+        self.call_counter = 0
+        self.problem = problem
+        self.best_obj_value = initial_obj_value
+        self.best_solution = initial_solution
+        self.abs_tol = abs_tol
+        self.start_time = None
+        self.time_limit = time_limit
+        self.stats = stats if stats is not None else SolverStats()
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self.last_checkpoint_time = None
+        self.branch_path = []
+        # LP bound of the node that made each branching in branch_path
+        self.node_bounds = []
+        self.pending_nodes = []
+        self.reduced_cost_fixing = reduced_cost_fixing
+        self.constrained_vars = [False] * problem.graph.number_of_nodes()
+        # SharedIncumbent of a portfolio run, None when solving alone
+        self.shared_incumbent = shared_incumbent
+        # Size of the best clique of the other portfolio processes, only used for pruning
+        self.shared_bound = 0
+        # LP rounding heuristic every primal_interval nodes, 0 turns it off
+        self.primal_interval = primal_interval
+        self.primal_steps = primal_steps
+        # Open nodes of run_best_first(), None for the depth-first run()
+        self.node_store = node_store
+        # Set when a subtree is given up without being searched, so a finished search proves nothing
+        self.incomplete = False
+
+    @property
+    def lp_solve_counter(self) -> int:
+        return self.stats.phase_counts["lp_solve"]
+
+    def run(self, depth=0):
+        self.call_counter += 1
+        if self.start_time is None:
+            self.start_time = time.time()
+            self.last_checkpoint_time = self.start_time
+            self.stats.incumbent(self.best_obj_value)
+        if self.stats.stop_requested:
+            print("Stopped by observer")
+            if self.checkpoint_path is not None:
+                self.save_checkpoint()
+            raise SearchStopped
+        if self.shared_incumbent is not None:
+            self.sync_incumbent()
+        started = time.perf_counter()
+        try:
+            solved = self.problem.model.solve()
+        except LPSolveError as error:
+            print(error)
+            self.incomplete = True
+            return
+        finally:
+            self.stats.add("lp_solve", started)
+        if not solved:
+            # Infeasible node: the branching fixed two non-adjacent vertices to 1
+            return
+        current_obj_value = self.problem.model.get_objective_value()
+        self.stats.node(depth, current_obj_value)
+        self.update_bound(current_obj_value)
+
+        if int(current_obj_value + self.abs_tol) <= self.prune_bound:
+            return
+        current_solution = self.problem.model.get_values()
+
+        # If all variables are integer (= current_obj_value also integer)
+        # -> not branching anymore, this is the best solution in nearest area
+        if self.is_all_integer(current_solution, abs_tol=self.abs_tol):
+            clique_nodes = self._get_clique(current_solution)
+            # This check is redundant, but just not to ruin hours of calculations...
+            started = time.perf_counter()
+            is_clique = self.is_clique(self.problem.graph, clique_nodes)
+            self.stats.add("clique_check", started)
+            if not is_clique:
+                print("Error: found solution is not a clique")
+                self.incomplete = True
+                return
+            print(f'Found better clique: {round(current_obj_value)}')
+            self.best_solution = current_solution
+            self.best_obj_value = round(current_obj_value)
+            self.stats.incumbent(self.best_obj_value)
+            return
+        if self.primal_interval and self.call_counter % self.primal_interval == 0:
+            self.primal_heuristic(current_solution)
+            if int(current_obj_value + self.abs_tol) <= self.prune_bound:
+                return
+
+        if time.time() - self.start_time > self.time_limit:
+            print(f"Stopped by timeout {self.time_limit}s")
+            if self.checkpoint_path is not None:
+                self.save_checkpoint()
+            raise BnBTimeoutException
+        if self.checkpoint_path is not None and time.time() - self.last_checkpoint_time > self.checkpoint_interval:
+            self.save_checkpoint()
+
+        started = time.perf_counter()
+        branching_var_index = self.choose_branch(current_solution)
+        self.stats.add("branching", started)
+        if branching_var_index is None:
+            return
+        fixings = self.fix_by_reduced_costs(current_obj_value, current_solution)
+        try:
+            rounded_value = round(current_solution[branching_var_index])
+            if self.node_store is not None:
+                self.push_children(fixings, branching_var_index, rounded_value, current_obj_value)
+                return
+            for branch_value in [rounded_value, 1 - round(rounded_value)]:
+                self.problem.model.set_bounds([branching_var_index], [branch_value], [branch_value])
+                self.constrained_vars[branching_var_index] = True
+                self.branch_path.append((branching_var_index, branch_value, branch_value == rounded_value))
+                self.node_bounds.append(current_obj_value)
+                self.run(depth + 1)
+                self.branch_path.pop()
+                self.node_bounds.pop()
+                self.constrained_vars[branching_var_index] = False
+                self.problem.model.set_bounds([branching_var_index], [0.0], [1.0])
+        finally:
+            self.unfix(fixings)
+        return
+
+    @property
+    def prune_bound(self) -> int:
+        """ Clique size a node must beat: the own incumbent, or a larger one found by another portfolio process """
+        return max(self.best_obj_value, self.shared_bound)
+
+    def sync_incumbent(self):
+        """ Offers a better own clique to the other processes, or prunes with their better one """
+        shared = self.shared_incumbent.best
+        if self.best_obj_value > shared:
+            self.shared_incumbent.offer(self.get_best_clique(), "bnb")
+        # The clique itself stays with the process that found it, best_obj_value and best_solution remain a pair
+        self.shared_bound = max(self.shared_bound, shared)
+
+    def primal_heuristic(self, solution: list):
+        """ Rounds the LP solution to a clique and improves it by local search, a new incumbent if it is larger """
+        started = time.perf_counter()
+        clique = round_to_clique(self.problem.graph, solution)
+        clique = improve_clique(self.problem.graph, clique, max_steps=self.primal_steps, seed=self.call_counter)
+        self.stats.add("primal_heuristic", started)
+        if len(clique) > self.best_obj_value:
+            print(f'Heuristic found better clique: {len(clique)}')
+            members = set(clique)
+            self.best_solution = [1.0 if i in members else 0.0 for i in range(len(solution))]
+            self.best_obj_value = len(clique)
+            self.stats.incumbent(self.best_obj_value)
+            self.stats.count("primal_improvements")
+
+    def update_bound(self, node_bound: float):
+        bound = global_bound(self.branch_path, self.node_bounds, node_bound)
+        if self.node_store is not None and len(self.node_store):
+            bound = max(bound, self.node_store.best_bound())
+        if self.pending_nodes and self.stats.root_bound is not None:
+            # Open nodes of a resumed checkpoint are only bounded by the root LP
+            bound = max(bound, self.stats.root_bound)
+        self.stats.update_bound(max(int(bound + self.abs_tol), self.prune_bound))
+
+    def fix_by_reduced_costs(self, obj_value: float, solution: list) -> list:
+        """ Fixes variables by reduced costs for the subtree of the current node, undone by unfix() """
+        if not self.reduced_cost_fixing:
+            return []
+        started = time.perf_counter()
+        fixings = reduced_cost_fixings(obj_value, solution, self.problem.model.get_reduced_costs(),
+                                       self.prune_bound, self.constrained_vars, self.abs_tol)
+        if fixings:
+            indices = [index for index, _ in fixings]
+            values = [value for _, value in fixings]
+            self.problem.model.set_bounds(indices, values, values)
+            for index in indices:
+                self.constrained_vars[index] = True
+        self.stats.add("rc_fixing", started)
+        self.stats.count("rc_fixed", len(fixings))
+        return fixings
+
+    def unfix(self, fixings: list):
+        if fixings:
+            indices = [index for index, _ in fixings]
+            self.problem.model.set_bounds(indices, [0.0] * len(indices), [1.0] * len(indices))
+            for index in indices:
+                self.constrained_vars[index] = False
+
+    def save_checkpoint(self, finished: bool = False):
+        """ Saves incumbent, open nodes and stats, so the search can be continued by resume() """
+        save_checkpoint(self.checkpoint_path, {
+            "num_vars": self.problem.model.num_vars,
+            "best_obj_value": self.best_obj_value,
+            "best_clique": self.get_best_clique(),
+            "open_nodes": [] if finished else open_nodes(self.branch_path, self.pending_nodes + (
+                self.node_store.all_fixings() if self.node_store is not None else [])),
+            "nodes": self.call_counter,
+            "incomplete": self.incomplete,
+            "stats": self.stats.summary(),
+        })
+        self.last_checkpoint_time = time.time()
+
+    def resume(self, checkpoint: dict):
+        """ Continues the search from the open nodes of a checkpoint, with the time limit of this solver """
+        num_vars = self.problem.model.num_vars
+        if checkpoint["num_vars"] != num_vars:
+            raise ValueError(f"Checkpoint has {checkpoint['num_vars']} variables, the model has {num_vars}")
+        if checkpoint["best_obj_value"] > self.best_obj_value:
+            self.best_obj_value = checkpoint["best_obj_value"]
+            self.best_solution = [1.0 if i + 1 in checkpoint["best_clique"] else 0.0 for i in range(num_vars)]
+        self.call_counter = checkpoint["nodes"]
+        self.incomplete = checkpoint.get("incomplete", False)
+        self.stats.restore(checkpoint["stats"], checkpoint["nodes"])
+        if self.node_store is not None:
+            self.run_best_first(checkpoint["open_nodes"])
+        else:
+            self.run_nodes(checkpoint["open_nodes"])
+
+    def run_nodes(self, nodes: list):
+        """ Searches the subtrees of open nodes given as lists of (var_index, value) fixings, one after another """
+        self.solve_root_bound()
+        self.pending_nodes = list(nodes)
+        while self.pending_nodes:
+            self.run_node(self.pending_nodes.pop(0))
+
+    def run_best_first(self, nodes: list = None):
+        """ Best-first search over node_store: always continues with the open node of the largest parent LP bound,
+        so the first one that cannot beat the incumbent ends the search. Starts from the root or from open nodes """
+        # No clique has more vertices than the graph, the bound of nodes without an LP bound
+        if nodes is None:
+            self.node_store.push([], self.problem.model.num_vars)
+        else:
+            self.solve_root_bound()
+            for node in nodes:
+                self.node_store.push(node, self.stats.root_bound if self.stats.root_bound is not None
+                                     else self.problem.model.num_vars)
+        while len(self.node_store):
+            bound, node = self.node_store.pop()
+            if int(bound + self.abs_tol) <= self.prune_bound:
+                # The other open nodes are bounded by this one
+                break
+            self.run_node(node)
+
+    def push_children(self, fixings: list, var_index: int, rounded_value: int, obj_value: float):
+        """ Stores both branches of the current node in node_store, with its reduced cost fixings. Nodes with the
+        same rounded down bound are equally good for pruning, so among them the deepest comes first """
+        path = [(index, value) for index, value, _ in self.branch_path] + list(fixings)
+        depth = sum(1 for _, value in path if value > 0.5)
+        for branch_value in [rounded_value, 1 - rounded_value]:
+            priority = int(obj_value + self.abs_tol) + (depth + branch_value) / (self.problem.model.num_vars + 2)
+            self.node_store.push(path + [(var_index, branch_value)], obj_value, priority)
+
+    def solve_root_bound(self):
+        """ Open nodes are only bounded by the root LP until one of them is finished """
+        if self.stats.root_bound is not None:
+            return
+        started = time.perf_counter()
+        try:
+            if self.problem.model.solve():
+                self.stats.root_bound = self.problem.model.get_objective_value()
+        except LPSolveError as error:
+            print(error)
+        finally:
+            self.stats.add("lp_solve", started)
+
+    def run_node(self, node: list):
+        """ Searches the subtree of one open node given as (var_index, value) fixings """
+        indices = [var_index for var_index, _ in node]
+        values = [value for _, value in node]
+        self.problem.model.set_bounds(indices, values, values)
+        for index in indices:
+            self.constrained_vars[index] = True
+        self.branch_path = [(var_index, value, False) for var_index, value in node]
+        self.node_bounds = [None] * len(node)
+        # Variables fixed to 0 do not count as branching levels
+        self.run(sum(1 for _, value in node if value > 0.5))
+        self.branch_path = []
+        self.node_bounds = []
+        self.constrained_vars = [False] * len(self.constrained_vars)
+        self.problem.model.set_bounds(indices, [0.0] * len(node), [1.0] * len(node))
+
+    def is_clique(self, graph, nodes):
+        subgraph = graph.subgraph(nodes)
+        num_of_nodes = subgraph.number_of_nodes()
+        num_of_edges = subgraph.number_of_edges()
+        num_of_edges_complete = int(num_of_nodes * (num_of_nodes - 1) / 2)
+        if num_of_edges == num_of_edges_complete:
+            return True
+        return False
+
+    def _get_clique(self, solution: list) -> list:
+        return [var_index + 1 for var_index, var in enumerate(solution) if isclose(var, 1, abs_tol=self.abs_tol)]
+
+    def get_best_clique(self) -> list:
+        return self._get_clique(self.best_solution)
+
+    def choose_branch(self, solution: list) -> int:
+        selected_var_index = None
+        min_diff_to_int = 2
+        for _index, value in enumerate(solution):
+            if not (isclose(value, 0) or isclose(value, 1)):
+                diff_to_int = abs(1 - value)
+                if diff_to_int <= min_diff_to_int:
+                    min_diff_to_int = diff_to_int
+                    selected_var_index = _index
+        return selected_var_index
+
+    @staticmethod
+    def is_all_integer(variables: list, abs_tol: float = 1e-4) -> bool:
+        for var in variables:
+            if not (isclose(var, 0, abs_tol=abs_tol) or isclose(var, 1, abs_tol=abs_tol)):
+                return False
+        return True
@@ -0,0 +1,494 @@
+import time
+from math import isclose
+import numpy as np
+import networkx as nx
+
+from labsolvers.common.problem import ProblemHandler
+from labsolvers.BnC.separator import find_maximal_weighted_set, find_violated_sets
+from labsolvers.common.lp_backend import LPSolveError
+from labsolvers.common.local_search import improve_clique, round_to_clique
+from labsolvers.common.reduced_cost import reduced_cost_fixings
+from labsolvers.common.stats import SolverStats
+from labsolvers.common.checkpoint import open_nodes, save_checkpoint
+from labsolvers.common.events import SearchStopped, global_bound
+from labsolvers.common.node_store import NodeStore
+
+
+# Names of the rows added by separation, as opposed to the c* rows of the base formulation
+CUT_PREFIXES = ('Strong_', 'Weak')
+
+
+class BnCTimeoutException(Exception):
+    pass
+
+
+class BranchAndCut:
+    def __init__(self, problem: ProblemHandler, initial_obj_value: float, initial_solution: list, graph: nx.Graph,
+                 abs_tol: float = 1e-4, time_limit: int = None, stats: SolverStats = None,
+                 checkpoint_path: str = None, checkpoint_interval: float = 600, reduced_cost_fixing: bool = True,
+                 root_max_rounds: int = 100, root_tailing_rounds: int = 5, root_tailing_tol: float = 0.01,
+                 root_cuts_per_round: int = 5, node_sep_iters: tuple = (1000,), shared_incumbent=None,
+                 primal_interval: int = 10, primal_steps: int = 50, node_store: NodeStore = None):
+        self.call_counter = 0
+        self.problem = problem
+        self.best_obj_value = initial_obj_value
+        self.best_solution = initial_solution
+        self.abs_tol = abs_tol
+        self.start_time = None
+        self.time_limit = time_limit
+        self.sep_iter = 0
+        self.max_sep_iter = 1000
+        self.sep_tol = 0.15
+        self.max_stagnation_count = 10
+        self.graph = graph
+        self.max_recursion_depth = 100
+        self.constrained_vars = np.zeros(self.graph.number_of_nodes(), dtype=bool)
+        self.stats = stats if stats is not None else SolverStats()
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self.last_checkpoint_time = None
+        self.branch_path = []
+        # LP bound of the node that made each branching in branch_path
+        self.node_bounds = []
+        self.pending_nodes = []
+        self.reduced_cost_fixing = reduced_cost_fixing
+        # Root cutting-plane phase: rounds of several separators until the bound tails off, i.e. improves by less
+        # than root_tailing_tol (relative) over root_tailing_rounds rounds
+        self.root_max_rounds = root_max_rounds
+        self.root_tailing_rounds = root_tailing_rounds
+        self.root_tailing_tol = root_tailing_tol
+        self.root_cuts_per_round = root_cuts_per_round
+        self.root_done = False
+        # Separation iterations per node by depth, the last entry holds for all deeper nodes
+        self.node_sep_iters = tuple(node_sep_iters)
+        # SharedIncumbent of a portfolio run, None when solving alone
+        self.shared_incumbent = shared_incumbent
+        # Size of the best clique of the other portfolio processes, only used for pruning
+        self.shared_bound = 0
+        # LP rounding heuristic every primal_interval nodes, 0 turns it off
+        self.primal_interval = primal_interval
+        self.primal_steps = primal_steps
+        # Open nodes of run_best_first(), None for the depth-first run()
+        self.node_store = node_store
+        # Set when a subtree is given up without being searched, so a finished search proves nothing
+        self.incomplete = False
+
+    @property
+    def lp_solve_counter(self) -> int:
+        return self.stats.phase_counts["lp_solve"]
+
+    def run(self, recursion_depth=0):
+        self.call_counter += 1
+        if self.start_time is None:
+            self.start_time = time.time()
+            self.last_checkpoint_time = self.start_time
+            self.stats.incumbent(self.best_obj_value)
+        if self.stats.stop_requested:
+            print("Stopped by observer")
+            if self.checkpoint_path is not None:
+                self.save_checkpoint()
+            raise SearchStopped
+        if self.shared_incumbent is not None:
+            self.sync_incumbent()
+        if time.time() - self.start_time > self.time_limit:
+            print(f"Stopped by timeout {self.time_limit}s")
+            if self.checkpoint_path is not None:
+                self.save_checkpoint()
+            raise BnCTimeoutException
+        if self.checkpoint_path is not None and time.time() - self.last_checkpoint_time > self.checkpoint_interval:
+            self.save_checkpoint()
+        if recursion_depth > self.max_recursion_depth:
+            self.incomplete = True
+            return
+        if recursion_depth == 0 and not self.root_done:
+            self.strengthen_root()
+
+        started = time.perf_counter()
+        try:
+            solved = self.problem.model.solve()
+        except LPSolveError as error:
+            print(error)
+            self.incomplete = True
+            return
+        finally:
+            self.stats.add("lp_solve", started)
+        if not solved:
+            return
+        current_obj_value = self.problem.model.get_objective_value()
+        self.stats.node(recursion_depth, current_obj_value)
+        self.update_bound(current_obj_value)
+
+        if int(current_obj_value + self.abs_tol) <= self.prune_bound:
+            return
+        current_solution = self.problem.model.get_values()
+
+        if self.is_all_integer(current_solution, abs_tol=self.abs_tol):
+            clique_nodes = self._get_clique(current_solution)
+            # Purged base rows can leave an integer non-clique, which the separation below cuts off
+            started = time.perf_counter()
+            is_clique = self.is_clique(self.problem.graph, clique_nodes)
+            self.stats.add("clique_check", started)
+            if is_clique:
+                print(f'Found better clique: {round(current_obj_value)}')
+                self.best_solution = current_solution
+                self.best_obj_value = round(current_obj_value)
+                self.stats.incumbent(self.best_obj_value)
+                return
+        if self.primal_interval and self.call_counter % self.primal_interval == 0:
+            self.primal_heuristic(current_solution)
+            if int(current_obj_value + self.abs_tol) <= self.prune_bound:
+                return
+
+        # The reduced costs of the last solve are only usable while no rows were deleted after it
+        lp_is_current = True
+        if self.call_counter % 100 == 0:
+            lp_is_current = False
+            self.purge_slack_rows()
+
+        # SEPARATION
+        stagnation_count = 0
+        obj_value_history = list()
+        for sep_iter in range(self.node_sep_iters[min(recursion_depth, len(self.node_sep_iters) - 1)]):
+            # Constraint
+            started = time.perf_counter()
+            ind_set, weight_total = find_maximal_weighted_set(self.graph, current_solution)
+            self.stats.add("separation", started)
+
+            if weight_total <= 1.0 + self.abs_tol:
+                break
+            started = time.perf_counter()
+            self.problem.add_rows([ind_set], names=[f'Strong_{self.sep_iter}'])
+            self.stats.add("cut_add", started)
+            self.sep_iter += 1
+
+            # Solve
+            started = time.perf_counter()
+            try:
+                solved = self.problem.model.solve()
+            except LPSolveError as error:
+                print(error)
+                self.incomplete = True
+                return
+            finally:
+                self.stats.add("lp_solve", started)
+            if not solved:
+                return
+            lp_is_current = True
+            current_obj_value = self.problem.model.get_objective_value()
+            if int(current_obj_value + self.abs_tol) <= self.prune_bound:
+                return
+
+            # Check how many stagnating iterations
+            if len(obj_value_history) > 0:
+                if isclose(obj_value_history[-1], current_obj_value, abs_tol=1e-2):
+                    break
+                if (obj_value_history[-1] - current_obj_value) < self.sep_tol:
+                    stagnation_count += 1
+                else:
+                    stagnation_count = 0
+                if stagnation_count > self.max_stagnation_count:
+                    break
+            obj_value_history.append(current_obj_value)
+            current_solution = self.problem.model.get_values()
+
+        # BRANCHING
+        started = time.perf_counter()
+        branching_var_index = self.choose_branch(current_solution)
+        self.stats.add("branching", started)
+        if branching_var_index is None:
+            started = time.perf_counter()
+            weak_constraints = self.check_solution(current_solution)
+            self.stats.add("clique_check", started)
+            if weak_constraints is not None:
+                self.stats.count("cut_add", len(weak_constraints))
+                self.problem.add_rows(
+                    [list(pair) for pair in weak_constraints],
+                    names=[f'Weak{self.call_counter}_{itr}' for itr in range(len(weak_constraints))]
+                )
+                # print("Weak branching")
+                self.run(recursion_depth + 1)
+            else:
+                print(f'\t\t\tFound new best: {current_obj_value}')
+                self.best_solution = current_solution
+                self.best_obj_value = round(current_obj_value)
+                self.stats.incumbent(self.best_obj_value)
+                return
+        else:
+            fixings = self.fix_by_reduced_costs(current_obj_value) if lp_is_current else []
+            try:
+                rounded_value = round(current_solution[branching_var_index])
+                if self.node_store is not None:
+                    self.push_children(fixings, branching_var_index, rounded_value, current_obj_value)
+                    return
+                for branch_value in [rounded_value, 1 - round(rounded_value)]:
+                    self.problem.model.set_bounds([branching_var_index], [branch_value], [branch_value])
+                    self.constrained_vars[branching_var_index] = True
+                    self.branch_path.append((branching_var_index, branch_value, branch_value == rounded_value))
+                    self.node_bounds.append(current_obj_value)
+                    self.run(recursion_depth + 1)
+                    self.branch_path.pop()
+                    self.node_bounds.pop()
+                    self.constrained_vars[branching_var_index] = False
+                    self.problem.model.set_bounds([branching_var_index], [0.0], [1.0])
+            finally:
+                self.unfix(fixings)
+
+    def strengthen_root(self) -> float:
+        """ Cutting-plane rounds on the root LP before branching, then a bulk purge of the non-binding cuts.
+        Returns the root LP bound, None if the LP could not be solved """
+        self.root_done = True
+        if self.start_time is None:
+            self.start_time = time.time()
+        bounds = []
+        # Every round starts with a solve, so the purge below sees the slacks of the final LP
+        for _ in range(self.root_max_rounds + 1):
+            started = time.perf_counter()
+            try:
+                solved = self.problem.model.solve()
+            except LPSolveError as error:
+                print(error)
+                return None
+            finally:
+                self.stats.add("lp_solve", started)
+            if not solved:
+                return None
+            bounds.append(self.problem.model.get_objective_value())
+            if len(bounds) > self.root_max_rounds or time.time() - self.start_time > self.time_limit:
+                break
+            if int(bounds[-1] + self.abs_tol) <= self.prune_bound:
+                break
+            if len(bounds) > self.root_tailing_rounds and \
+                    bounds[-self.root_tailing_rounds - 1] - bounds[-1] < self.root_tailing_tol * abs(bounds[-1]):
+                break
+            solution = self.problem.model.get_values()
+            if self.is_all_integer(solution, abs_tol=self.abs_tol):
+                break
+
+            started = time.perf_counter()
+            cuts = find_violated_sets(self.graph, solution, 1.0 + self.abs_tol, seed=len(bounds))
+            cuts = cuts[:self.root_cuts_per_round]
+            self.stats.add("root_separation", started)
+            if not cuts:
+                break
+            started = time.perf_counter()
+            self.problem.add_rows([ind_set for ind_set, _ in cuts],
+                                  names=[f'Strong_{self.sep_iter + i}' for i in range(len(cuts))])
+            self.stats.add("cut_add", started, len(cuts))
+            self.sep_iter += len(cuts)
+            self.stats.count("root_rounds")
+        if len(bounds) > 1:
+            # Only the cuts: the base rows stay, so integer LP solutions remain cliques
+            self.purge_slack_rows(CUT_PREFIXES)
+        self.stats.root_cuts(bounds[0], bounds[-1], len(bounds) - 1)
+        return bounds[-1]
+
+    def purge_slack_rows(self, prefixes: tuple = None):
+        """ Deletes the rows that are not binding in the last LP solution, only those named with one of the prefixes
+        if given """
+        started = time.perf_counter()
+        slacks = self.problem.model.get_slacks()
+        constraint_names = self.problem.model.get_row_names()
+        purged = [constraint_names[i] for i, slack in enumerate(slacks)
+                  if slack > 1e-3 and (prefixes is None or constraint_names[i].startswith(prefixes))]
+        self.problem.model.delete_rows(purged)
+        self.stats.add("slack_purge", started)
+        self.stats.count("cut_delete", len(purged))
+
+    @property
+    def prune_bound(self) -> int:
+        """ Clique size a node must beat: the own incumbent, or a larger one found by another portfolio process """
+        return max(self.best_obj_value, self.shared_bound)
+
+    def sync_incumbent(self):
+        """ Offers a better own clique to the other processes, or prunes with their better one """
+        shared = self.shared_incumbent.best
+        if self.best_obj_value > shared:
+            self.shared_incumbent.offer(self.get_best_clique(), "bnc")
+        # The clique itself stays with the process that found it, best_obj_value and best_solution remain a pair
+        self.shared_bound = max(self.shared_bound, shared)
+
+    def primal_heuristic(self, solution: list):
+        """ Rounds the LP solution to a clique and improves it by local search, a new incumbent if it is larger """
+        started = time.perf_counter()
+        clique = round_to_clique(self.problem.graph, solution)
+        clique = improve_clique(self.problem.graph, clique, max_steps=self.primal_steps, seed=self.call_counter)
+        self.stats.add("primal_heuristic", started)
+        if len(clique) > self.best_obj_value:
+            print(f'Heuristic found better clique: {len(clique)}')
+            members = set(clique)
+            self.best_solution = [1.0 if i in members else 0.0 for i in range(len(solution))]
+            self.best_obj_value = len(clique)
+            self.stats.incumbent(self.best_obj_value)
+            self.stats.count("primal_improvements")
+
+    def update_bound(self, node_bound: float):
+        bound = global_bound(self.branch_path, self.node_bounds, node_bound)
+        if self.node_store is not None and len(self.node_store):
+            bound = max(bound, self.node_store.best_bound())
+        if self.pending_nodes and self.stats.root_bound is not None:
+            # Open nodes of a resumed checkpoint are only bounded by the root LP
+            bound = max(bound, self.stats.root_bound)
+        self.stats.update_bound(max(int(bound + self.abs_tol), self.prune_bound))
+
+    def fix_by_reduced_costs(self, obj_value: float) -> list:
+        """ Fixes variables by reduced costs of the last LP for the subtree of the current node, undone by unfix() """
+        if not self.reduced_cost_fixing:
+            return []
+        started = time.perf_counter()
+        fixings = reduced_cost_fixings(obj_value, self.problem.model.get_values(),
+                                       self.problem.model.get_reduced_costs(), self.prune_bound,
+                                       self.constrained_vars, self.abs_tol)
+        if fixings:
+            indices = [index for index, _ in fixings]
+            values = [value for _, value in fixings]
+            self.problem.model.set_bounds(indices, values, values)
+            self.constrained_vars[indices] = True
+        self.stats.add("rc_fixing", started)
+        self.stats.count("rc_fixed", len(fixings))
+        return fixings
+
+    def unfix(self, fixings: list):
+        if fixings:
+            indices = [index for index, _ in fixings]
+            self.problem.model.set_bounds(indices, [0.0] * len(indices), [1.0] * len(indices))
+            self.constrained_vars[indices] = False
+
+    def get_cut_pool(self) -> list:
+        """ Separated cuts currently in the model as (name, vertices) pairs """
+        nodes = self.problem.nodes
+        return [
+            (name, [nodes[i] for i in row])
+            for name, row in zip(self.problem.model.get_row_names(), self.problem.model.get_rows())
+            if name.startswith(CUT_PREFIXES)
+        ]
+
+    def save_checkpoint(self, finished: bool = False):
+        """ Saves incumbent, open nodes, cut pool and stats, so the search can be continued by resume() """
+        save_checkpoint(self.checkpoint_path, {
+            "num_vars": self.problem.model.num_vars,
+            "best_obj_value": self.best_obj_value,
+            "best_clique": self.get_best_clique(),
+            "open_nodes": [] if finished else open_nodes(self.branch_path, self.pending_nodes + (
+                self.node_store.all_fixings() if self.node_store is not None else [])),
+            "cut_pool": self.get_cut_pool(),
+            "sep_iter": self.sep_iter,
+            "nodes": self.call_counter,
+            "incomplete": self.incomplete,
+            "stats": self.stats.summary(),
+        })
+        self.last_checkpoint_time = time.time()
+
+    def resume(self, checkpoint: dict):
+        """ Continues the search from the open nodes and cut pool of a checkpoint, with the time limit of this solver """
+        num_vars = self.problem.model.num_vars
+        if checkpoint["num_vars"] != num_vars:
+            raise ValueError(f"Checkpoint has {checkpoint['num_vars']} variables, the model has {num_vars}")
+        if checkpoint["best_obj_value"] > self.best_obj_value:
+            self.best_obj_value = checkpoint["best_obj_value"]
+            self.best_solution = [1.0 if i + 1 in checkpoint["best_clique"] else 0.0 for i in range(num_vars)]
+        cut_pool = checkpoint["cut_pool"]
+        if cut_pool:
+            self.problem.add_rows([vertices for _, vertices in cut_pool], names=[name for name, _ in cut_pool])
+        self.sep_iter = checkpoint["sep_iter"]
+        self.call_counter = checkpoint["nodes"]
+        self.incomplete = checkpoint.get("incomplete", False)
+        self.stats.restore(checkpoint["stats"], checkpoint["nodes"])
+        if self.node_store is not None:
+            self.run_best_first(checkpoint["open_nodes"])
+        else:
+            self.run_nodes(checkpoint["open_nodes"])
+
+    def run_nodes(self, nodes: list):
+        """ Searches the subtrees of open nodes given as lists of (var_index, value) fixings, one after another """
+        if self.stats.root_bound is None:
+            # The nodes are only bounded by the root LP until one of them is finished
+            self.stats.root_bound = self.strengthen_root()
+        self.pending_nodes = list(nodes)
+        while self.pending_nodes:
+            self.run_node(self.pending_nodes.pop(0))
+
+    def run_best_first(self, nodes: list = None):
+        """ Best-first search over node_store: always continues with the open node of the largest parent LP bound,
+        so the first one that cannot beat the incumbent ends the search. Starts from the root or from open nodes """
+        # No clique has more vertices than the graph, the bound of nodes without an LP bound
+        if nodes is None:
+            self.node_store.push([], self.problem.model.num_vars)
+        else:
+            if self.stats.root_bound is None:
+                self.stats.root_bound = self.strengthen_root()
+            for node in nodes:
+                self.node_store.push(node, self.stats.root_bound if self.stats.root_bound is not None
+                                     else self.problem.model.num_vars)
+        while len(self.node_store):
+            bound, node = self.node_store.pop()
+            if int(bound + self.abs_tol) <= self.prune_bound:
+                # The other open nodes are bounded by this one
+                break
+            self.run_node(node)
+
+    def push_children(self, fixings: list, var_index: int, rounded_value: int, obj_value: float):
+        """ Stores both branches of the current node in node_store, with its reduced cost fixings. Nodes with the
+        same rounded down bound are equally good for pruning, so among them the deepest comes first """
+        path = [(index, value) for index, value, _ in self.branch_path] + list(fixings)
+        depth = sum(1 for _, value in path if value > 0.5)
+        for branch_value in [rounded_value, 1 - rounded_value]:
+            priority = int(obj_value + self.abs_tol) + (depth + branch_value) / (self.problem.model.num_vars + 2)
+            self.node_store.push(path + [(var_index, branch_value)], obj_value, priority)
+
+    def run_node(self, node: list):
+        """ Searches the subtree of one open node given as (var_index, value) fixings """
+        indices = [var_index for var_index, _ in node]
+        values = [value for _, value in node]
+        self.problem.model.set_bounds(indices, values, values)
+        self.constrained_vars[indices] = True
+        self.branch_path = [(var_index, value, False) for var_index, value in node]
+        self.node_bounds = [None] * len(node)
+        # Variables fixed to 0 do not count as branching levels
+        self.run(sum(1 for _, value in node if value > 0.5))
+        self.branch_path = []
+        self.node_bounds = []
+        self.constrained_vars[:] = False
+        self.problem.model.set_bounds(indices, [0.0] * len(node), [1.0] * len(node))
+
+    def is_clique(self, graph, nodes):
+        subgraph = graph.subgraph(nodes)
+        num_of_nodes = subgraph.number_of_nodes()
+        num_of_edges = subgraph.number_of_edges()
+        num_of_edges_complete = int(num_of_nodes * (num_of_nodes - 1) / 2)
+        if num_of_edges == num_of_edges_complete:
+            return True
+        return False
+
+    def _get_clique(self, solution: list) -> list:
+        return [var_index + 1 for var_index, var in enumerate(solution) if isclose(var, 1, abs_tol=self.abs_tol)]
+
+    def get_best_clique(self) -> list:
+        return self._get_clique(self.best_solution)
+
+    def choose_branch(self, solution: list) -> int:
+        selected_var_index = None
+        min_diff_to_int = 2
+        for _index, value in enumerate(solution):
+            if not self.constrained_vars[_index]:
+                if not (isclose(value, 0) or isclose(value, 1)):
+                    diff_to_int = abs(1 - value)
+                    if diff_to_int <= min_diff_to_int:
+                        min_diff_to_int = diff_to_int
+                        selected_var_index = _index
+        return selected_var_index
+
+    def check_solution(self, solution: list) -> list:
+        clique_nodes = self._get_clique(solution)
+        is_clique = self.is_clique(self.problem.graph, clique_nodes)
+        if is_clique:
+            return None
+        else:
+            complement_g = nx.complement(self.problem.graph.subgraph(clique_nodes))
+            return list(filter(lambda pair: pair[0] != pair[1], complement_g.edges()))
+
+    @staticmethod
+    def is_all_integer(variables: list, abs_tol: float = 1e-4) -> bool:
+        for var in variables:
+            if not (isclose(var, 0, abs_tol=abs_tol) or isclose(var, 1, abs_tol=abs_tol)):
+                return False
+        return True
@@ -0,0 +1,137 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+import networkx as nx
+
+from labsolvers.common.problem import ProblemHandler
+from labsolvers.BnC.branch_and_cut import BranchAndCut, BnCTimeoutException
+from labsolvers.common.graph_cache import graph_data
+from labsolvers.common.independent_sets import bits, color_count, popcount
+from labsolvers.common.stats import SolverStats
+
+# Root decomposition along a degeneracy order v_1..v_n: subproblem i looks for the largest clique that contains v_i
+# and otherwise only later neighbours of v_i. Every clique is found in the subproblem of its earliest vertex, and
+# the neighbourhoods stay as small as the degeneracy of the graph.
+
+
+def root_subproblems(graph: nx.Graph) -> tuple:
+    """ Sorted nodes, adjacency bitsets and (vertex, later neighbours bitset) pairs in degeneracy order """
+    data = graph_data(graph)
+    nodes, adjacency = data.nodes, data.adjacency
+    # The smallest-last order is the removal order reversed, so each vertex has few neighbours after it
+    order = data.degeneracy_order[::-1]
+    later = (1 << len(nodes)) - 1
+    subproblems = []
+    for vertex in order:
+        later ^= 1 << vertex
+        subproblems.append((vertex, adjacency[vertex] & later))
+    return nodes, adjacency, subproblems
+
+
+def solve_subproblem(edges: list, n_vertices: int, lower_bound: int, deadline: float, abs_tol: float = 1e-4,
+                     backend: str = "cplex", reduced_cost_fixing: bool = True, solver_params: dict = None) -> dict:
+    """ Max clique above lower_bound in a graph on vertices 1..n_vertices, solved by branch-and-cut """
+    if time.time() >= deadline:
+        # Started by a pool worker after the deadline: not even the LP is built
+        return {"clique": None, "nodes": 0, "lp_solves": 0, "timed_out": True, "proved_optimal": False}
+    graph = nx.Graph()
+    graph.add_nodes_from(range(1, n_vertices + 1))
+    graph.add_edges_from(edges)
+    problem = ProblemHandler(graph=graph, backend=backend, solver_params=solver_params)
+    problem.design_problem()
+    algorithm = BranchAndCut(
+        problem=problem,
+        initial_obj_value=lower_bound,
+        initial_solution=[0.0] * n_vertices,
+        graph=graph,
+        abs_tol=abs_tol,
+        time_limit=max(deadline - time.time(), 0.0),
+        stats=SolverStats(),
+        reduced_cost_fixing=reduced_cost_fixing
+    )
+    timed_out = False
+    try:
+        algorithm.run()
+    except BnCTimeoutException:
+        timed_out = True
+    return {
+        "clique": algorithm.get_best_clique() if algorithm.best_obj_value > lower_bound else None,
+        "nodes": algorithm.call_counter,
+        "lp_solves": algorithm.lp_solve_counter,
+        "timed_out": timed_out,
+        "proved_optimal": not timed_out and not algorithm.incomplete,
+    }
+
+
+def _subproblem_args(nodes: list, adjacency: list, vertex: int, candidates: int, lower_bound: int) -> tuple:
+    """ Neighbourhood of the subproblem relabelled to 1..k, as BranchAndCut reads vertex ids from variable indices """
+    members = bits(candidates)
+    position = {member: i + 1 for i, member in enumerate(members)}
+    edges = [(position[u], position[v]) for u in members for v in bits(adjacency[u] & candidates) if u < v]
+    return members, (edges, len(members), lower_bound - 1)
+
+
+def solve_decomposed(graph: nx.Graph, initial_clique: list, time_limit: float = 7000, abs_tol: float = 1e-4,
+                     backend: str = "cplex", reduced_cost_fixing: bool = True, n_jobs: int = 1,
+                     solver_params: dict = None) -> dict:
+    """ Solves the degeneracy-order subproblems that can beat the incumbent, in a process pool if n_jobs > 1 """
+    deadline = time.time() + time_limit
+    nodes, adjacency, subproblems = root_subproblems(graph)
+    best_clique = list(initial_clique)
+    result = {"nodes": 0, "lp_solves": 0, "subproblems": 0, "skipped": 0, "timed_out": False, "proved_optimal": True}
+
+    def take(vertex, members, outcome):
+        result["nodes"] += outcome["nodes"]
+        result["lp_solves"] += outcome["lp_solves"]
+        result["timed_out"] |= outcome["timed_out"]
+        result["proved_optimal"] &= outcome["proved_optimal"]
+        if outcome["clique"] is not None and len(outcome["clique"]) + 1 > len(best_clique):
+            best_clique[:] = [nodes[vertex]] + [nodes[members[i - 1]] for i in outcome["clique"]]
+            print(f'Found better clique: {len(best_clique)}')
+
+    def can_improve(candidates):
+        # Size bound first, the colour bound only for neighbourhoods that pass it
+        return (popcount(candidates) + 1 > len(best_clique)
+                and color_count(adjacency, candidates) + 1 > len(best_clique))
+
+    if n_jobs <= 1:
+        for vertex, candidates in subproblems:
+            if time.time() > deadline:
+                result["timed_out"] = True
+                break
+            if not can_improve(candidates):
+                result["skipped"] += 1
+                continue
+            members, args = _subproblem_args(nodes, adjacency, vertex, candidates, len(best_clique))
+            result["subproblems"] += 1
+            take(vertex, members, solve_subproblem(*args, deadline, abs_tol, backend, reduced_cost_fixing,
+                                                            solver_params))
+    else:
+        # Workers do not see each other's incumbents, so the bounds only use the clique known up front
+        jobs = []
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            for vertex, candidates in subproblems:
+                if time.time() > deadline:
+                    result["timed_out"] = True
+                    break
+                if not can_improve(candidates):
+                    result["skipped"] += 1
+                    continue
+                members, args = _subproblem_args(nodes, adjacency, vertex, candidates, len(best_clique))
+                future = executor.submit(solve_subproblem, *args, deadline, abs_tol, backend, reduced_cost_fixing,
+                                         solver_params)
+                jobs.append((vertex, members, future))
+            result["subproblems"] = len(jobs)
+            for vertex, members, future in jobs:
+                if time.time() > deadline:
+                    # Subproblems that have not started are dropped, running ones stop at their own time limit
+                    for _, __, pending in jobs:
+                        pending.cancel()
+                if future.cancelled():
+                    result["timed_out"] = True
+                    continue
+                take(vertex, members, future.result())
+
+    result["proved_optimal"] &= not result["timed_out"]
+    result["objective"] = len(best_clique)
+    result["solution"] = sorted(best_clique)
+    return result
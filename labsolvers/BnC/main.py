@@ -0,0 +1,162 @@
+import re
+from time import time, perf_counter
+import networkx as nx
+from labsolvers.common.problem import ProblemHandler
+from labsolvers.week2.clique import MaxCliqueProblem
+from labsolvers.common.stats import SolverStats
+from labsolvers.common.checkpoint import load_checkpoint
+from labsolvers.common.solver_params import instance_params, load_profiles
+from labsolvers.common.events import SearchStopped, stop_at_gap, stop_at_objective
+from labsolvers.common.symmetry import adjacency_matrix, orbital_nodes
+from labsolvers.common.node_store import NodeStore
+from labsolvers.BnC.branch_and_cut import BranchAndCut, BnCTimeoutException
+from labsolvers.BnC.decomposition import solve_decomposed
+
+
+def read_graph_file(file_path: str):
+    result_graph = None
+    with open(file_path, "r") as file:
+        edges = []
+        num_edges = 0
+        for line in file:
+            line = line.rstrip()
+            if line[0] == "e":
+                start, finish = [int(number) for number in line[2:].split(" ")]
+                edges.append((start, finish))
+            elif line[0] == "p":
+                _, __, num_vertices, num_edges = re.split(r"\s+", line)
+                _, num_edges = int(num_vertices), int(num_edges)
+            else:
+                pass
+        if len(edges) != num_edges:
+            raise
+        result_graph = nx.Graph(edges)
+    return result_graph
+
+
+def load_instance(file_path: str, cache_dir: str = None, backend: str = "cplex", param_file: str = None,
+                  solver_params: dict = None, cut_pool: bool = False) -> dict:
+    # param_file holds the LP parameter profiles (common/solver_params.py), solver_params override single values.
+    # cut_pool=True also keeps the learned cuts in cache_dir and starts from those of earlier runs
+    if param_file is not None:
+        solver_params = {**instance_params(load_profiles(param_file), file_path, backend), **(solver_params or dict())}
+    graph = read_graph_file(file_path)
+    problem_handler = ProblemHandler(graph=graph, cache_dir=cache_dir, backend=backend, solver_params=solver_params,
+                                     use_cut_pool=cut_pool)
+    problem_handler.design_problem()
+    mcp = MaxCliqueProblem()
+    mcp.read_graph_from_file(file_path)
+    return {"graph": graph, "problem_handler": problem_handler, "mcp": mcp}
+
+
+def solve_instance(instance: dict, time_limit: int = 7000, abs_tol: float = 1e-4, trace_path: str = None,
+                   checkpoint_path: str = None, checkpoint_interval: float = 600, resume: bool = False,
+                   reduced_cost_fixing: bool = True, observers: list = None, target_objective: int = None,
+                   gap_limit: float = None, decompose: bool = False, n_jobs: int = 1,
+                   orbital_depth: int = 0, root_max_rounds: int = 100, root_tailing_tol: float = 0.01,
+                   node_sep_iters: tuple = (1000,), shared_incumbent=None, primal_interval: int = 10,
+                   node_order: str = "depth_first", node_memory_mb: float = None, spill_dir: str = None) -> dict:
+    # observers get every solver event, target_objective and gap_limit stop the search early.
+    # node_order="best_first" keeps the open nodes in a NodeStore that spills to spill_dir above node_memory_mb
+    observers = list(observers or [])
+    if target_objective is not None:
+        observers.append(stop_at_objective(target_objective))
+    if gap_limit is not None:
+        observers.append(stop_at_gap(gap_limit))
+
+    # Heuristic from lab 2 is used
+    mcp = instance["mcp"]
+    start_time = time()
+    mcp.find_clique()
+    heuristic_time = round(time() - start_time, 3)
+    if not mcp.check():
+        print("Error: incorrect clique!!!")
+
+    if decompose:
+        # Degeneracy-order subproblems instead of one LP over the whole graph
+        result = solve_decomposed(
+            graph=instance["graph"],
+            initial_clique=[vertex + 1 for vertex in mcp.best_clique],
+            time_limit=time_limit,
+            abs_tol=abs_tol,
+            backend=instance["problem_handler"].backend,
+            reduced_cost_fixing=reduced_cost_fixing,
+            n_jobs=n_jobs,
+            solver_params=instance["problem_handler"].solver_params
+        )
+        solution = result.pop("solution")
+        return {**result, "heuristic_objective": mcp.get_clique_size(), "heuristic_time": heuristic_time,
+                "solution": solution}
+
+    node_store = None
+    if node_order == "best_first":
+        node_store = NodeStore(instance["problem_handler"].model.num_vars, memory_limit_mb=node_memory_mb,
+                               spill_dir=spill_dir)
+    elif node_order != "depth_first":
+        raise ValueError(f"Unknown node_order {node_order!r}")
+
+    # Branch and cut
+    bnc_algorithm = BranchAndCut(
+        problem=instance["problem_handler"],
+        initial_solution=mcp.get_best_clique(),
+        graph=instance["graph"],
+        time_limit=time_limit,
+        initial_obj_value=mcp.get_clique_size(),
+        abs_tol=abs_tol,
+        stats=SolverStats(trace_path=trace_path, observers=observers),
+        checkpoint_path=checkpoint_path,
+        checkpoint_interval=checkpoint_interval,
+        reduced_cost_fixing=reduced_cost_fixing,
+        root_max_rounds=root_max_rounds,
+        root_tailing_tol=root_tailing_tol,
+        node_sep_iters=node_sep_iters,
+        shared_incumbent=shared_incumbent,
+        primal_interval=primal_interval,
+        node_store=node_store
+    )
+    # Orbital branching at the root: one open node per orbit of the graph automorphisms
+    symmetric_nodes = None
+    if orbital_depth > 0 and not resume:
+        started = perf_counter()
+        problem = instance["problem_handler"]
+        symmetric_nodes = orbital_nodes(adjacency_matrix(problem.graph, problem.nodes), orbital_depth)
+        bnc_algorithm.stats.add("symmetry", started)
+    timed_out = False
+    stopped = False
+    try:
+        if resume:
+            bnc_algorithm.resume(load_checkpoint(checkpoint_path))
+        elif node_store is not None:
+            bnc_algorithm.run_best_first(symmetric_nodes)
+        elif symmetric_nodes is not None:
+            bnc_algorithm.run_nodes(symmetric_nodes)
+        else:
+            bnc_algorithm.run()
+        if checkpoint_path is not None:
+            bnc_algorithm.save_checkpoint(finished=True)
+    except BnCTimeoutException:
+        timed_out = True
+    except SearchStopped:
+        stopped = True
+    finally:
+        bnc_algorithm.stats.close()
+        if node_store is not None:
+            node_store.close()
+        instance["problem_handler"].save_cut_pool(bnc_algorithm.get_cut_pool())
+    # Check on clique correctness is performed in BnC when best clique is found
+    return {
+        "objective": bnc_algorithm.best_obj_value,
+        "solution": bnc_algorithm.get_best_clique(),
+        "nodes": bnc_algorithm.call_counter,
+        "lp_solves": bnc_algorithm.lp_solve_counter,
+        "rc_fixed": bnc_algorithm.stats.phase_counts["rc_fixed"],
+        "primal_improvements": bnc_algorithm.stats.phase_counts["primal_improvements"],
+        "heuristic_objective": mcp.get_clique_size(),
+        "heuristic_time": heuristic_time,
+        "timed_out": timed_out,
+        "stopped": stopped,
+        "proved_optimal": not timed_out and not stopped and not bnc_algorithm.incomplete,
+        "orbital_nodes": len(symmetric_nodes) if symmetric_nodes is not None else 0,
+        "node_store": node_store.stats() if node_store is not None else None,
+        "stats": bnc_algorithm.stats.summary(),
+    }
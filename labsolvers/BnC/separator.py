@@ -0,0 +1,56 @@
+import numpy as np
+from numpy import argsort
+from labsolvers.common.graph_cache import graph_data
+
+
+def _sort_desc_by_weight(graph, weights):
+    return list(argsort(weights)[::-1])
+
+
+def _sort_by_weight_div_degrees(graph, weights):
+    new_weights = np.array(weights) / (graph_data(graph).degrees + 1)
+    return list(argsort(new_weights)[::-1])
+
+
+def _find_maximal_weighted_set(graph, weights, sort_func=_sort_by_weight_div_degrees):
+    result = []
+    deleted = [False] * len(weights)
+    sorted_vertices: list = sort_func(graph, weights)
+    neighbours = graph_data(graph).neighbours
+
+    for v in sorted_vertices:
+        if deleted[v]:
+            continue
+        result.append(v + 1)
+        for neighbour in neighbours[v]:
+            deleted[neighbour] = True
+
+    return result, sum([weights[v - 1] for v in result])
+
+
+def find_maximal_weighted_set(graph, weights):
+    set_first, weight_first = _find_maximal_weighted_set(graph, weights, _sort_desc_by_weight)
+    set_second, weight_second = _find_maximal_weighted_set(graph, weights, _sort_by_weight_div_degrees)
+
+    if weight_first > weight_second:
+        return set_first, weight_first
+    return set_second, weight_second
+
+
+def find_violated_sets(graph, weights, min_weight: float = 1.0, n_random: int = 4, seed: int = 0) -> list:
+    """ Distinct independent sets heavier than min_weight from the greedy orderings and n_random perturbed ones,
+    heaviest first """
+    rng = np.random.default_rng(seed)
+    candidates = [
+        _find_maximal_weighted_set(graph, weights, _sort_desc_by_weight),
+        _find_maximal_weighted_set(graph, weights, _sort_by_weight_div_degrees),
+    ]
+    for _ in range(n_random):
+        noise = rng.uniform(0.8, 1.2, len(weights))
+        candidates.append(_find_maximal_weighted_set(
+            graph, weights, lambda graph, weights: list(argsort(np.array(weights) * noise)[::-1])))
+    found = dict()
+    for ind_set, weight in candidates:
+        if weight > min_weight:
+            found[frozenset(ind_set)] = (sorted(ind_set), weight)
+    return sorted(found.values(), key=lambda item: -item[1])
@@ -0,0 +1 @@
+""" Graph colouring and maximum clique solvers of the labs, run with python -m labsolvers """
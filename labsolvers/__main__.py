@@ -0,0 +1,64 @@
+""" Command line interface of the lab solvers, e.g.
+
+    python -m labsolvers solve coloring graphs/myciel7.col
+    python -m labsolvers solve bnc clique_graphs/brock200_1.clq --backend highs --time-limit 600
+    python -m labsolvers benchmark --engine bnc --suite hard --backend highs --output results/bnc
+    python -m labsolvers verify results/bnc.jsonl
+    python -m labsolvers tune --engine bnc --backend highs --suite hard
+
+Only the selected command and engine are imported, so a colouring run never loads networkx, pandas or an LP engine.
+"""
+import argparse
+import importlib
+import json
+
+# Commands with their own options: module with a main(argv) function
+TOOLS = {
+    "benchmark": "labsolvers.benchmark",
+    "verify": "labsolvers.verify",
+    "tune": "labsolvers.tune",
+}
+
+
+def solve(argv=None) -> int:
+    """ Solves graph files one after another and prints a line per graph """
+    from labsolvers.benchmark import ENGINES, build_load_config, load_engine, measure_run, parse_params
+    parser = argparse.ArgumentParser(prog="python -m labsolvers solve", description="Solve graphs with one engine")
+    parser.add_argument("engine", choices=sorted(ENGINES))
+    parser.add_argument("graphs", nargs="+", help="DIMACS graph files")
+    parser.add_argument("--time-limit", type=int, help="solver time limit in seconds")
+    parser.add_argument("--param", action="append", default=[], metavar="KEY=VALUE",
+                        help="extra solver keyword argument, may be repeated")
+    parser.add_argument("--cache-dir", help="model cache directory, passed to engines that build an LP")
+    parser.add_argument("--backend", choices=["cplex", "highs"], help="LP engine of the bnb/bnc solvers")
+    parser.add_argument("--solver-params", help="LP parameter profile file of the bnb/bnc solvers")
+    parser.add_argument("--compact", action="store_true", help="load graphs as CSR arrays (coloring/clique engines)")
+    parser.add_argument("--json", action="store_true", help="print every result as a JSON line, with the solution")
+    args = parser.parse_args(argv)
+
+    config = parse_params(args.param)
+    if args.time_limit is not None:
+        config["time_limit"] = args.time_limit
+    engine = load_engine(args.engine)
+    for file_path in args.graphs:
+        row = measure_run(engine, file_path, config, build_load_config(args))
+        if args.json:
+            print(json.dumps({"instance": file_path, "engine": args.engine, **row}, default=str))
+        else:
+            print(f"{file_path}: objective - {row['objective']}, time - {row['wall_time']}")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m labsolvers", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["solve", *TOOLS])
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="options of the command, see <command> --help")
+    args = parser.parse_args(argv)
+    if args.command == "solve":
+        return solve(args.args)
+    return importlib.import_module(TOOLS[args.command]).main(args.args) or 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
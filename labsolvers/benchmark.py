@@ -0,0 +1,408 @@
+""" Benchmark harness for the lab solvers.
+
+Runs one engine over an instance set and appends a result row per run as soon as it finishes, e.g.
+
+    python -m labsolvers benchmark --engine bnc --suite hard --time-limit 600 --repeat 3 --warmup 1 --output results/bnc
+"""
+import argparse
+import ast
+import ctypes
+import gc
+import importlib
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import resource
+import time
+from labsolvers.common.results import ResultsSink, export_excel, read_results, rewrite_results
+
+EASY_CLIQUE_GRAPHS = [
+    "johnson16-2-4.clq", "johnson8-2-4.clq", "johnson8-4-4.clq",
+    "MANN_a9.clq", "keller4.clq",
+    "c-fat200-1.clq", "c-fat200-2.clq", "c-fat200-5.clq", "c-fat500-1.clq", "c-fat500-10.clq", "c-fat500-2.clq",
+    "c-fat500-5.clq",
+    "hamming6-2.clq", "hamming6-4.clq", "hamming8-2.clq", "hamming8-4.clq",
+    "gen200_p0.9_55.clq",
+    "san200_0.7_1.clq", "san200_0.9_1.clq", "san200_0.9_2.clq",
+]
+HARD_CLIQUE_GRAPHS = [
+    "C125.9.clq", "gen200_p0.9_44.clq",
+    "MANN_a27.clq", "MANN_a45.clq",
+    "p_hat300-1.clq", "p_hat300-2.clq", "p_hat300-3.clq",
+    "san200_0.7_2.clq", "san200_0.9_3.clq",
+    "brock200_2.clq", "brock200_3.clq", "brock200_4.clq", "brock200_1.clq",
+    "sanr200_0.7.clq",
+]
+SUITES = {
+    "coloring": ["myciel3.col", "myciel7.col", "latin_square_10.col", "school1.col", "school1_nsh.col",
+                 "mulsol.i.1.col", "inithx.i.1.col", "anna.col", "huck.col", "jean.col", "miles1000.col",
+                 "miles1500.col", "fpsol2.i.1.col", "le450_5a.col", "le450_15b.col", "le450_25a.col",
+                 "games120.col", "queen11_11.col", "queen5_5.col"],
+    "clique": ["brock200_1.clq", "brock200_2.clq", "brock200_3.clq", "brock200_4.clq",
+               "brock400_1.clq", "brock400_2.clq", "brock400_3.clq", "brock400_4.clq",
+               "C125.9.clq", "gen200_p0.9_44.clq", "gen200_p0.9_55.clq", "hamming8-4.clq", "johnson16-2-4.clq",
+               "johnson8-2-4.clq", "keller4.clq", "MANN_a27.clq", "MANN_a9.clq", "p_hat1000-1.clq",
+               "p_hat1000-2.clq", "p_hat1500-1.clq", "p_hat300-3.clq", "p_hat500-3.clq", "san1000.clq",
+               "sanr200_0.9.clq", "sanr400_0.7.clq"],
+    "easy": EASY_CLIQUE_GRAPHS,
+    "hard": HARD_CLIQUE_GRAPHS,
+    "exact": EASY_CLIQUE_GRAPHS + HARD_CLIQUE_GRAPHS,
+}
+
+# engine name: (subpackage, module, default suite, default graph directory relative to the working directory)
+ENGINES = {
+    "coloring": ("week1", "coloring", "coloring", "graphs"),
+    "clique": ("week2", "clique", "clique", "clique_graphs"),
+    "bnb": ("BnB", "main", "exact", "clique_graphs"),
+    "bnc": ("BnC", "main", "exact", "clique_graphs"),
+    "weighted_set": ("weighted_set", "main", "exact", "clique_graphs"),
+    "portfolio": ("", "portfolio", "exact", "clique_graphs"),
+}
+
+# Leading CSV columns, the same for result and error rows; engine specific fields are added as they appear
+RESULT_COLUMNS = ["instance", "engine", "run", "wall_time", "cpu_time", "peak_rss_kb", "objective", "error",
+                  "solution"]
+
+
+def load_engine(engine_name: str):
+    # Engines are imported on first use, so e.g. a colouring run never loads networkx or an LP engine
+    package, module_name, _, __ = ENGINES[engine_name]
+    return importlib.import_module(".".join(["labsolvers", package, module_name] if package else
+                                            ["labsolvers", module_name]))
+
+
+def read_instance_file(file_path: str) -> list:
+    with open(file_path, "r") as file:
+        return [line.strip() for line in file if line.strip() and not line.startswith("#")]
+
+
+def parse_params(params: list) -> dict:
+    config = dict()
+    for param in params:
+        key, _, value = param.partition("=")
+        try:
+            config[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            config[key] = value
+    return config
+
+
+def release_memory():
+    """ Collects garbage and gives free heap pages back to the system (glibc only), so memory left over by earlier
+    runs is not counted as resident in the next one """
+    gc.collect()
+    try:
+        ctypes.CDLL(None).malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+def reset_peak_rss() -> bool:
+    """ Restarts the VmHWM high-water mark of this process (Linux), False where that is not possible """
+    try:
+        with open("/proc/self/clear_refs", "w") as file:
+            file.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_kb() -> int:
+    """ VmHWM of this process in kilobytes, None without /proc """
+    try:
+        with open("/proc/self/status", "r") as file:
+            for line in file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def measure_run(engine, file_path: str, config: dict, load_config: dict = None) -> dict:
+    """ Solves one instance. peak_rss_kb is the peak of this run, loading included; where the peak cannot be reset
+    it is None and process_peak_rss_kb holds the peak of the whole process so far instead """
+    release_memory()
+    resettable = reset_peak_rss()
+    instance = engine.load_instance(file_path, **(load_config or dict()))
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    result = engine.solve_instance(instance, **config)
+    wall_time, cpu_time = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    memory = {"peak_rss_kb": peak_rss_kb() if resettable else None}
+    if memory["peak_rss_kb"] is None:
+        # ru_maxrss is the high-water mark of the whole process, in kilobytes on Linux
+        memory = {"peak_rss_kb": None, "process_peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}
+    return {"wall_time": round(wall_time, 3), "cpu_time": round(cpu_time, 3), **memory, **result}
+
+
+def run_instance(engine, engine_name: str, graph_dir: str, filename: str, runs: list, config: dict,
+                 warmup: int = 0, load_config: dict = None):
+    """ Yields the row of each measured run as soon as it is finished """
+    file_path = os.path.join(graph_dir, filename)
+    print(f"{filename} started...")
+    for _ in range(warmup):
+        measure_run(engine, file_path, config, load_config)
+    for run_index in runs:
+        row = {"instance": filename, "engine": engine_name, "run": run_index}
+        row.update(measure_run(engine, file_path, config, load_config))
+        row["error"] = None
+        row["solution"] = row.pop("solution", None)
+        print(f"{filename}: objective - {row['objective']}, time - {row['wall_time']}")
+        yield row
+
+
+def pending_runs(filenames: list, repeat: int, done: set) -> list:
+    tasks = []
+    for filename in filenames:
+        runs = [run_index for run_index in range(repeat) if (filename, run_index) not in done]
+        if runs:
+            tasks.append((filename, runs))
+    return tasks
+
+
+def run_benchmark(engine_name: str, filenames: list, graph_dir: str, config: dict, sinks: list,
+                  repeat: int = 1, warmup: int = 0, done: set = frozenset(), load_config: dict = None):
+    engine = load_engine(engine_name)
+    for filename, runs in pending_runs(filenames, repeat, done):
+        remaining = list(runs)
+        try:
+            for row in run_instance(engine, engine_name, graph_dir, filename, runs, config, warmup, load_config):
+                remaining.remove(row["run"])
+                _write(sinks, row)
+        except Exception as error:
+            # The same rows as a failed worker of run_parallel, for the runs not finished, and the suite goes on
+            print(f"{filename}: {error!r}")
+            for row in _error_rows(engine_name, filename, remaining, repr(error)):
+                _write(sinks, row)
+
+
+def _write(sinks: list, row: dict):
+    for sink in sinks:
+        sink.write(row)
+
+
+def _instance_worker(connection, engine_name: str, graph_dir: str, filename: str, runs: list, config: dict,
+                     warmup: int, load_config: dict):
+    """ Sends one row per finished run, so a worker killed later does not take the earlier runs with it """
+    remaining = list(runs)
+    try:
+        engine = load_engine(engine_name)
+        for row in run_instance(engine, engine_name, graph_dir, filename, runs, config, warmup, load_config):
+            connection.send(row)
+            remaining.remove(row["run"])
+    except Exception as error:
+        for row in _error_rows(engine_name, filename, remaining, repr(error)):
+            connection.send(row)
+    finally:
+        connection.close()
+
+
+def _error_rows(engine_name: str, filename: str, runs: list, error: str) -> list:
+    return [{"instance": filename, "engine": engine_name, "run": run_index, "error": error} for run_index in runs]
+
+
+def _rss_kb(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status", "r") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def expected_times(history_path: str) -> dict:
+    """ Mean wall time per instance in a previous results file """
+    totals = dict()
+    for row in read_results(history_path):
+        if row.get("wall_time") not in (None, ""):
+            total, count = totals.get(row["instance"], (0.0, 0))
+            totals[row["instance"]] = (total + float(row["wall_time"]), count + 1)
+    return {instance: total / count for instance, (total, count) in totals.items()}
+
+
+def run_parallel(engine_name: str, filenames: list, graph_dir: str, config: dict, sinks: list, jobs: int,
+                 repeat: int = 1, warmup: int = 0, done: set = frozenset(), history: dict = None,
+                 kill_after: float = None, memory_limit_mb: int = None, poll_interval: float = 1.0,
+                 load_config: dict = None):
+    """ Solves the instances in a pool of worker processes, one process per instance.
+
+    Instances start longest-first according to history (unknown ones first), workers exceeding kill_after
+    seconds or memory_limit_mb of resident memory are killed, and every row reaches the sinks as soon as its run
+    is finished, so rows come in completion order: see sort_results for the original order.
+    """
+    tasks = pending_runs(filenames, repeat, done)
+    history = history or dict()
+    queue = sorted(range(len(tasks)), key=lambda index: -history.get(tasks[index][0], float("inf")))
+    # receiver: (process, task index, start time, runs without a row yet)
+    running = dict()
+    while queue or running:
+        while queue and len(running) < jobs:
+            index = queue.pop(0)
+            filename, runs = tasks[index]
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(
+                target=_instance_worker, args=(sender, engine_name, graph_dir, filename, runs, config, warmup, load_config)
+            )
+            process.start()
+            sender.close()
+            running[receiver] = (process, index, time.time(), list(runs))
+
+        for receiver in multiprocessing.connection.wait(list(running), timeout=poll_interval):
+            process, index, _, remaining = running[receiver]
+            try:
+                row = receiver.recv()
+            except EOFError:
+                del running[receiver]
+                receiver.close()
+                process.join()
+                # Runs the worker never reported, e.g. after a crash of the interpreter
+                for row in _error_rows(engine_name, tasks[index][0], remaining,
+                                       f"worker exited with code {process.exitcode}"):
+                    _write(sinks, row)
+                continue
+            remaining.remove(row["run"])
+            _write(sinks, row)
+
+        for receiver, (process, index, started, remaining) in list(running.items()):
+            filename = tasks[index][0]
+            error = None
+            if kill_after is not None and time.time() - started > kill_after:
+                error = f"killed after {kill_after}s"
+            elif memory_limit_mb is not None and _rss_kb(process.pid) > memory_limit_mb * 1024:
+                error = f"killed above {memory_limit_mb}MB"
+            if error is not None:
+                print(f"{filename}: {error}")
+                process.kill()
+                process.join()
+                del running[receiver]
+                # Rows sent before the kill are kept, only the unfinished runs get an error row
+                while receiver.poll():
+                    try:
+                        row = receiver.recv()
+                    except EOFError:
+                        break
+                    remaining.remove(row["run"])
+                    _write(sinks, row)
+                receiver.close()
+                for row in _error_rows(engine_name, filename, remaining, error):
+                    _write(sinks, row)
+
+
+def sort_results(file_path: str, filenames: list):
+    """ Rewrites a results file with its rows in instance list order, then by run """
+    position = {filename: i for i, filename in enumerate(filenames)}
+    rows = read_results(file_path)
+    if not rows:
+        return
+    rows.sort(key=lambda row: (position.get(row["instance"], len(position)), int(row["run"])))
+    rewrite_results(file_path, rows)
+
+
+def build_load_config(args) -> dict:
+    """ load_instance arguments from the --cache-dir, --backend, --solver-params and --compact options """
+    load_config = dict()
+    if args.cache_dir:
+        load_config["cache_dir"] = args.cache_dir
+    if args.backend:
+        load_config["backend"] = args.backend
+    if args.solver_params:
+        load_config["param_file"] = os.path.abspath(args.solver_params)
+    if args.compact:
+        load_config["compact"] = True
+    return load_config
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m labsolvers benchmark",
+                                     description="Benchmark one of the lab solvers on an instance set")
+    parser.add_argument("--engine", choices=sorted(ENGINES), required=True)
+    parser.add_argument("--suite", choices=sorted(SUITES), help="named instance set (default depends on the engine)")
+    parser.add_argument("--instances", nargs="+", help="instance file names, overrides --suite")
+    parser.add_argument("--instance-file", help="file with one instance name per line, overrides --suite")
+    parser.add_argument("--graph-dir", help="directory with the graph files (default depends on the engine)")
+    parser.add_argument("--time-limit", type=int, help="solver time limit in seconds")
+    parser.add_argument("--param", action="append", default=[], metavar="KEY=VALUE",
+                        help="extra solver keyword argument, may be repeated")
+    parser.add_argument("--cache-dir", help="root LP row cache of the engines that build an LP; learned cuts are not "
+                                            "carried over, so repeated runs stay comparable")
+    parser.add_argument("--backend", choices=["cplex", "highs"], help="LP engine of the bnb/bnc solvers")
+    parser.add_argument("--solver-params", help="LP parameter profile file of the bnb/bnc solvers, see tune.py")
+    parser.add_argument("--compact", action="store_true",
+                        help="load graphs as CSR arrays (coloring/clique engines), for very large instances")
+    parser.add_argument("--repeat", type=int, default=1, help="measured runs per instance")
+    parser.add_argument("--warmup", type=int, default=0, help="unmeasured runs per instance before measuring")
+    parser.add_argument("--output", default="results", help="output path prefix for .csv and .jsonl files")
+    parser.add_argument("--append", action="store_true",
+                        help="keep existing results and skip the runs already recorded in them")
+    parser.add_argument("--jobs", type=int, default=1, help="number of worker processes, one instance per worker")
+    parser.add_argument("--history", help="previous results file used to start the longest instances first")
+    parser.add_argument("--kill-after", type=float, help="kill a worker after this many seconds (per instance)")
+    parser.add_argument("--memory-limit", type=int, help="kill a worker above this resident memory, in MB")
+    parser.add_argument("--excel", help="also export the results to this .xlsx file when the run is finished")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    _, __, default_suite, default_graph_dir = ENGINES[args.engine]
+    if args.instances:
+        filenames = args.instances
+    elif args.instance_file:
+        filenames = read_instance_file(args.instance_file)
+    else:
+        filenames = SUITES[args.suite or default_suite]
+    graph_dir = args.graph_dir or default_graph_dir
+
+    config = parse_params(args.param)
+    if args.time_limit is not None:
+        config["time_limit"] = args.time_limit
+
+    load_config = build_load_config(args)
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    csv_path, jsonl_path = args.output + ".csv", args.output + ".jsonl"
+    done = set()
+    if args.append:
+        done = {(row["instance"], int(row["run"])) for row in read_results(jsonl_path)}
+    else:
+        for file_path in (csv_path, jsonl_path):
+            if os.path.exists(file_path):
+                os.remove(file_path)
+    with open(args.output + ".meta.json", "w") as file:
+        json.dump({
+            "engine": args.engine,
+            "instances": filenames,
+            "graph_dir": os.path.abspath(graph_dir),
+            "config": config,
+            "load_config": load_config,
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+            "started": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }, file, indent=1)
+
+    with ResultsSink(csv_path, RESULT_COLUMNS) as csv_sink, ResultsSink(jsonl_path) as jsonl_sink:
+        sinks = [csv_sink, jsonl_sink]
+        parallel = args.jobs > 1 or args.kill_after is not None or args.memory_limit is not None
+        if parallel:
+            history = expected_times(args.history) if args.history else None
+            run_parallel(args.engine, filenames, graph_dir, config, sinks, args.jobs, repeat=args.repeat,
+                         warmup=args.warmup, done=done, history=history, kill_after=args.kill_after,
+                         memory_limit_mb=args.memory_limit, load_config=load_config)
+        else:
+            run_benchmark(args.engine, filenames, graph_dir, config, sinks,
+                          repeat=args.repeat, warmup=args.warmup, done=done, load_config=load_config)
+    if parallel:
+        # The .jsonl file keeps the completion order; the CSV report is put back in instance order
+        sort_results(csv_path, filenames)
+
+    if args.excel:
+        export_excel(csv_path, args.excel, sheet_name=args.engine)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import json
+import os
+
+
+def save_checkpoint(file_path: str, state: dict):
+    """ Writes the checkpoint atomically, so a crash never leaves a half-written file behind """
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(state, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, file_path)
+
+
+def load_checkpoint(file_path: str) -> dict:
+    with open(file_path, "r") as file:
+        state = json.load(file)
+    state["open_nodes"] = [[tuple(fixing) for fixing in node] for node in state["open_nodes"]]
+    return state
+
+
+def open_nodes(branch_path: list, pending_nodes: list) -> list:
+    """ Open nodes of the depth-first search as lists of (variable index, value) fixings, in processing order.
+
+    branch_path holds (variable index, value, is_first_branch) for every branching above the current node,
+    so each first branch still has its sibling to explore.
+    """
+    nodes = [[(var_index, value) for var_index, value, _ in branch_path]]
+    for depth in range(len(branch_path) - 1, -1, -1):
+        var_index, value, is_first_branch = branch_path[depth]
+        if is_first_branch:
+            nodes.append([(v, val) for v, val, _ in branch_path[:depth]] + [(var_index, 1 - value)])
+    return nodes + pending_nodes
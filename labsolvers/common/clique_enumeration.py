@@ -0,0 +1,101 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from labsolvers.common.graph_cache import graph_data
+from labsolvers.common.independent_sets import bits, popcount
+
+# Bron-Kerbosch enumeration with Tomita pivoting over int bitsets. The outer loop follows the degeneracy order:
+# vertex v starts with the candidates P = its later neighbours and the excluded X = its earlier neighbours, so every
+# maximal clique is reported once, from its earliest vertex, and P never holds more than `degeneracy` vertices.
+# Cliques are yielded as lists of graph vertices (vertex ids for nx graphs, 0-based for neighbour set lists).
+
+
+def _expand(adjacency: list, clique: list, candidates: int, excluded: int, bound: list):
+    """ Maximal cliques extending `clique` with `bound[0]` or more vertices; bound may be raised meanwhile """
+    if not candidates:
+        if not excluded and len(clique) >= bound[0]:
+            yield clique
+        return
+    if len(clique) + popcount(candidates) < bound[0]:
+        return
+    # The pivot has the most neighbours among the candidates, which then need not start a branch themselves
+    pivot = max(bits(candidates | excluded), key=lambda u: popcount(candidates & adjacency[u]))
+    for vertex in bits(candidates & ~adjacency[pivot]):
+        clique.append(vertex)
+        yield from _expand(adjacency, clique, candidates & adjacency[vertex], excluded & adjacency[vertex], bound)
+        clique.pop()
+        candidates &= ~(1 << vertex)
+        excluded |= 1 << vertex
+
+
+def _outer_loop(adjacency: list, order: list):
+    """ (vertex, candidates, excluded) of every outer iteration """
+    later = (1 << len(adjacency)) - 1
+    for vertex in order:
+        later ^= 1 << vertex
+        yield vertex, adjacency[vertex] & later, adjacency[vertex] & ~later
+
+
+def _degeneracy_order(data) -> list:
+    # degeneracy_order is smallest-last, i.e. the removal order reversed, so every vertex has few later neighbours
+    return data.degeneracy_order[::-1]
+
+
+def maximal_cliques(graph, min_size: int = 1):
+    """ Lazily yields every maximal clique with at least min_size vertices """
+    data = graph_data(graph)
+    adjacency, nodes = data.adjacency, data.nodes
+    bound = [min_size]
+    for vertex, candidates, excluded in _outer_loop(adjacency, _degeneracy_order(data)):
+        for clique in _expand(adjacency, [vertex], candidates, excluded, bound):
+            yield [nodes[i] for i in clique]
+
+
+def clique_number(graph) -> int:
+    """ Size of a maximum clique, by the same enumeration with the size filter raised after every clique found """
+    data = graph_data(graph)
+    adjacency = data.adjacency
+    bound = [1]
+    for vertex, candidates, excluded in _outer_loop(adjacency, _degeneracy_order(data)):
+        for clique in _expand(adjacency, [vertex], candidates, excluded, bound):
+            bound[0] = len(clique) + 1
+    return bound[0] - 1 if adjacency else 0
+
+
+def maximum_cliques(graph):
+    """ Lazily yields every maximum clique """
+    omega = clique_number(graph)
+    if omega:
+        yield from maximal_cliques(graph, min_size=omega)
+
+
+_worker_adjacency = None
+
+
+def _init_worker(adjacency: list):
+    global _worker_adjacency
+    _worker_adjacency = adjacency
+
+
+def _chunk_cliques(chunk: list, min_size: int) -> list:
+    return [list(clique) for vertex, candidates, excluded in chunk
+            for clique in _expand(_worker_adjacency, [vertex], candidates, excluded, [min_size])]
+
+
+def parallel_maximal_cliques(graph, min_size: int = 1, n_jobs: int = 2, chunk_size: int = 64):
+    """ maximal_cliques with the outer loop split into chunks of vertices across n_jobs processes. Cliques come in
+    the serial order; at most 2 * n_jobs chunks are in flight, so memory stays bounded by the chunk results """
+    data = graph_data(graph)
+    adjacency, nodes = data.adjacency, data.nodes
+    outer = _outer_loop(adjacency, _degeneracy_order(data))
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(adjacency,)) as executor:
+        in_flight = deque()
+        while True:
+            while len(in_flight) < 2 * n_jobs:
+                chunk = [task for _, task in zip(range(chunk_size), outer)]
+                if not chunk:
+                    break
+                in_flight.append(executor.submit(_chunk_cliques, chunk, min_size))
+            if not in_flight:
+                return
+            for clique in in_flight.popleft().result():
+                yield [nodes[i] for i in clique]
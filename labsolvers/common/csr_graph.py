@@ -0,0 +1,156 @@
+import re
+import sys
+from array import array
+import numpy as np
+
+# Undirected graph on vertices 0..n-1 in compressed sparse row form: the sorted neighbours of v are
+# indices[indptr[v]:indptr[v + 1]]. About 8 bytes per edge, against a few hundred for nx.Graph or a list of sets.
+
+# Column of the source vertex in an int32 (target, source) pair whose int64 view sorts by source, then target
+_SOURCE = 1 if sys.byteorder == "little" else 0
+
+
+class Neighbourhood:
+    """ Read-only view of one neighbour list, usable where the solvers expect a set of vertices """
+    __slots__ = ("array",)
+
+    def __init__(self, neighbours: np.ndarray):
+        self.array = neighbours
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def __iter__(self):
+        # A short-lived list of Python ints is much faster to loop over than NumPy scalars
+        return iter(self.array.tolist())
+
+    def __contains__(self, vertex) -> bool:
+        position = np.searchsorted(self.array, vertex)
+        return position < len(self.array) and self.array[position] == vertex
+
+
+class CSRGraph:
+    # __weakref__ lets the graph cache refer to a graph without keeping it alive
+    __slots__ = ("indptr", "indices", "__weakref__")
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray):
+        self.indptr = indptr
+        self.indices = indices
+
+    @classmethod
+    def from_edges(cls, n_vertices: int, edges: np.ndarray) -> "CSRGraph":
+        """ Builds the graph from a (m, 2) array of 0-based edges, dropping loops and duplicates """
+        edges = np.asarray(edges, dtype=np.int32).reshape(-1, 2)
+        pairs = np.empty((2 * len(edges), 2), dtype=np.int32)
+        pairs[:len(edges)] = edges
+        pairs[len(edges):] = edges[:, ::-1]
+        return cls._from_pairs(n_vertices, pairs)
+
+    @classmethod
+    def _from_pairs(cls, n_vertices: int, pairs: np.ndarray) -> "CSRGraph":
+        """ Sorts both-direction int32 vertex pairs in place and keeps only the target column """
+        # Sorting the int64 view orders the pairs by source, then target, without any wider temporary copy
+        keys = pairs.view(np.int64).reshape(-1)
+        keys.sort()
+        keep = pairs[:, 0] != pairs[:, 1]
+        keep[1:] &= keys[1:] != keys[:-1]
+        if not keep.all():
+            keys = keys[keep]
+        del keep
+        # Each key is source << 32 | target, so row starts are found by binary search instead of a counting pass
+        indptr = np.searchsorted(keys, np.arange(n_vertices + 1, dtype=np.int64) << 32)
+        return cls(indptr, keys.view(np.int32)[1 - _SOURCE::2].copy())
+
+    @classmethod
+    def read_dimacs(cls, file_path: str) -> "CSRGraph":
+        """ Reads a DIMACS graph straight into a flat int32 array of both-direction pairs """
+        n_vertices = 0
+        ends = array("i")
+        size = 0
+        with open(file_path, "r") as file:
+            for line in file:
+                if line[0] == "e":
+                    _, start, finish = line.split()[:3]
+                    start, finish = int(start) - 1, int(finish) - 1
+                    if size + 4 <= len(ends):
+                        ends[size], ends[size + 1], ends[size + 2], ends[size + 3] = start, finish, finish, start
+                    else:
+                        ends.extend((start, finish, finish, start))
+                    size += 4
+                elif line[0] == "p":
+                    _, __, vertices, edges = re.split(r"\s+", line.strip())[:4]
+                    n_vertices = int(vertices)
+                    # Allocated once from the declared edge count, as growing the array copies it repeatedly
+                    ends = array("i", [0]) * (4 * int(edges))
+        del ends[size:]
+        return cls._from_pairs(n_vertices, np.frombuffer(ends, dtype=np.int32).reshape(-1, 2))
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def __getitem__(self, vertex: int) -> Neighbourhood:
+        return Neighbourhood(self.neighbours(vertex))
+
+    def __iter__(self):
+        return (self[vertex] for vertex in range(len(self)))
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.indices) // 2
+
+    def neighbours(self, vertex: int) -> np.ndarray:
+        """ Sorted neighbours of the vertex, a view into the index array """
+        return self.indices[self.indptr[vertex]:self.indptr[vertex + 1]]
+
+    def degree(self, vertex: int) -> int:
+        return int(self.indptr[vertex + 1] - self.indptr[vertex])
+
+    def degrees(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def has_edge(self, u: int, v: int) -> bool:
+        return v in self[u]
+
+    def edges(self) -> tuple:
+        """ Source and target arrays of both directions of every edge """
+        return np.repeat(np.arange(len(self), dtype=np.int32), self.degrees()), self.indices
+
+    def induced(self, vertices) -> "InducedSubgraph":
+        return InducedSubgraph(self, vertices)
+
+
+class InducedSubgraph:
+    """ View of the subgraph induced by a vertex subset; vertices keep their ids and nothing is copied up front """
+    __slots__ = ("graph", "vertices", "mask")
+
+    def __init__(self, graph: CSRGraph, vertices):
+        self.graph = graph
+        self.vertices = np.unique(np.asarray(vertices, dtype=np.int32))
+        self.mask = np.zeros(len(graph), dtype=bool)
+        self.mask[self.vertices] = True
+
+    def __len__(self) -> int:
+        return len(self.vertices)
+
+    def __contains__(self, vertex) -> bool:
+        return bool(self.mask[vertex])
+
+    def __getitem__(self, vertex: int) -> Neighbourhood:
+        return Neighbourhood(self.neighbours(vertex))
+
+    def neighbours(self, vertex: int) -> np.ndarray:
+        neighbours = self.graph.neighbours(vertex)
+        return neighbours[self.mask[neighbours]]
+
+    def degree(self, vertex: int) -> int:
+        return int(np.count_nonzero(self.mask[self.graph.neighbours(vertex)]))
+
+    def degrees(self) -> np.ndarray:
+        """ Degrees inside the subgraph, for the subgraph vertices in sorted order """
+        # Gathers only the neighbour lists of the subgraph vertices, in one vectorized pass
+        starts = self.graph.indptr[self.vertices]
+        lengths = self.graph.indptr[self.vertices + 1] - starts
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        neighbours = self.graph.indices[np.repeat(starts, lengths) + offsets]
+        owners = np.repeat(np.arange(len(self.vertices)), lengths)
+        return np.bincount(owners[self.mask[neighbours]], minlength=len(self.vertices))
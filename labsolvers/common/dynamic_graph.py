@@ -0,0 +1,204 @@
+from labsolvers.common.csr_graph import CSRGraph
+from labsolvers.common.graph_cache import default_cache
+
+# Edge updates on the neighbour sets of a ColoringProblem or MaxCliqueProblem (0-based vertices), each followed by
+# a local repair of the problem's solution: work is proportional to the degrees of the touched vertices and to the
+# capped Kempe chains, not to the size of the graph.
+
+
+class DynamicGraph:
+    def __init__(self, problem):
+        if isinstance(problem.neighbour_sets, CSRGraph):
+            raise TypeError("Compact graphs are read-only, load the graph without compact=True")
+        self.problem = problem
+        self.neighbour_sets = problem.neighbour_sets
+        self.updates = 0
+
+    def add_edge(self, u: int, v: int):
+        if u == v or v in self.neighbour_sets[u]:
+            return
+        self.neighbour_sets[u].add(v)
+        self.neighbour_sets[v].add(u)
+        self._changed()
+        self.edge_added(u, v)
+
+    def remove_edge(self, u: int, v: int):
+        if v not in self.neighbour_sets[u]:
+            return
+        self.neighbour_sets[u].discard(v)
+        self.neighbour_sets[v].discard(u)
+        self._changed()
+        self.edge_removed(u, v)
+
+    def apply(self, added: list = (), removed: list = ()):
+        """ Removes and then adds (u, v) edges """
+        for u, v in removed:
+            self.remove_edge(u, v)
+        for u, v in added:
+            self.add_edge(u, v)
+
+    def _changed(self):
+        # Derived data (degrees, orders, bitsets) of the old graph must not be served any more
+        default_cache.invalidate(self.neighbour_sets)
+        self.updates += 1
+
+    def edge_added(self, u: int, v: int):
+        pass
+
+    def edge_removed(self, u: int, v: int):
+        pass
+
+
+class DynamicColoring(DynamicGraph):
+    """ Keeps ColoringProblem.colors proper: a new edge between equal colours recolours one endpoint with a free
+    colour, else with a Kempe chain swap that frees one, else with a new colour. Removed edges may let an endpoint
+    of the highest colour move down, and emptied colour classes are refilled from the highest one """
+
+    def __init__(self, problem, max_chain: int = 1000, kempe_colors: int = 3):
+        super().__init__(problem)
+        # Kempe chains longer than max_chain are not swapped, for kempe_colors least used colours around the vertex
+        self.max_chain = max_chain
+        self.kempe_colors = kempe_colors
+        self.classes = [set() for _ in range(problem.maxColor + 1)]
+        for vertex, color in enumerate(problem.colors):
+            self.classes[color].add(vertex)
+        self.recolored = 0
+        self.kempe_swaps = 0
+
+    def _set_color(self, vertex: int, color: int):
+        colors = self.problem.colors
+        self.classes[colors[vertex]].discard(vertex)
+        if color == len(self.classes):
+            self.classes.append(set())
+            self.problem.maxColor = color
+        self.classes[color].add(vertex)
+        colors[vertex] = color
+
+    def edge_added(self, u: int, v: int):
+        colors = self.problem.colors
+        if colors[u] != colors[v]:
+            return
+        # The endpoint with fewer neighbours is cheaper to recolour; a new colour only if neither can be repaired
+        first, second = sorted((u, v), key=lambda vertex: len(self.neighbour_sets[vertex]))
+        if not self._recolor(first) and not self._recolor(second):
+            self._set_color(first, self.problem.maxColor + 1)
+            self.recolored += 1
+        self._compact()
+
+    def edge_removed(self, u: int, v: int):
+        for vertex in (u, v):
+            if self.problem.colors[vertex] == self.problem.maxColor:
+                free = self._free_color(vertex)
+                if free is not None:
+                    self._set_color(vertex, free)
+                    self.recolored += 1
+        self._compact()
+
+    def _free_color(self, vertex: int):
+        """ Smallest colour below the vertex's own that no neighbour has """
+        used = {self.problem.colors[neighbour] for neighbour in self.neighbour_sets[vertex]}
+        return next((color for color in range(1, self.problem.colors[vertex]) if color not in used), None)
+
+    def _recolor(self, vertex: int) -> bool:
+        """ Gives the vertex a colour of 1..maxColor other than its own that no neighbour has, if needed by a Kempe
+        chain swap. False if no such colour was found """
+        colors = self.problem.colors
+        own = colors[vertex]
+        neighbours = self.neighbour_sets[vertex]
+        counts = dict()
+        for neighbour in neighbours:
+            counts[colors[neighbour]] = counts.get(colors[neighbour], 0) + 1
+        for color in range(1, self.problem.maxColor + 1):
+            if color != own and color not in counts:
+                self._set_color(vertex, color)
+                self.recolored += 1
+                return True
+        # Swap colours a and b on the chains through the a-coloured neighbours, if no chain reaches a b-coloured
+        # neighbour: afterwards no neighbour has colour a
+        for a in sorted((color for color in counts if color != own), key=counts.get)[:self.kempe_colors]:
+            starts = [neighbour for neighbour in neighbours if colors[neighbour] == a]
+            for b in range(1, self.problem.maxColor + 1):
+                if b == a:
+                    continue
+                chain = self._kempe_chain(starts, a, b, vertex)
+                if chain is None or any(colors[member] == b and member in neighbours for member in chain):
+                    continue
+                for member in chain:
+                    self._set_color(member, b if colors[member] == a else a)
+                self._set_color(vertex, a)
+                self.recolored += len(chain) + 1
+                self.kempe_swaps += 1
+                return True
+        return False
+
+    def _kempe_chain(self, starts: list, a: int, b: int, excluded: int):
+        """ Vertices coloured a or b connected to the starts over such vertices, None above max_chain vertices """
+        colors = self.problem.colors
+        chain = set(starts)
+        stack = list(starts)
+        while stack:
+            current = stack.pop()
+            for neighbour in self.neighbour_sets[current]:
+                if neighbour not in chain and neighbour != excluded and colors[neighbour] in (a, b):
+                    chain.add(neighbour)
+                    stack.append(neighbour)
+                    if len(chain) > self.max_chain:
+                        return None
+        return chain
+
+    def _compact(self):
+        """ Drops empty colour classes: the highest class takes the place of an empty one """
+        for color in range(self.problem.maxColor, 0, -1):
+            if self.classes[color]:
+                continue
+            top = self.problem.maxColor
+            if color != top:
+                for vertex in list(self.classes[top]):
+                    self._set_color(vertex, color)
+                    self.recolored += 1
+            self.classes.pop()
+            self.problem.maxColor = top - 1
+
+
+class DynamicClique(DynamicGraph):
+    """ Keeps MaxCliqueProblem.best_clique a clique: a removed edge inside it drops one endpoint and the rest is
+    extended greedily; an added edge is tried as the seed of a larger clique """
+
+    def __init__(self, problem):
+        super().__init__(problem)
+        self.repairs = 0
+        self.improvements = 0
+
+    def edge_removed(self, u: int, v: int):
+        members = set(self.problem.best_clique)
+        if u not in members or v not in members:
+            return
+        rest = [vertex for vertex in self.problem.best_clique if vertex not in (u, v)]
+        self.problem.best_clique = max((self._extend(rest + [u]), self._extend(rest + [v])), key=len)
+        self.repairs += 1
+
+    def edge_added(self, u: int, v: int):
+        best = self.problem.best_clique
+        candidates = [self._extend([u, v])]
+        if u in best or v in best:
+            # The other endpoint may now be adjacent to the whole clique
+            candidates.append(self._extend(best))
+        clique = max(candidates, key=len)
+        if len(clique) > len(best):
+            self.problem.best_clique = clique
+            self.improvements += 1
+
+    def _extend(self, clique: list) -> list:
+        """ Adds common neighbours of the clique, most connected first, while they stay adjacent to all members """
+        clique = list(clique)
+        if not clique:
+            return clique
+        neighbour_sets = self.neighbour_sets
+        pivot = min(clique, key=lambda vertex: len(neighbour_sets[vertex]))
+        candidates = [vertex for vertex in neighbour_sets[pivot]
+                      if all(vertex in neighbour_sets[member] for member in clique if member != pivot)]
+        candidates.sort(key=lambda vertex: len(neighbour_sets[vertex]), reverse=True)
+        for vertex in candidates:
+            if all(vertex in neighbour_sets[member] for member in clique):
+                clique.append(vertex)
+        return clique
@@ -0,0 +1,84 @@
+import asyncio
+
+# Observers are callables that receive the event dicts recorded by SolverStats ("incumbent", "bound", "sample",
+# "progress", "root_cuts" and a final "finish"), each with "time", "nodes", "best_obj_value" and "bound". An
+# observer that returns True, or sets a `stopped` attribute, asks the solver to stop, which it does by raising
+# SearchStopped at the next node.
+
+
+class SearchStopped(Exception):
+    pass
+
+
+def global_bound(branch_path: list, node_bounds: list, node_bound: float) -> float:
+    """ Upper bound of the whole depth-first search from the LP bounds of the nodes on the current path.
+
+    node_bounds[d] is the LP bound of the node that made branching branch_path[d]. The shallowest such node
+    whose second branch is still open bounds everything not yet explored, as LP bounds only decrease downwards.
+    """
+    for depth, (_, __, is_first_branch) in enumerate(branch_path):
+        if is_first_branch:
+            return node_bounds[depth]
+    return node_bound
+
+
+def stop_at_objective(target: float):
+    """ Observer that stops the search once the incumbent reaches the target """
+    def observer(event: dict) -> bool:
+        return event["best_obj_value"] is not None and event["best_obj_value"] >= target
+    return observer
+
+
+def stop_at_gap(gap: float):
+    """ Observer that stops the search once (bound - incumbent) / bound is at most gap """
+    def observer(event: dict) -> bool:
+        best, bound = event["best_obj_value"], event["bound"]
+        return best is not None and bound is not None and bound - best <= gap * max(abs(bound), 1e-9)
+    return observer
+
+
+def primal_integral(events: list, optimum: float, time_limit: float) -> float:
+    """ Integral over [0, time_limit] of the primal gap 1 - incumbent / optimum, from the incumbent events """
+    integral, last_time, gap = 0.0, 0.0, 1.0
+    for event in events:
+        if event["event"] != "incumbent" or event["time"] > time_limit:
+            continue
+        integral += gap * (event["time"] - last_time)
+        last_time = event["time"]
+        gap = 1.0 - event["best_obj_value"] / optimum if event["best_obj_value"] else 1.0
+    return integral + gap * (time_limit - last_time)
+
+
+class EventStream:
+    """ Observer that hands the events to asyncio consumers while the solver runs in another thread:
+
+        stream = EventStream()
+        result = loop.run_in_executor(None, lambda: solve_instance(instance, observers=[stream]))
+        async for event in stream:
+            if event["best_obj_value"] >= target:
+                stream.stop()
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop = None):
+        self.loop = loop or asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+        self.stopped = False
+        self._finished = False
+
+    def __call__(self, event: dict) -> bool:
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, event)
+        return False
+
+    def stop(self):
+        """ The solver stops at its next node """
+        self.stopped = True
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        if self._finished:
+            raise StopAsyncIteration
+        event = await self.queue.get()
+        self._finished = event["event"] == "finish"
+        return event
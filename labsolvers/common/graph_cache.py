@@ -0,0 +1,240 @@
+import hashlib
+import sys
+import weakref
+from collections import OrderedDict
+import numpy as np
+from labsolvers.common.csr_graph import CSRGraph
+from labsolvers.common.independent_sets import adjacency_bitsets, independent_set_cover, smallest_last_peel
+from labsolvers.common.model_cache import graph_key
+
+# Data derived from a graph (degrees, orderings, bitset rows, colour classes), computed on first use and shared by
+# every component that sees the same graph. Graphs are nx.Graph, CSRGraph or lists of neighbour sets over 0..n-1;
+# derived data is indexed by position in the sorted vertex list, so position i is vertex i + 1 for DIMACS graphs.
+# Graphs must not be changed while cached, or must be invalidated after the change.
+#
+# The cache refers to nx.Graph and CSRGraph objects weakly, so their data goes once the graph is gone. A list of
+# neighbour sets cannot be referred to weakly: its GraphData keeps it, and its size counts towards max_bytes.
+
+
+def _nbytes(value) -> int:
+    """ Rough memory footprint of a cached value """
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(_nbytes(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def is_nx_graph(graph) -> bool:
+    # networkx takes a fifth of a second to import, so it is not imported here: no nx.Graph exists without it
+    nx = sys.modules.get("networkx")
+    return nx is not None and isinstance(graph, nx.Graph)
+
+
+def content_key(graph) -> str:
+    if is_nx_graph(graph):
+        return graph_key(graph, {})
+    digest = hashlib.sha256()
+    if isinstance(graph, CSRGraph):
+        digest.update(graph.indptr.tobytes())
+        digest.update(graph.indices.tobytes())
+    else:
+        digest.update(np.array([len(graph)], dtype=np.int64).tobytes())
+        for neighbours in graph:
+            digest.update(np.sort(np.fromiter(neighbours, dtype=np.int64, count=len(neighbours))).tobytes())
+            digest.update(b"|")
+    return digest.hexdigest()[:32]
+
+
+def _reference(graph):
+    """ Weak reference to the graph, or a function returning it for graphs that have none """
+    try:
+        return weakref.ref(graph)
+    except TypeError:
+        return lambda: graph
+
+
+class GraphData:
+    """ Lazily computed derived data of one graph """
+
+    def __init__(self, graph, cache: "GraphCache" = None):
+        self.reference = _reference(graph)
+        self.cache = cache
+        self.values = dict()
+        # A graph held strongly is part of the footprint
+        self.nbytes = 0 if isinstance(self.reference, weakref.ref) else _nbytes(graph)
+        if is_nx_graph(graph):
+            self.nodes = sorted(graph.nodes())
+        else:
+            self.nodes = list(range(len(graph)))
+
+    @property
+    def graph(self):
+        """ The graph, None once it is gone """
+        return self.reference()
+
+    def _get(self, name, compute):
+        if name not in self.values:
+            value = compute()
+            self.values[name] = value
+            size = _nbytes(value)
+            self.nbytes += size
+            if self.cache is not None:
+                self.cache.grown(self, size)
+        return self.values[name]
+
+    @property
+    def neighbours(self) -> list:
+        """ Neighbour positions of every vertex """
+        def compute():
+            if is_nx_graph(self.graph):
+                position = {node: i for i, node in enumerate(self.nodes)}
+                return [[position[u] for u in self.graph[v] if u != v] for v in self.nodes]
+            return [list(self.graph[v]) for v in self.nodes]
+        return self._get("neighbours", compute)
+
+    @property
+    def degrees(self) -> np.ndarray:
+        def compute():
+            if isinstance(self.graph, CSRGraph):
+                return self.graph.degrees()
+            return np.array([len(neighbours) for neighbours in self.neighbours], dtype=np.int64)
+        return self._get("degrees", compute)
+
+    @property
+    def degree_order(self) -> list:
+        """ Positions by decreasing degree, ties by position """
+        return self._get("degree_order", lambda: np.argsort(-self.degrees, kind="stable").tolist())
+
+    @property
+    def adjacency(self) -> list:
+        """ Neighbours of every vertex as an int bitset over positions """
+        return self._get("adjacency", lambda: adjacency_bitsets(self.graph, self.nodes)
+                         if is_nx_graph(self.graph) else
+                         [sum(1 << u for u in neighbours) for neighbours in self.neighbours])
+
+    @property
+    def complement(self) -> list:
+        """ Non-neighbours of every vertex except itself as an int bitset """
+        everything = (1 << len(self.nodes)) - 1
+        return self._get("complement", lambda: [everything & ~row & ~(1 << i) for i, row in enumerate(self.adjacency)])
+
+    @property
+    def degeneracy_order(self) -> list:
+        """ Smallest-last order: every vertex has at most `degeneracy` neighbours before it """
+        return self._peel[0]
+
+    @property
+    def core_numbers(self) -> np.ndarray:
+        return self._peel[1]
+
+    @property
+    def _peel(self) -> tuple:
+        """ Smallest-last order and core numbers from one linear bucket pass over the neighbour lists """
+        def compute():
+            order, cores = smallest_last_peel(self.neighbours)
+            return order[::-1], np.array(cores, dtype=np.int64)
+        return self._get("peel", compute)
+
+    def color_classes(self, n_random: int = 40, seed: int = 0, min_size: int = 3, n_jobs: int = 1) -> set:
+        """ Maximal independent sets of independent_set_cover, as bitsets over positions """
+        return self._get(("color_classes", n_random, seed, min_size), lambda: independent_set_cover(
+            self.adjacency, n_random=n_random, seed=seed, min_size=min_size, n_jobs=n_jobs,
+            smallest_last=self.degeneracy_order))
+
+
+class GraphCache:
+    """ GraphData by graph, found by object identity first and content hash second, evicted least recently used
+    first once the derived data (and the graphs held strongly) outgrow max_bytes or there are more than max_graphs
+    graphs. Data of a weakly referred graph is dropped soon after the graph is gone """
+
+    def __init__(self, max_bytes: int = 256 * 2 ** 20, max_graphs: int = 64):
+        self.max_bytes = max_bytes
+        self.max_graphs = max_graphs
+        self.entries = OrderedDict()
+        # id(graph) -> (reference, key); a weak reference is dead before the id can be reused
+        self.by_id = dict()
+        self.nbytes = 0
+        # (graph id, reference) of graphs that are gone, filled by weakref callbacks and handled by collect()
+        self._gone = []
+
+    def get(self, graph) -> GraphData:
+        self.collect()
+        mapped = self.by_id.get(id(graph))
+        if mapped is not None and mapped[0]() is graph:
+            key = mapped[1]
+        else:
+            key = content_key(graph)
+            data = self.entries.get(key)
+            if data is None:
+                data = self.entries[key] = GraphData(graph, self)
+                self.nbytes += data.nbytes
+            elif data.graph is None:
+                data.reference = _reference(graph)
+            self._map(graph, key)
+        self.entries.move_to_end(key)
+        data = self.entries[key]
+        self._shrink(data)
+        return data
+
+    def _map(self, graph, key):
+        gone = self._gone
+        try:
+            # The callback may run in the middle of any cache operation, so it only takes a note
+            reference = weakref.ref(graph, lambda ref, graph_id=id(graph): gone.append((graph_id, ref)))
+        except TypeError:
+            # Only the graph the data holds itself is mapped, other equal lists are found by their content
+            if self.entries[key].graph is not graph:
+                return
+            reference = self.entries[key].reference
+        self.by_id[id(graph)] = (reference, key)
+
+    def collect(self):
+        """ Drops the data of graphs that are gone, or hands it to an equal graph that is still there """
+        while self._gone:
+            graph_id, reference = self._gone.pop()
+            mapped = self.by_id.get(graph_id)
+            if mapped is None or mapped[0] is not reference:
+                continue
+            del self.by_id[graph_id]
+            data = self.entries.get(mapped[1])
+            if data is None or data.graph is not None:
+                continue
+            alias = next((kept() for kept, key in self.by_id.values() if key == mapped[1] and kept() is not None),
+                         None)
+            if alias is not None:
+                data.reference = _reference(alias)
+            else:
+                self._evict(mapped[1])
+
+    def grown(self, data: GraphData, size: int):
+        self.nbytes += size
+        self._shrink(data)
+
+    def _shrink(self, keep: GraphData):
+        while self.nbytes > self.max_bytes or len(self.entries) > self.max_graphs:
+            key, evicted = next(iter(self.entries.items()))
+            if evicted is keep:
+                break
+            self._evict(key)
+
+    def invalidate(self, graph):
+        """ Drops the cached data of a graph that was changed """
+        self.collect()
+        self.by_id.pop(id(graph), None)
+        for key, data in list(self.entries.items()):
+            if data.graph is graph:
+                self._evict(key)
+
+    def _evict(self, key):
+        evicted = self.entries.pop(key)
+        self.nbytes -= evicted.nbytes
+        evicted.cache = None
+        self.by_id = {graph_id: kept for graph_id, kept in self.by_id.items() if kept[1] != key}
+
+
+default_cache = GraphCache()
+
+
+def graph_data(graph) -> GraphData:
+    return default_cache.get(graph)
@@ -0,0 +1,37 @@
+import queue
+
+
+class SharedIncumbent:
+    """ Best clique size shared by solver processes, with every improving clique put on a queue.
+
+    Created from a multiprocessing context and passed to the processes as an argument. Solvers read `best` to
+    prune with cliques found elsewhere and offer their own improvements.
+    """
+
+    def __init__(self, context):
+        self.value = context.Value("i", 0)
+        self.cliques = context.Queue()
+
+    @property
+    def best(self) -> int:
+        return self.value.value
+
+    def offer(self, clique: list, source: str) -> bool:
+        """ Publishes a clique of 1-based vertex ids if it beats the shared one """
+        with self.value.get_lock():
+            if len(clique) <= self.value.value:
+                return False
+            self.value.value = len(clique)
+        self.cliques.put((source, sorted(clique)))
+        return True
+
+    def drain(self, timeout: float = 0.0) -> list:
+        """ (source, clique) pairs offered since the last call; waits up to timeout for the first one """
+        offers = []
+        try:
+            offers.append(self.cliques.get(timeout=timeout) if timeout else self.cliques.get_nowait())
+            while True:
+                offers.append(self.cliques.get_nowait())
+        except queue.Empty:
+            pass
+        return offers
@@ -0,0 +1,138 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+# Vertex sets are Python ints used as bitsets: bit i is set when the i-th vertex belongs to the set
+
+
+def adjacency_bitsets(graph, nodes: list) -> list:
+    position = {node: i for i, node in enumerate(nodes)}
+    adjacency = [0] * len(nodes)
+    for u, v in graph.edges():
+        i, j = position[u], position[v]
+        if i != j:
+            adjacency[i] |= 1 << j
+            adjacency[j] |= 1 << i
+    return adjacency
+
+
+def bits(mask: int) -> list:
+    result = []
+    while mask:
+        low = mask & -mask
+        result.append(low.bit_length() - 1)
+        mask ^= low
+    return result
+
+
+def popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+def smallest_last_peel(neighbours: list) -> tuple:
+    """ Removal order and core numbers of repeatedly removing a vertex of minimal remaining degree, with the bucket
+    queue of Matula and Beck: linear in the number of edges """
+    degrees = [len(row) for row in neighbours]
+    buckets = [[] for _ in range(max(degrees, default=0) + 1)]
+    # Filled backwards so that ties go to the lowest vertex first
+    for vertex in range(len(degrees) - 1, -1, -1):
+        buckets[degrees[vertex]].append(vertex)
+    removed = [False] * len(degrees)
+    cores = [0] * len(degrees)
+    order = []
+    degree = core = 0
+    while len(order) < len(degrees):
+        if not buckets[degree]:
+            degree += 1
+            continue
+        vertex = buckets[degree].pop()
+        # Entries left behind when a vertex moved to a lower bucket are skipped
+        if removed[vertex] or degrees[vertex] != degree:
+            continue
+        removed[vertex] = True
+        core = max(core, degree)
+        cores[vertex] = core
+        order.append(vertex)
+        for neighbour in neighbours[vertex]:
+            if not removed[neighbour]:
+                degrees[neighbour] -= 1
+                buckets[degrees[neighbour]].append(neighbour)
+        # A neighbour may now be one below the current minimum
+        degree = max(degree - 1, 0)
+    return order, cores
+
+
+def smallest_last_order(adjacency: list) -> list:
+    """ Degeneracy ordering: repeatedly removes a vertex of minimal remaining degree, returns the reverse """
+    return smallest_last_peel([bits(row) for row in adjacency])[0][::-1]
+
+
+def color_count(adjacency: list, mask: int) -> int:
+    """ Colours used by a greedy colouring of the vertices in mask, an upper bound on their clique number """
+    colors = 0
+    uncolored = mask
+    while uncolored:
+        colors += 1
+        candidates = uncolored
+        while candidates:
+            low = candidates & -candidates
+            uncolored ^= low
+            candidates &= ~low & ~adjacency[low.bit_length() - 1]
+    return colors
+
+
+def greedy_color_classes(adjacency: list, order: list) -> list:
+    """ Greedy colouring in the given order, each colour class grown into a maximal independent set """
+    classes, class_neighbours = [], []
+    for vertex in order:
+        bit = 1 << vertex
+        for color, neighbours in enumerate(class_neighbours):
+            if not neighbours & bit:
+                classes[color] |= bit
+                class_neighbours[color] |= adjacency[vertex]
+                break
+        else:
+            classes.append(bit)
+            class_neighbours.append(adjacency[vertex])
+
+    everything = (1 << len(adjacency)) - 1
+    for color, mask in enumerate(classes):
+        candidates = everything & ~mask & ~class_neighbours[color]
+        for vertex in order:
+            if candidates >> vertex & 1:
+                mask |= 1 << vertex
+                candidates &= ~adjacency[vertex]
+        classes[color] = mask
+    return classes
+
+
+def _cover_from_orders(adjacency: list, orders: list, min_size: int) -> set:
+    independent_sets = set()
+    for order in orders:
+        for mask in greedy_color_classes(adjacency, order):
+            if popcount(mask) >= min_size:
+                independent_sets.add(mask)
+    return independent_sets
+
+
+def independent_set_cover(adjacency: list, n_random: int = 40, seed: int = 0, min_size: int = 3,
+                          n_jobs: int = 1, smallest_last: list = None) -> set:
+    """ Distinct maximal independent sets from colourings in largest-first, smallest-last and random orders """
+    n = len(adjacency)
+    degrees = [popcount(row) for row in adjacency]
+    if smallest_last is None:
+        smallest_last = smallest_last_order(adjacency)
+    orders = [sorted(range(n), key=lambda vertex: -degrees[vertex]), smallest_last]
+    rng = random.Random(seed)
+    for _ in range(n_random):
+        order = list(range(n))
+        rng.shuffle(order)
+        orders.append(order)
+
+    if n_jobs <= 1:
+        return _cover_from_orders(adjacency, orders, min_size)
+    chunks = [orders[i::n_jobs] for i in range(n_jobs)]
+    independent_sets = set()
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        for chunk_sets in executor.map(_cover_from_orders, [adjacency] * n_jobs, chunks, [min_size] * n_jobs):
+            independent_sets |= chunk_sets
+    return independent_sets
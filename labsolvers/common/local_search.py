@@ -0,0 +1,59 @@
+import numpy as np
+from labsolvers.common.graph_cache import graph_data
+
+
+def improve_clique(neighbour_sets, clique: list, max_steps: int = 1000, tabu_tenure: int = 7, seed: int = 0) -> list:
+    """ Plateau search from a clique of 0-based vertices: adds a vertex adjacent to the whole clique when there is
+    one, otherwise swaps a clique vertex for an outside vertex adjacent to all the others. Swapped out vertices may
+    not come back for tabu_tenure steps. Returns the largest clique seen """
+    neighbours = graph_data(neighbour_sets).neighbours
+    n = len(neighbours)
+    rng = np.random.default_rng(seed)
+    in_clique = np.zeros(n, dtype=bool)
+    # Number of clique vertices each vertex is not adjacent to
+    missing = np.zeros(n, dtype=np.int64)
+    tabu_until = np.zeros(n, dtype=np.int64)
+
+    def add(vertex):
+        in_clique[vertex] = True
+        missing[:] += 1
+        missing[neighbours[vertex]] -= 1
+
+    def remove(vertex):
+        in_clique[vertex] = False
+        missing[:] -= 1
+        missing[neighbours[vertex]] += 1
+
+    for vertex in clique:
+        add(vertex)
+    best = sorted(clique)
+    for step in range(max_steps):
+        free = np.flatnonzero(~in_clique & (missing == 0))
+        if len(free):
+            add(int(rng.choice(free)))
+            if in_clique.sum() > len(best):
+                best = np.flatnonzero(in_clique).tolist()
+            continue
+        swaps = np.flatnonzero(~in_clique & (missing == 1) & (tabu_until <= step))
+        if not len(swaps):
+            break
+        vertex = int(rng.choice(swaps))
+        members = np.flatnonzero(in_clique)
+        # The one clique vertex the newcomer is not adjacent to
+        leaving = int(members[~np.isin(members, neighbours[vertex])][0])
+        remove(leaving)
+        tabu_until[leaving] = step + tabu_tenure
+        add(vertex)
+    return best
+
+
+def round_to_clique(graph, values: list) -> list:
+    """ Greedy clique of positions in decreasing LP value: a vertex is taken when adjacent to all taken ones """
+    adjacency = graph_data(graph).adjacency
+    candidates = (1 << len(adjacency)) - 1
+    clique = []
+    for vertex in np.argsort(-np.asarray(values), kind="stable").tolist():
+        if candidates >> vertex & 1:
+            clique.append(vertex)
+            candidates &= adjacency[vertex]
+    return clique
@@ -0,0 +1,236 @@
+import numpy as np
+
+# Rows are (variable indices, coefficients) pairs, senses are 'L', 'E' or 'G' like in CPLEX
+
+
+class LPSolveError(Exception):
+    pass
+
+
+class LPBackend:
+    """ Maximization LP with named rows, the operations branch-and-bound and branch-and-cut need """
+
+    def add_variables(self, obj: list, lower_bounds: list, upper_bounds: list):
+        raise NotImplementedError
+
+    def add_rows(self, rows: list, senses: list, rhs: list, names: list):
+        raise NotImplementedError
+
+    def delete_rows(self, names: list):
+        raise NotImplementedError
+
+    def set_bounds(self, indices: list, lower_bounds: list, upper_bounds: list):
+        raise NotImplementedError
+
+    def solve(self) -> bool:
+        """ Returns True if an optimal solution was found, raises LPSolveError if the engine failed """
+        raise NotImplementedError
+
+    def get_objective_value(self) -> float:
+        raise NotImplementedError
+
+    def get_values(self) -> list:
+        raise NotImplementedError
+
+    def get_slacks(self) -> list:
+        raise NotImplementedError
+
+    def get_duals(self) -> list:
+        raise NotImplementedError
+
+    def get_reduced_costs(self) -> list:
+        raise NotImplementedError
+
+    def get_row_names(self) -> list:
+        raise NotImplementedError
+
+    def get_rows(self) -> list:
+        """ Variable indices of every row """
+        raise NotImplementedError
+
+    def set_parameters(self, params: dict):
+        """ Engine parameters by engine-specific name, see common/solver_params.py """
+        raise NotImplementedError
+
+    @property
+    def num_vars(self) -> int:
+        raise NotImplementedError
+
+    @property
+    def num_rows(self) -> int:
+        raise NotImplementedError
+
+
+class CplexBackend(LPBackend):
+    def __init__(self):
+        import cplex
+        self._cplex = cplex
+        self.model = cplex.Cplex()
+        self.model.set_log_stream(None)
+        self.model.set_results_stream(None)
+        self.model.set_warning_stream(None)
+        self.model.set_error_stream(None)
+        self.model.objective.set_sense(self.model.objective.sense.maximize)
+
+    def add_variables(self, obj: list, lower_bounds: list, upper_bounds: list):
+        names = [f'x{i + 1}' for i in range(self.num_vars, self.num_vars + len(obj))]
+        self.model.variables.add(obj=obj, lb=lower_bounds, ub=upper_bounds, names=names)
+
+    def add_rows(self, rows: list, senses: list, rhs: list, names: list):
+        lin_expr = [self._cplex.SparsePair(ind=list(indices), val=list(values)) for indices, values in rows]
+        self.model.linear_constraints.add(lin_expr=lin_expr, senses=senses, rhs=rhs, names=names)
+
+    def delete_rows(self, names: list):
+        if names:
+            self.model.linear_constraints.delete(names)
+
+    def set_bounds(self, indices: list, lower_bounds: list, upper_bounds: list):
+        self.model.variables.set_lower_bounds(list(zip(indices, lower_bounds)))
+        self.model.variables.set_upper_bounds(list(zip(indices, upper_bounds)))
+
+    def solve(self) -> bool:
+        try:
+            self.model.solve()
+        except self._cplex.exceptions.CplexSolverError as error:
+            raise LPSolveError(str(error)) from error
+        return self.model.solution.get_status() == self.model.solution.status.optimal
+
+    def get_objective_value(self) -> float:
+        return self.model.solution.get_objective_value()
+
+    def get_values(self) -> list:
+        return self.model.solution.get_values()
+
+    def get_slacks(self) -> list:
+        return self.model.solution.get_linear_slacks()
+
+    def get_duals(self) -> list:
+        return self.model.solution.get_dual_values()
+
+    def get_reduced_costs(self) -> list:
+        return self.model.solution.get_reduced_costs()
+
+    def get_row_names(self) -> list:
+        return self.model.linear_constraints.get_names()
+
+    def get_rows(self) -> list:
+        return [row.ind for row in self.model.linear_constraints.get_rows()]
+
+    def set_parameters(self, params: dict):
+        # Names are dotted paths under Cplex.parameters, e.g. "preprocessing.presolve"
+        for name, value in params.items():
+            parameter = self.model.parameters
+            for part in name.split("."):
+                parameter = getattr(parameter, part)
+            parameter.set(value)
+
+    @property
+    def num_vars(self) -> int:
+        return self.model.variables.get_num()
+
+    @property
+    def num_rows(self) -> int:
+        return self.model.linear_constraints.get_num()
+
+
+class HighsBackend(LPBackend):
+    """ Open-source engine; HiGHS keeps its basis between solves, so every re-solve is warm started """
+
+    def __init__(self):
+        import highspy
+        self._highspy = highspy
+        self.model = highspy.Highs()
+        self.model.setOptionValue("output_flag", False)
+        self._row_names, self._rows, self._senses, self._rhs = [], [], [], []
+
+    def add_variables(self, obj: list, lower_bounds: list, upper_bounds: list):
+        n = len(obj)
+        self.model.addCols(n, np.array(obj, dtype=np.float64), np.array(lower_bounds, dtype=np.float64),
+                           np.array(upper_bounds, dtype=np.float64), 0, np.zeros(n, dtype=np.int32),
+                           np.array([], dtype=np.int32), np.array([], dtype=np.float64))
+        self.model.changeObjectiveSense(self._highspy.ObjSense.kMaximize)
+
+    def add_rows(self, rows: list, senses: list, rhs: list, names: list):
+        infinity = self._highspy.kHighsInf
+        lower = np.array([-infinity if sense == 'L' else value for sense, value in zip(senses, rhs)])
+        upper = np.array([infinity if sense == 'G' else value for sense, value in zip(senses, rhs)])
+        starts = np.zeros(len(rows), dtype=np.int32)
+        starts[1:] = np.cumsum([len(indices) for indices, _ in rows[:-1]])
+        indices = np.array([i for row_indices, _ in rows for i in row_indices], dtype=np.int32)
+        values = np.array([v for _, row_values in rows for v in row_values], dtype=np.float64)
+        self.model.addRows(len(rows), lower, upper, len(indices), starts, indices, values)
+        self._row_names.extend(names)
+        self._rows.extend(list(row_indices) for row_indices, _ in rows)
+        self._senses.extend(senses)
+        self._rhs.extend(rhs)
+
+    def delete_rows(self, names: list):
+        names = set(names)
+        deleted = [i for i, name in enumerate(self._row_names) if name in names]
+        if not deleted:
+            return
+        self.model.deleteRows(len(deleted), np.array(deleted, dtype=np.int32))
+        kept = [i for i, name in enumerate(self._row_names) if name not in names]
+        self._row_names = [self._row_names[i] for i in kept]
+        self._rows = [self._rows[i] for i in kept]
+        self._senses = [self._senses[i] for i in kept]
+        self._rhs = [self._rhs[i] for i in kept]
+
+    def set_bounds(self, indices: list, lower_bounds: list, upper_bounds: list):
+        self.model.changeColsBounds(len(indices), np.array(indices, dtype=np.int32),
+                                    np.array(lower_bounds, dtype=np.float64),
+                                    np.array(upper_bounds, dtype=np.float64))
+
+    def solve(self) -> bool:
+        if self.model.run() == self._highspy.HighsStatus.kError:
+            raise LPSolveError("HiGHS failed to solve the LP")
+        return self.model.getModelStatus() == self._highspy.HighsModelStatus.kOptimal
+
+    def get_objective_value(self) -> float:
+        return self.model.getInfo().objective_function_value
+
+    def get_values(self) -> list:
+        return list(self.model.getSolution().col_value)
+
+    def get_slacks(self) -> list:
+        activities = self.model.getSolution().row_value
+        return [activity - rhs if sense == 'G' else rhs - activity
+                for activity, sense, rhs in zip(activities, self._senses, self._rhs)]
+
+    def get_duals(self) -> list:
+        return list(self.model.getSolution().row_dual)
+
+    def get_reduced_costs(self) -> list:
+        return list(self.model.getSolution().col_dual)
+
+    def get_row_names(self) -> list:
+        return list(self._row_names)
+
+    def get_rows(self) -> list:
+        return [list(row) for row in self._rows]
+
+    def set_parameters(self, params: dict):
+        for name, value in params.items():
+            if self.model.setOptionValue(name, value) == self._highspy.HighsStatus.kError:
+                raise ValueError(f"Invalid HiGHS option {name}={value!r}")
+
+    @property
+    def num_vars(self) -> int:
+        return self.model.getNumCol()
+
+    @property
+    def num_rows(self) -> int:
+        return self.model.getNumRow()
+
+
+BACKENDS = {
+    "cplex": CplexBackend,
+    "highs": HighsBackend,
+}
+
+
+def create_backend(name: str, params: dict = None) -> LPBackend:
+    backend = BACKENDS[name]()
+    if params:
+        backend.set_parameters(params)
+    return backend
@@ -0,0 +1,65 @@
+import hashlib
+import json
+import os
+import numpy as np
+
+CACHE_FORMAT_VERSION = 1
+
+
+def graph_key(graph, settings: dict) -> str:
+    """ Content hash of the graph (vertex count and sorted edge list) and of the model generation settings """
+    digest = hashlib.sha256()
+    digest.update(json.dumps({"version": CACHE_FORMAT_VERSION, **settings}, sort_keys=True).encode())
+    digest.update(np.array([graph.number_of_nodes()], dtype=np.int64).tobytes())
+    edges = np.array(sorted((min(u, v), max(u, v)) for u, v in graph.edges()), dtype=np.int64)
+    digest.update(edges.tobytes())
+    return digest.hexdigest()[:32]
+
+
+def save_rows(file_path: str, rows: list):
+    """ Stores rows (lists of vertex ids) as CSR index arrays """
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(row) for row in rows])
+    indices = np.fromiter((vertex for row in rows for vertex in row), dtype=np.int32, count=int(indptr[-1]))
+    tmp_path = file_path + ".tmp.npz"
+    np.savez_compressed(tmp_path, indptr=indptr, indices=indices)
+    os.replace(tmp_path, file_path)
+
+
+def load_rows(file_path: str) -> list:
+    with np.load(file_path) as data:
+        indptr, indices = data["indptr"], data["indices"].tolist()
+    return [indices[indptr[i]:indptr[i + 1]] for i in range(len(indptr) - 1)]
+
+
+class ModelCache:
+    """ Root LP rows and learned cuts per graph, stored as <key>.rows.npz and <key>.cuts.npz in cache_dir """
+
+    def __init__(self, cache_dir: str, max_cuts: int = 5000):
+        self.cache_dir = cache_dir
+        self.max_cuts = max_cuts
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str, kind: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.{kind}.npz")
+
+    def load_constraints(self, key: str):
+        path = self._path(key, "rows")
+        return load_rows(path) if os.path.exists(path) else None
+
+    def save_constraints(self, key: str, rows: list):
+        save_rows(self._path(key, "rows"), rows)
+
+    def load_cuts(self, key: str) -> list:
+        path = self._path(key, "cuts")
+        return load_rows(path) if os.path.exists(path) else []
+
+    def save_cuts(self, key: str, cuts: list):
+        """ Merges the cuts into the stored pool, newest first, dropping duplicates and the oldest above max_cuts """
+        pool, seen = [], set()
+        for cut in list(cuts) + self.load_cuts(key):
+            cut_key = tuple(sorted(cut))
+            if cut_key not in seen:
+                seen.add(cut_key)
+                pool.append(sorted(cut))
+        save_rows(self._path(key, "cuts"), pool[:self.max_cuts])
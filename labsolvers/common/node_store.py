@@ -0,0 +1,237 @@
+import heapq
+import os
+import resource
+import shutil
+import tempfile
+import numpy as np
+
+# Open nodes of a best-first search, each a record of the parent LP bound, a priority (the bound unless given) and
+# two bitmasks over the variables: which ones are fixed and the values they are fixed to. A node with n variables
+# takes 16 + 2 * ceil(n / 8) bytes, about 116 bytes for brock400, instead of a Python list of (index, value) tuples.
+#
+# Nodes live in the slots of one NumPy record array, ordered by a heap of (-priority, push number, slot) tuples, so
+# the node of highest priority is taken in O(log n). A second, lazily cleaned heap keeps the largest parent bound.
+# Above memory_limit_mb of resident memory (or max_in_memory nodes) the lower priority half is written, sorted by
+# priority, to a memory-mapped segment file in spill_dir. A segment is read back a chunk at a time once its first
+# node beats the nodes in memory, and deleted when it is used up.
+
+
+def current_rss_mb() -> float:
+    """ Resident memory of this process; the peak instead where /proc is not available """
+    try:
+        with open("/proc/self/statm", "r") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2 ** 10
+
+
+class _Segment:
+    """ Spilled nodes in decreasing priority order, consumed a chunk of chunk_size nodes at a time """
+
+    def __init__(self, path: str, records: np.ndarray, chunk_size: int):
+        self.path = path
+        self.records = np.memmap(path, dtype=records.dtype, mode="w+", shape=records.shape)
+        self.records[:] = records
+        self.records.flush()
+        self.cursor = 0
+        self.chunk_size = chunk_size
+        # Largest bound from each chunk to the end, so max_bound drops as chunks are used up
+        chunk_bounds = np.maximum.reduceat(records["bound"], np.arange(0, len(records), chunk_size))
+        self.chunk_bounds = np.maximum.accumulate(chunk_bounds[::-1])[::-1]
+
+    def __len__(self) -> int:
+        return len(self.records) - self.cursor
+
+    @property
+    def best_priority(self) -> float:
+        return float(self.records["priority"][self.cursor])
+
+    @property
+    def max_bound(self) -> float:
+        """ Upper bound of the nodes left """
+        return float(self.chunk_bounds[self.cursor // self.chunk_size])
+
+    def take(self) -> np.ndarray:
+        chunk = np.array(self.records[self.cursor:self.cursor + self.chunk_size])
+        self.cursor += len(chunk)
+        return chunk
+
+    def remove(self):
+        self.records = None
+        os.remove(self.path)
+
+
+class NodeStore:
+    def __init__(self, num_vars: int, memory_limit_mb: float = None, spill_dir: str = None, max_in_memory: int = None,
+                 check_interval: int = 1000, min_spill: int = 1000, reload_size: int = 4096):
+        self.num_vars = num_vars
+        n_bytes = (num_vars + 7) // 8
+        self.dtype = np.dtype([("bound", "f8"), ("priority", "f8"), ("fixed", "u1", (n_bytes,)),
+                               ("values", "u1", (n_bytes,))])
+        self.records = np.zeros(1024, dtype=self.dtype)
+        # Push number of the node in each slot, -1 for a free slot
+        self.slot_seqs = np.full(1024, -1, dtype=np.int64)
+        self.free_slots = []
+        self.used_slots = 0
+        # (-priority, seq, slot) and (-bound, seq, slot) of the nodes in memory; a bound heap entry is stale once
+        # its slot holds another node or none
+        self.heap = []
+        self.bound_heap = []
+        self._seq = 0
+        self.memory_limit_mb = memory_limit_mb
+        self.max_in_memory = max_in_memory
+        self.check_interval = check_interval
+        self.min_spill = min_spill
+        self.reload_size = reload_size
+        self.spill_dir = spill_dir
+        self._own_spill_dir = False
+        self.segments = []
+        self.pushes = 0
+        self.spilled = 0
+        self.reloaded = 0
+        self.peak_open = 0
+
+    @property
+    def count(self) -> int:
+        """ Nodes in memory """
+        return len(self.heap)
+
+    def __len__(self) -> int:
+        return self.count + sum(len(segment) for segment in self.segments)
+
+    def encode(self, fixings: list) -> tuple:
+        fixed = np.zeros(self.num_vars, dtype=bool)
+        values = np.zeros(self.num_vars, dtype=bool)
+        for var_index, value in fixings:
+            fixed[var_index] = True
+            values[var_index] = value > 0.5
+        return np.packbits(fixed), np.packbits(values)
+
+    def decode(self, record) -> list:
+        """ (var_index, value) fixings of a record, by variable index """
+        indices = np.flatnonzero(np.unpackbits(record["fixed"], count=self.num_vars))
+        values = np.unpackbits(record["values"], count=self.num_vars)[indices]
+        return [(int(var_index), int(value)) for var_index, value in zip(indices, values)]
+
+    def push(self, fixings: list, bound: float, priority: float = None):
+        slot = self._store(bound, bound if priority is None else priority)
+        record = self.records[slot]
+        record["fixed"], record["values"] = self.encode(fixings)
+        self.pushes += 1
+        self.peak_open = max(self.peak_open, len(self))
+        if self.max_in_memory is not None and self.count > self.max_in_memory:
+            self.spill()
+        elif self.memory_limit_mb is not None and self.pushes % self.check_interval == 0 \
+                and self.count >= self.min_spill and current_rss_mb() > self.memory_limit_mb:
+            self.spill()
+
+    def _store(self, bound: float, priority: float) -> int:
+        """ Slot for a new node with its bound and priority set and entered in the heaps """
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            if self.used_slots == len(self.records):
+                self._resize(2 * len(self.records))
+            slot = self.used_slots
+            self.used_slots += 1
+        self.records[slot]["bound"] = bound
+        self.records[slot]["priority"] = priority
+        self.slot_seqs[slot] = self._seq
+        heapq.heappush(self.heap, (-float(priority), self._seq, slot))
+        heapq.heappush(self.bound_heap, (-float(bound), self._seq, slot))
+        self._seq += 1
+        if len(self.bound_heap) > 2 * len(self.heap) + 1024:
+            self._rebuild_bound_heap()
+        return slot
+
+    def _resize(self, size: int):
+        self.records = np.resize(self.records, size)
+        slot_seqs = np.full(size, -1, dtype=np.int64)
+        slot_seqs[:self.used_slots] = self.slot_seqs[:self.used_slots]
+        self.slot_seqs = slot_seqs
+
+    def _rebuild_bound_heap(self):
+        self.bound_heap = [(-float(self.records["bound"][slot]), seq, slot) for _, seq, slot in self.heap]
+        heapq.heapify(self.bound_heap)
+
+    def best_bound(self) -> float:
+        """ Largest parent bound of the open nodes, None if there are none """
+        bound_heap = self.bound_heap
+        while bound_heap and self.slot_seqs[bound_heap[0][2]] != bound_heap[0][1]:
+            heapq.heappop(bound_heap)
+        bounds = [segment.max_bound for segment in self.segments]
+        if bound_heap:
+            bounds.append(-bound_heap[0][0])
+        return max(bounds, default=None)
+
+    def pop(self) -> tuple:
+        """ (bound, fixings) of the open node with the highest priority """
+        if self.segments:
+            segment = max(self.segments, key=lambda s: s.best_priority)
+            if not self.heap or segment.best_priority > -self.heap[0][0]:
+                self._reload(segment)
+        _, __, slot = heapq.heappop(self.heap)
+        record = self.records[slot].copy()
+        self.slot_seqs[slot] = -1
+        self.free_slots.append(slot)
+        return float(record["bound"]), self.decode(record)
+
+    def _live_slots(self) -> np.ndarray:
+        return np.flatnonzero(self.slot_seqs[:self.used_slots] >= 0)
+
+    def spill(self):
+        """ Moves the lower priority half of the nodes in memory to a new segment file """
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix="open_nodes_")
+            self._own_spill_dir = True
+        live = self._live_slots()
+        order = live[np.argsort(-self.records["priority"][live], kind="stable")]
+        keep = len(order) // 2
+        path = os.path.join(self.spill_dir, f"nodes_{self.spilled}_{len(self.segments)}.npy")
+        self.segments.append(_Segment(path, self.records[order[keep:]], self.reload_size))
+        self.spilled += len(order) - keep
+        kept, kept_seqs = self.records[order[:keep]], self.slot_seqs[order[:keep]]
+        # New, smaller arrays, so the memory of the spilled nodes is given back
+        size = max(2 * keep, 1024)
+        self.records = np.zeros(size, dtype=self.dtype)
+        self.records[:keep] = kept
+        self.slot_seqs = np.full(size, -1, dtype=np.int64)
+        self.slot_seqs[:keep] = kept_seqs
+        self.used_slots = keep
+        self.free_slots = []
+        self.heap = [(-priority, seq, slot) for slot, (priority, seq)
+                     in enumerate(zip(kept["priority"].tolist(), kept_seqs.tolist()))]
+        heapq.heapify(self.heap)
+        self._rebuild_bound_heap()
+
+    def _reload(self, segment: _Segment):
+        chunk = segment.take()
+        for record in chunk:
+            slot = self._store(float(record["bound"]), float(record["priority"]))
+            self.records[slot] = record
+        self.reloaded += len(chunk)
+        if not len(segment):
+            segment.remove()
+            self.segments.remove(segment)
+
+    def all_fixings(self) -> list:
+        """ Fixings of every open node, highest priority first, e.g. for a checkpoint """
+        records = np.concatenate([self.records[self._live_slots()]] +
+                                 [np.array(segment.records[segment.cursor:]) for segment in self.segments])
+        return [self.decode(record) for record in records[np.argsort(-records["priority"], kind="stable")]]
+
+    def close(self):
+        """ Deletes the segment files """
+        for segment in self.segments:
+            segment.remove()
+        self.segments = []
+        if self._own_spill_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+        self.heap = []
+        self.bound_heap = []
+        self.free_slots = []
+        self.slot_seqs[:] = -1
+        self.used_slots = 0
+
+    def stats(self) -> dict:
+        return {"pushed": self.pushes, "spilled": self.spilled, "reloaded": self.reloaded, "peak_open": self.peak_open}
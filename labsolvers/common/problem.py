@@ -0,0 +1,92 @@
+import networkx as nx
+from labsolvers.common.graph_cache import graph_data
+from labsolvers.common.independent_sets import bits
+from labsolvers.common.lp_backend import LPBackend, create_backend
+from labsolvers.common.model_cache import ModelCache, graph_key
+
+
+class ProblemHandler:
+    def __init__(self, graph: nx.Graph, is_integer: bool = False, n_colorings: int = 40, seed: int = 0,
+                 n_jobs: int = 1, cache_dir: str = None, use_cut_pool: bool = False, backend: str = "cplex",
+                 solver_params: dict = None):
+        self.model: LPBackend = None
+        self.graph: nx.Graph = graph
+        self.is_integer = is_integer
+        self.n_colorings = n_colorings
+        self.seed = seed
+        self.n_jobs = n_jobs
+        self.cache = ModelCache(cache_dir) if cache_dir is not None else None
+        # Learned cuts are carried over between runs through cache_dir only on request: a run that starts from the
+        # cuts of earlier runs is not comparable to a first run or to other engines
+        self.use_cut_pool = use_cut_pool
+        self.backend = backend
+        self.solver_params = solver_params
+        self.nodes = sorted(graph.nodes())
+        self.var_index = {node: i for i, node in enumerate(self.nodes)}
+        self._cache_key = None
+        return
+
+    @property
+    def cache_key(self) -> str:
+        if self._cache_key is None:
+            settings = {"n_colorings": self.n_colorings, "seed": self.seed, "min_size": 3}
+            self._cache_key = graph_key(self.graph, settings)
+        return self._cache_key
+
+    def design_problem(self):
+        self.model = create_backend(self.backend, self.solver_params)
+        n_vars = self.graph.number_of_nodes()
+        self.model.add_variables(obj=[1.0] * n_vars, lower_bounds=[0.0] * n_vars, upper_bounds=[1.0] * n_vars)
+
+        constraints = self._load_or_create_constraints()
+        self.add_rows(constraints, [f'c{i + 1}' for i in range(len(constraints))])
+
+        if self.cache is not None and self.use_cut_pool:
+            cuts = self.cache.load_cuts(self.cache_key)
+            if cuts:
+                self.add_rows(cuts, [f'Pool_{i}' for i in range(len(cuts))])
+
+    def add_rows(self, vertex_sets: list, names: list):
+        """ Adds a sum(x_v for v in set) <= 1 row per vertex set """
+        rows = [([self.var_index[v] for v in vertex_set], [1.0] * len(vertex_set)) for vertex_set in vertex_sets]
+        self.model.add_rows(rows, senses=['L'] * len(rows), rhs=[1.0] * len(rows), names=names)
+
+    def _load_or_create_constraints(self) -> list:
+        if self.cache is None:
+            return self._create_constraints()
+        rows = self.cache.load_constraints(self.cache_key)
+        if rows is None:
+            rows = self._create_constraints()
+            self.cache.save_constraints(self.cache_key, rows)
+        return rows
+
+    def save_cut_pool(self, cut_pool: list):
+        """ Adds (name, vertices) cuts to the cached pool, so later runs start from a stronger LP """
+        if self.cache is not None and self.use_cut_pool:
+            self.cache.save_cuts(self.cache_key, [vertices for _, vertices in cut_pool])
+
+    def _create_constraints(self) -> list:
+        """ Vertex sets of the root rows: independent sets and the non-edges they do not cover """
+        nodes, complement, independent_sets = self._get_independent_set_masks(self.graph)
+
+        # Remove not connected edges which are included in ind set to avoid redundant constraints:
+        # covered[i] holds every vertex sharing an independent set with vertex i
+        covered = [0] * len(nodes)
+        for mask in independent_sets:
+            for i in bits(mask):
+                covered[i] |= mask
+        constraints = [[nodes[i] for i in bits(mask)] for mask in sorted(independent_sets)]
+        for i in range(len(nodes)):
+            for j in bits(complement[i] & ~covered[i] & ~((2 << i) - 1)):
+                constraints.append([nodes[i], nodes[j]])
+        return constraints
+
+    def _get_independent_sets(self, graph: nx.Graph) -> list:
+        nodes, _, independent_sets = self._get_independent_set_masks(graph)
+        return [{nodes[i] for i in bits(mask)} for mask in independent_sets]
+
+    def _get_independent_set_masks(self, graph: nx.Graph) -> tuple:
+        """ Sorted node list, complement rows and maximal independent sets of 3+ vertices as bitsets over it """
+        data = graph_data(graph)
+        independent_sets = data.color_classes(n_random=self.n_colorings, seed=self.seed, n_jobs=self.n_jobs)
+        return data.nodes, data.complement, independent_sets
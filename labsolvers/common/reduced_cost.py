@@ -0,0 +1,17 @@
+def reduced_cost_fixings(obj_value: float, values: list, reduced_costs: list, best_obj_value: float,
+                         constrained: list, abs_tol: float = 1e-4) -> list:
+    """ Variables whose flip away from their LP bound value cannot beat the incumbent, as (index, value) pairs.
+
+    Moving x_j off its bound costs at least |rc_j| of the LP objective, so if obj - |rc_j| < best + 1
+    no better clique exists in the subtree with x_j flipped and x_j can be fixed to its current value.
+    """
+    fixings = []
+    for index, (value, reduced_cost) in enumerate(zip(values, reduced_costs)):
+        if constrained[index] or abs(reduced_cost) <= abs_tol:
+            continue
+        if int(obj_value - abs(reduced_cost) + abs_tol) <= best_obj_value:
+            if value <= abs_tol:
+                fixings.append((index, 0.0))
+            elif value >= 1 - abs_tol:
+                fixings.append((index, 1.0))
+    return fixings
@@ -0,0 +1,116 @@
+import csv
+import json
+import os
+
+
+def _to_json(value):
+    """ NumPy scalars in solver results are written as plain numbers """
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class ResultsSink:
+    """ Appends one row per finished run to a .csv or .jsonl file, flushed and fsynced right away.
+
+    CSV columns are `columns` (or the keys of the first row) plus any key a later row brings, inserted before the
+    "error" column: the file is then rewritten with the wider header, so no field of any row is dropped.
+    """
+
+    def __init__(self, file_path: str, columns: list = None):
+        self.file_path = file_path
+        self.is_csv = file_path.endswith(".csv")
+        self.columns = list(columns) if columns is not None else None
+        exists = os.path.exists(file_path) and os.path.getsize(file_path) > 0
+        if self.is_csv and exists:
+            with open(file_path, "r", newline="") as file:
+                self.columns = next(csv.reader(file))
+        self._header_written = exists
+        self._file = open(file_path, "a", newline="")
+        self._writer = None
+
+    def write(self, row: dict):
+        if self.is_csv:
+            if self.columns is None:
+                self.columns = list(row)
+            new_columns = [key for key in row if key not in self.columns]
+            if new_columns:
+                self._widen(new_columns)
+            if self._writer is None:
+                self._writer = csv.DictWriter(self._file, fieldnames=self.columns)
+                if not self._header_written:
+                    self._writer.writeheader()
+                    self._header_written = True
+            self._writer.writerow({key: json.dumps(value, default=_to_json) if isinstance(value, (list, dict))
+                                   else _to_json(value) if hasattr(value, "item") else value
+                                   for key, value in row.items()})
+        else:
+            self._file.write(json.dumps(row, default=_to_json) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _widen(self, new_columns: list):
+        position = self.columns.index("error") if "error" in self.columns else len(self.columns)
+        self.columns[position:position] = new_columns
+        self._writer = None
+        if not self._header_written:
+            return
+        self._file.close()
+        rewrite_results(self.file_path, read_results(self.file_path), self.columns)
+        self._file = open(self.file_path, "a", newline="")
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def iter_results(file_path: str):
+    """ Yields the rows of a results file one at a time """
+    if not os.path.exists(file_path):
+        return
+    with open(file_path, "r", newline="") as file:
+        if file_path.endswith(".csv"):
+            yield from csv.DictReader(file)
+        else:
+            yield from (json.loads(line) for line in file if line.strip())
+
+
+def read_results(file_path: str) -> list:
+    return list(iter_results(file_path))
+
+
+def rewrite_results(file_path: str, rows: list, columns: list = None):
+    """ Replaces a results file with the given rows through a temporary file, so a crash leaves the old or the new
+    file. CSV columns default to the current header """
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, "w", newline="") as file:
+        if file_path.endswith(".csv"):
+            if columns is None:
+                with open(file_path, "r", newline="") as current:
+                    columns = next(csv.reader(current), [])
+            writer = csv.DictWriter(file, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            for row in rows:
+                file.write(json.dumps(row, default=_to_json) + "\n")
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, file_path)
+
+
+def export_excel(results_path: str, excel_path: str, sheet_name: str = "Results"):
+    """ Post-processing step: converts a results file into an Excel report """
+    # pandas (and openpyxl) are slow to import, so they are only loaded when a report is requested
+    from pandas import DataFrame
+
+    rows = read_results(results_path)
+    if not results_path.endswith(".csv"):
+        rows = [{key: json.dumps(value) if isinstance(value, (list, dict)) else value
+                 for key, value in row.items()} for row in rows]
+    DataFrame(rows).to_excel(excel_path, sheet_name=sheet_name, index=False)
@@ -0,0 +1,87 @@
+import json
+import os
+import re
+
+# LP engine parameter profiles, kept in a JSON file like
+#
+#     {"profiles": {"dual_nopresolve": {"cplex": {"lpmethod": 2, "preprocessing.presolve": 0},
+#                                       "highs": {"simplex_strategy": 1, "presolve": "off"}}},
+#      "families": {"brock": "dual_nopresolve", "MANN": "default"},
+#      "default": "dual_nopresolve"}
+#
+# CPLEX names are dotted paths under Cplex.parameters, HiGHS names are option names. "families" maps an instance
+# family (see graph_family) to its profile, as written by tune.py; other instances use "default".
+
+# Candidates tried by tune.py when the profile file does not define its own
+DEFAULT_PROFILES = {
+    "default": {"cplex": {}, "highs": {}},
+    "dual": {
+        "cplex": {"lpmethod": 2, "threads": 1},
+        "highs": {"solver": "simplex", "simplex_strategy": 1, "threads": 1},
+    },
+    "dual_nopresolve": {
+        "cplex": {"lpmethod": 2, "threads": 1, "preprocessing.presolve": 0},
+        "highs": {"solver": "simplex", "simplex_strategy": 1, "threads": 1, "presolve": "off"},
+    },
+    "primal_nopresolve": {
+        "cplex": {"lpmethod": 1, "threads": 1, "preprocessing.presolve": 0},
+        "highs": {"solver": "simplex", "simplex_strategy": 4, "threads": 1, "presolve": "off"},
+    },
+    "dual_loose": {
+        "cplex": {"lpmethod": 2, "threads": 1, "preprocessing.presolve": 0,
+                  "simplex.tolerances.optimality": 1e-5, "simplex.tolerances.feasibility": 1e-5},
+        "highs": {"solver": "simplex", "simplex_strategy": 1, "threads": 1, "presolve": "off",
+                  "dual_feasibility_tolerance": 1e-5, "primal_feasibility_tolerance": 1e-5},
+    },
+}
+
+
+def graph_family(file_path: str) -> str:
+    """ Family of a DIMACS instance by its file name: brock200_1.clq -> brock, p_hat300-1.clq -> p_hat """
+    name = os.path.basename(file_path)
+    match = re.match(r"p_hat|[A-Za-z]+", name)
+    return match.group(0) if match else name
+
+
+def load_profiles(file_path: str) -> dict:
+    """ Raises ValueError naming the file if it is not JSON laid out as above """
+    with open(file_path, "r") as file:
+        try:
+            config = json.load(file)
+        except ValueError as error:
+            raise ValueError(f"{file_path}: not a JSON profile file: {error}") from error
+    if not isinstance(config, dict):
+        raise ValueError(f"{file_path}: expected a JSON object with \"profiles\" and \"families\"")
+    config.setdefault("profiles", dict())
+    config.setdefault("families", dict())
+    for key in ("profiles", "families"):
+        if not isinstance(config[key], dict):
+            raise ValueError(f"{file_path}: \"{key}\" must be an object")
+    for name, profile in config["profiles"].items():
+        if not isinstance(profile, dict) or not all(isinstance(params, dict) for params in profile.values()):
+            raise ValueError(f"{file_path}: profile {name!r} must map backend names to parameter objects")
+    for family, profile in list(config["families"].items()) + [("default", config.get("default"))]:
+        if profile is not None and not isinstance(profile, str):
+            raise ValueError(f"{file_path}: profile of {family!r} must be a profile name")
+    return config
+
+
+def save_profiles(file_path: str, config: dict):
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(config, file, indent=1, sort_keys=True)
+    os.replace(tmp_path, file_path)
+
+
+def profile_params(config: dict, profile: str, backend: str) -> dict:
+    """ Parameters of a named profile for one backend; built-in profiles are used unless the file redefines them """
+    profiles = {**DEFAULT_PROFILES, **config.get("profiles", dict())}
+    if profile not in profiles:
+        raise KeyError(f"Unknown solver profile {profile!r}")
+    return dict(profiles[profile].get(backend, dict()))
+
+
+def instance_params(config: dict, file_path: str, backend: str) -> dict:
+    """ Parameters for an instance: its family's profile, else the default profile, else none """
+    profile = config.get("families", dict()).get(graph_family(file_path), config.get("default"))
+    return profile_params(config, profile, backend) if profile is not None else dict()
@@ -0,0 +1,115 @@
+import json
+import time
+from collections import defaultdict
+
+
+class SolverStats:
+    """ Cumulative timings and counters of a branch-and-bound run, optionally streamed to a JSONL trace.
+
+    Every recorded event is also passed to the observers (see common/events.py); one returning True, or with a
+    true `stopped` attribute, makes stop_requested true, which the solvers check at each node.
+    """
+
+    def __init__(self, trace_path: str = None, sample_interval: float = 5.0, observers: list = None,
+                 progress_interval: int = 1000):
+        self.start_time = time.perf_counter()
+        self.phase_times = defaultdict(float)
+        self.phase_counts = defaultdict(int)
+        self.depth_histogram = defaultdict(int)
+        self.bound_history = []
+        self.nodes = 0
+        self.best_obj_value = None
+        self.root_bound = None
+        self.bound = None
+        self.sample_interval = sample_interval
+        self.progress_interval = progress_interval
+        self.observers = list(observers or [])
+        self._stop = False
+        self._last_sample = self.start_time
+        self._trace_file = open(trace_path, "a") if trace_path else None
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start_time
+
+    def add(self, phase: str, started: float, count: int = 1):
+        """ Adds the time passed since `started` (a time.perf_counter() value) to the phase """
+        self.phase_times[phase] += time.perf_counter() - started
+        self.phase_counts[phase] += count
+
+    def count(self, phase: str, count: int = 1):
+        self.phase_counts[phase] += count
+
+    def node(self, depth: int, obj_value: float = None):
+        self.nodes += 1
+        self.depth_histogram[depth] += 1
+        if depth == 0 and self.root_bound is None:
+            self.root_bound = obj_value
+        now = time.perf_counter()
+        if now - self._last_sample >= self.sample_interval:
+            self._last_sample = now
+            self._record("sample", depth=depth, node_bound=obj_value)
+        if self.nodes % self.progress_interval == 0:
+            self._record("progress", keep=False)
+
+    def incumbent(self, obj_value: float):
+        self.best_obj_value = obj_value
+        self._record("incumbent")
+
+    def root_cuts(self, first_bound: float, last_bound: float, rounds: int):
+        """ Records the outcome of the root cutting-plane phase """
+        self._record("root_cuts", keep=False, first_bound=first_bound, last_bound=last_bound, rounds=rounds)
+
+    def update_bound(self, bound: float):
+        """ Records the global upper bound whenever it improves """
+        if self.bound is None or bound < self.bound:
+            self.bound = bound
+            self._record("bound")
+
+    def _record(self, event: str, keep: bool = True, **fields):
+        """ keep=False leaves the event out of bound_history, it only goes to the trace and the observers """
+        entry = {"event": event, "time": round(self.elapsed(), 3), "nodes": self.nodes,
+                 "best_obj_value": self.best_obj_value, "bound": self.bound, **fields}
+        if keep:
+            self.bound_history.append(entry)
+        if self._trace_file is not None:
+            self._trace_file.write(json.dumps(entry) + "\n")
+            self._trace_file.flush()
+        for observer in self.observers:
+            if observer(entry):
+                self._stop = True
+
+    @property
+    def stop_requested(self) -> bool:
+        return self._stop or any(getattr(observer, "stopped", False) for observer in self.observers)
+
+    def summary(self) -> dict:
+        return {
+            "elapsed": round(self.elapsed(), 3),
+            "root_bound": self.root_bound,
+            "phase_times": {phase: round(value, 3) for phase, value in self.phase_times.items()},
+            "phase_counts": dict(self.phase_counts),
+            "depth_histogram": dict(sorted(self.depth_histogram.items())),
+            "bound_history": self.bound_history,
+        }
+
+    def restore(self, summary: dict, nodes: int):
+        """ Continues counting from the summary of a previous (checkpointed) run """
+        self.start_time -= summary["elapsed"]
+        self.root_bound = summary["root_bound"]
+        self.phase_times.update(summary["phase_times"])
+        self.phase_counts.update(summary["phase_counts"])
+        self.depth_histogram.update({int(depth): count for depth, count in summary["depth_histogram"].items()})
+        self.bound_history = summary["bound_history"] + self.bound_history
+        self.nodes = nodes
+
+    def close(self):
+        summary = self.summary()
+        del summary["bound_history"]
+        entry = {"event": "finish", "time": summary["elapsed"], "nodes": self.nodes,
+                 "best_obj_value": self.best_obj_value, "bound": self.bound, **summary}
+        if self._trace_file is not None:
+            self._trace_file.write(json.dumps(entry) + "\n")
+            self._trace_file.close()
+            self._trace_file = None
+        for observer in self.observers:
+            observer(entry)
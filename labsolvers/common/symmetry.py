@@ -0,0 +1,134 @@
+import numpy as np
+
+# Vertex symmetry by individualization-refinement: colour refinement splits the vertices by the colours of their
+# neighbours until the partition is stable, and automorphisms are found by individualizing vertices in two copies
+# of the partition until both are discrete. Orbits are built only from automorphisms that were checked on the
+# adjacency matrix, so a search that runs out of budget leaves orbits finer than the true ones, never wrong.
+
+
+def adjacency_matrix(graph, nodes: list) -> np.ndarray:
+    position = {node: i for i, node in enumerate(nodes)}
+    matrix = np.zeros((len(nodes), len(nodes)), dtype=bool)
+    for u, v in graph.edges():
+        if u != v:
+            matrix[position[u], position[v]] = matrix[position[v], position[u]] = True
+    return matrix
+
+
+def refine(adjacency: np.ndarray, colors: np.ndarray) -> np.ndarray:
+    """ Coarsest stable refinement of the colouring; colours are named canonically, so isomorphic inputs
+    give the same colour names """
+    weights = adjacency.astype(np.float64)
+    n_colors = -1
+    while True:
+        _, colors = np.unique(colors, return_inverse=True)
+        if colors.max(initial=-1) + 1 == n_colors:
+            return colors
+        n_colors = colors.max(initial=-1) + 1
+        one_hot = np.zeros((len(colors), n_colors))
+        one_hot[np.arange(len(colors)), colors] = 1.0
+        signatures = np.column_stack((colors, weights @ one_hot))
+        _, colors = np.unique(signatures, axis=0, return_inverse=True)
+        colors = colors.reshape(-1)
+
+
+def individualize(adjacency: np.ndarray, colors: np.ndarray, vertex: int) -> np.ndarray:
+    colors = colors.copy()
+    colors[vertex] = -1
+    return refine(adjacency, colors)
+
+
+def find_automorphism(adjacency: np.ndarray, left: np.ndarray, right: np.ndarray, budget: list):
+    """ Permutation mapping the colouring left onto right that preserves adjacency, or None.
+
+    budget is a one-element list with the number of discrete colourings that may still be tried.
+    """
+    if not np.array_equal(np.bincount(left), np.bincount(right)):
+        return None
+    counts = np.bincount(left)
+    if counts.max() == 1:
+        budget[0] -= 1
+        permutation = np.empty(len(left), dtype=np.int64)
+        permutation[np.argsort(left)] = np.argsort(right)
+        if np.array_equal(adjacency[np.ix_(permutation, permutation)], adjacency):
+            return permutation
+        return None
+    cell = int(np.argmax(counts > 1))
+    vertex = int(np.flatnonzero(left == cell)[0])
+    left = individualize(adjacency, left, vertex)
+    for image in np.flatnonzero(right == cell):
+        if budget[0] <= 0:
+            return None
+        permutation = find_automorphism(adjacency, left, individualize(adjacency, right, int(image)), budget)
+        if permutation is not None:
+            return permutation
+    return None
+
+
+def orbits(adjacency: np.ndarray, colors: np.ndarray = None, budget: int = 100) -> list:
+    """ Orbits of the automorphisms that preserve the colouring, as sorted vertex lists """
+    colors = refine(adjacency, np.zeros(len(adjacency), dtype=np.int64) if colors is None else colors)
+    parent = list(range(len(adjacency)))
+
+    def find(vertex):
+        while parent[vertex] != vertex:
+            parent[vertex] = parent[parent[vertex]]
+            vertex = parent[vertex]
+        return vertex
+
+    for cell in np.unique(colors):
+        members = np.flatnonzero(colors == cell).tolist()
+        if len(members) == 1:
+            continue
+        representative = members[0]
+        left = individualize(adjacency, colors, representative)
+        for vertex in members[1:]:
+            if find(vertex) == find(representative):
+                continue
+            permutation = find_automorphism(adjacency, left, individualize(adjacency, colors, vertex), [budget])
+            if permutation is None:
+                continue
+            # Every cycle of the automorphism lies in one orbit
+            for source, target in enumerate(permutation.tolist()):
+                parent[find(source)] = find(target)
+
+    groups = dict()
+    for vertex in range(len(adjacency)):
+        groups.setdefault(find(vertex), []).append(vertex)
+    return sorted(groups.values())
+
+
+def orbital_nodes(adjacency: np.ndarray, depth: int = 1, budget: int = 100) -> list:
+    """ Open nodes of orbital branching at the top `depth` levels, as lists of (vertex, value) fixings.
+
+    With orbits O_1..O_k of the automorphism group, node i fixes some v_i of O_i to 1 and O_1..O_{i-1} to 0:
+    any clique can be mapped into the first node whose orbit it meets. Below a node the same is done with the
+    orbits of the stabilizer of the vertices fixed to 1, among their common neighbours. Returns None when
+    the graph has no symmetry to exploit.
+    """
+    degrees = adjacency.sum(axis=1)
+    root_orbits = orbits(adjacency, budget=budget)
+    if len(root_orbits) == len(adjacency):
+        return None
+
+    def expand(colors, candidates, fixings, level, level_orbits=None):
+        if level_orbits is None:
+            level_orbits = orbits(adjacency, colors, budget)
+        candidate_orbits = [orbit for orbit in level_orbits if candidates[orbit[0]]]
+        candidate_orbits.sort(key=lambda orbit: -degrees[orbit[0]])
+        nodes, zeros = [], []
+        candidates = candidates.copy()
+        for orbit in candidate_orbits:
+            vertex = orbit[0]
+            node = fixings + zeros + [(vertex, 1.0)]
+            child_candidates = candidates & adjacency[vertex]
+            # Without common neighbours left the node is kept whole, as its fixed vertices may be the best clique
+            if level + 1 < depth and child_candidates.any():
+                nodes.extend(expand(individualize(adjacency, colors, vertex), child_candidates, node, level + 1))
+            else:
+                nodes.append(node)
+            zeros = zeros + [(other, 0.0) for other in orbit]
+            candidates[orbit] = False
+        return nodes
+
+    return expand(np.zeros(len(adjacency), dtype=np.int64), np.ones(len(adjacency), dtype=bool), [], 0, root_orbits)
@@ -0,0 +1,81 @@
+import numpy as np
+from labsolvers.common.csr_graph import CSRGraph
+
+# Greedy colouring in rounds of NumPy operations over CSR arrays instead of one Python step per vertex. Each round
+# colours an independent set at once: in Jones-Plassmann the uncoloured vertices whose priority beats all their
+# uncoloured neighbours, in iterated greedy a whole colour class of the previous colouring. Colours are 1-based.
+
+
+def neighbour_lists(graph: CSRGraph, vertices: np.ndarray) -> tuple:
+    """ Concatenated neighbour lists of the vertices, with the position in `vertices` each entry belongs to """
+    starts = graph.indptr[vertices]
+    counts = graph.indptr[vertices + 1] - starts
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(np.arange(len(vertices)), counts), graph.indices[np.repeat(starts, counts) + offsets]
+
+
+def first_free_colors(graph: CSRGraph, vertices: np.ndarray, colors: np.ndarray) -> np.ndarray:
+    """ Smallest colour not taken by any neighbour, for every vertex of an independent set """
+    owners, neighbours = neighbour_lists(graph, vertices)
+    neighbour_colors = colors[neighbours]
+    taken = neighbour_colors > 0
+    owners, neighbour_colors = owners[taken], neighbour_colors[taken].astype(np.int64)
+
+    # Distinct (owner, colour) pairs sorted by owner, then colour; the first colour c at rank r with c != r + 1
+    # is a gap, otherwise the owner takes the colour after all its taken ones
+    base = int(colors.max(initial=0)) + 1
+    owners, neighbour_colors = np.divmod(np.unique(owners * base + neighbour_colors), base)
+    group_starts = np.searchsorted(owners, np.arange(len(vertices)))
+    ranks = np.arange(len(owners)) - group_starts[owners]
+    result = np.bincount(owners, minlength=len(vertices)) + 1
+    gaps = neighbour_colors != ranks + 1
+    np.minimum.at(result, owners[gaps], ranks[gaps] + 1)
+    return result
+
+
+def jones_plassmann(graph: CSRGraph, priority: str = "degree", seed: int = 0) -> np.ndarray:
+    """ priority "degree" colours high degree vertices first (random tie-breaks), "random" needs fewer rounds """
+    rng = np.random.default_rng(seed)
+    weights = rng.random(len(graph))
+    if priority == "degree":
+        weights += graph.degrees()
+    colors = np.zeros(len(graph), dtype=np.int32)
+    # A vertex is coloured once all its neighbours of higher priority are, so each edge is looked at twice
+    sources, targets = graph.edges()
+    pending = np.bincount(sources[weights[targets] > weights[sources]], minlength=len(graph))
+    del sources
+    selected = np.flatnonzero(pending == 0)
+    while len(selected):
+        colors[selected] = first_free_colors(graph, selected, colors)
+        owners, neighbours = neighbour_lists(graph, selected)
+        lower = neighbours[weights[neighbours] < weights[selected[owners]]]
+        released = np.bincount(lower, minlength=len(graph))
+        pending -= released
+        selected = np.flatnonzero((released > 0) & (pending == 0))
+    return colors
+
+
+def iterated_greedy(graph: CSRGraph, colors: np.ndarray, passes: int = 10, seed: int = 0) -> np.ndarray:
+    """ Recolours class by class in a new class order each pass, which never needs more colours """
+    rng = np.random.default_rng(seed)
+    best = colors
+    for iteration in range(passes):
+        n_colors = int(colors.max(initial=0))
+        sizes = np.bincount(colors, minlength=n_colors + 1)[1:]
+        # Alternate reverse, largest first and random class orders
+        if iteration % 3 == 0:
+            order = np.arange(n_colors, 0, -1)
+        elif iteration % 3 == 1:
+            order = np.argsort(-sizes, kind="stable") + 1
+        else:
+            order = rng.permutation(n_colors) + 1
+        new_colors = np.zeros_like(colors)
+        by_class = np.argsort(colors, kind="stable")
+        class_starts = np.searchsorted(colors[by_class], np.arange(n_colors + 2))
+        for color in order:
+            members = by_class[class_starts[color]:class_starts[color + 1]]
+            new_colors[members] = first_free_colors(graph, members, new_colors)
+        colors = new_colors
+        if colors.max(initial=0) < best.max(initial=0):
+            best = colors
+    return best
@@ -0,0 +1,111 @@
+""" Portfolio max clique solver.
+
+Races exact engines (bnb, bnc) and a local search in separate processes that share one incumbent: each process
+prunes with the best clique found by any of them. The first exact engine that reports proved_optimal, i.e. finished
+its whole search, proves the shared incumbent optimal and all processes are stopped, e.g.
+
+    python -m labsolvers benchmark --engine portfolio --backend highs --param "engines=('bnb', 'bnc')"
+"""
+import importlib
+import multiprocessing
+import os
+import queue
+import random
+import time
+from labsolvers.common.incumbent import SharedIncumbent
+
+# Engine name: module with its load_instance and solve_instance
+EXACT_ENGINES = {"bnb": "labsolvers.BnB.main", "bnc": "labsolvers.BnC.main"}
+# Result fields of an exact engine passed back to the portfolio
+REPORTED_KEYS = ("objective", "nodes", "lp_solves", "timed_out", "stopped", "proved_optimal")
+
+
+def _run_exact(name: str, file_path: str, load_config: dict, config: dict, shared: SharedIncumbent, results):
+    try:
+        engine = importlib.import_module(EXACT_ENGINES[name])
+        result = engine.solve_instance(engine.load_instance(file_path, **load_config), shared_incumbent=shared,
+                                       **config)
+        shared.offer(result["solution"], name)
+        results.put((name, {key: result[key] for key in REPORTED_KEYS if key in result}))
+    except Exception as error:
+        results.put((name, {"error": repr(error)}))
+
+
+def _run_local_search(file_path: str, deadline: float, shared: SharedIncumbent, seed: int = 0):
+    from labsolvers.week2.clique import MaxCliqueProblem
+    from labsolvers.common.local_search import improve_clique
+    random.seed(seed)
+    mcp = MaxCliqueProblem()
+    mcp.read_graph_from_file(file_path)
+    iteration = 0
+    while time.time() < deadline:
+        clique = improve_clique(mcp.neighbour_sets, mcp.randomized_clique(iteration % 4), seed=seed + iteration)
+        shared.offer([vertex + 1 for vertex in clique], "local_search")
+        iteration += 1
+
+
+def load_instance(file_path: str, cache_dir: str = None, backend: str = "cplex", param_file: str = None) -> dict:
+    """ Engines load the graph in their own processes """
+    load_config = {"backend": backend}
+    if cache_dir is not None:
+        load_config["cache_dir"] = cache_dir
+    if param_file is not None:
+        load_config["param_file"] = os.path.abspath(param_file)
+    return {"file_path": os.path.abspath(file_path), "load_config": load_config}
+
+
+def solve_instance(instance: dict, engines: tuple = ("bnb", "bnc"), local_search: bool = True,
+                   time_limit: float = 7000, engine_params: dict = None, seed: int = 0) -> dict:
+    """ engine_params holds extra solve_instance arguments per engine, e.g. {"bnc": {"decompose": True}} """
+    context = multiprocessing.get_context("spawn")
+    shared = SharedIncumbent(context)
+    results = context.Queue()
+    deadline = time.time() + time_limit
+    processes = []
+    for name in engines:
+        config = {"time_limit": time_limit, **(engine_params or dict()).get(name, dict())}
+        processes.append(context.Process(target=_run_exact, daemon=True, args=(
+            name, instance["file_path"], instance["load_config"], config, shared, results)))
+    if local_search:
+        processes.append(context.Process(target=_run_local_search, daemon=True,
+                                         args=(instance["file_path"], deadline, shared, seed)))
+    for process in processes:
+        process.start()
+
+    best_clique, found_by, proved_by, engine_results = [], None, None, dict()
+
+    def collect(timeout=0.0):
+        nonlocal best_clique, found_by
+        for source, clique in shared.drain(timeout):
+            if len(clique) > len(best_clique):
+                best_clique, found_by = clique, source
+
+    # Engines stop by their own time limit; the grace period covers loading and the final report
+    while len(engine_results) < len(engines) and time.time() < deadline + 60:
+        collect()
+        try:
+            name, result = results.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        engine_results[name] = result
+        print(f"{name} finished: {result}")
+        if result.get("proved_optimal"):
+            proved_by = name
+            break
+    # Cliques offered just before the end may still be in the queue
+    while len(best_clique) < shared.best and time.time() < deadline + 60:
+        collect(timeout=0.5)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+
+    return {
+        "objective": len(best_clique),
+        "solution": best_clique,
+        "found_by": found_by,
+        "proved_by": proved_by,
+        "optimal": proved_by is not None,
+        "timed_out": proved_by is None,
+        "engines": engine_results,
+    }
@@ -0,0 +1,117 @@
+""" LP parameter tuner for the bnb/bnc solvers.
+
+Solves a sample of instances of every family (brock, san, p_hat, MANN, ...) with each candidate profile of
+common/solver_params.py and stores the fastest profile per family in the profile file, e.g.
+
+    python -m labsolvers tune --engine bnc --backend highs --suite hard --sample 2 --time-limit 300
+    python -m labsolvers benchmark --engine bnc --backend highs --solver-params solver_params.json
+
+Runs that hit the time limit count twice the limit. A profile that ends a finished run with another objective than
+the other profiles is dropped for that family, as its tolerances are too loose for it.
+"""
+import argparse
+import os
+import random
+import statistics
+from labsolvers.benchmark import ENGINES, SUITES, load_engine, measure_run
+from labsolvers.common.solver_params import DEFAULT_PROFILES, graph_family, load_profiles, profile_params, save_profiles
+
+
+def sample_families(filenames: list, sample: int, seed: int = 0) -> dict:
+    """ Up to `sample` instances per family """
+    families = dict()
+    for filename in filenames:
+        families.setdefault(graph_family(filename), []).append(filename)
+    rng = random.Random(seed)
+    return {family: sorted(rng.sample(members, min(sample, len(members)))) for family, members in families.items()}
+
+
+def score_profile(engine, file_paths: list, params: dict, backend: str, config: dict, repeat: int = 1) -> tuple:
+    """ (score, objectives of the finished runs): the sum over the instances of the median solve time """
+    score, objectives = 0.0, dict()
+    for file_path in file_paths:
+        times = []
+        for _ in range(repeat):
+            row = measure_run(engine, file_path, config, {"backend": backend, "solver_params": params})
+            if row["timed_out"]:
+                times.append(2 * config["time_limit"])
+            else:
+                times.append(row["wall_time"])
+                objectives[file_path] = row["objective"]
+        score += statistics.median(times)
+    return score, objectives
+
+
+def tune(engine_name: str, filenames: list, graph_dir: str, candidates: dict, backend: str, config: dict,
+         sample: int = 2, repeat: int = 1, seed: int = 0) -> dict:
+    """ Scores of every candidate profile per family """
+    engine = load_engine(engine_name)
+    scores = dict()
+    for family, members in sample_families(filenames, sample, seed).items():
+        file_paths = [os.path.join(graph_dir, filename) for filename in members]
+        results = dict()
+        for name, profile in candidates.items():
+            results[name] = score_profile(engine, file_paths, profile.get(backend, dict()), backend, config, repeat)
+            print(f"{family} {name}: {round(results[name][0], 3)}s")
+        # The most common objective of a finished run is taken as the right one
+        expected = {path: statistics.mode([objectives[path] for _, objectives in results.values()
+                                           if path in objectives] or [None]) for path in file_paths}
+        scores[family] = {name: round(score, 3) for name, (score, objectives) in results.items()
+                          if all(objectives[path] == expected[path] for path in objectives)}
+        if len(scores[family]) < len(results):
+            print(f"{family}: dropped {sorted(set(results) - set(scores[family]))} for a wrong objective")
+    return scores
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m labsolvers tune",
+                                     description="Find the fastest LP parameter profile per instance family")
+    parser.add_argument("--engine", choices=["bnb", "bnc"], default="bnc")
+    parser.add_argument("--backend", choices=["cplex", "highs"], default="cplex")
+    parser.add_argument("--suite", choices=sorted(SUITES), default="exact", help="named instance set")
+    parser.add_argument("--instances", nargs="+", help="instance file names, overrides --suite")
+    parser.add_argument("--graph-dir", help="directory with the graph files (default depends on the engine)")
+    parser.add_argument("--profiles", help="profile file with the candidates (default: the built-in profiles)")
+    parser.add_argument("--candidates", nargs="+", help="names of the profiles to try (default: all)")
+    parser.add_argument("--sample", type=int, default=2, help="instances tried per family")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per instance and profile, the median counts")
+    parser.add_argument("--time-limit", type=int, default=300, help="solver time limit per run in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the instance sample")
+    parser.add_argument("--output", default="solver_params.json",
+                        help="profile file to write, updated in place if it exists")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    filenames = args.instances or SUITES[args.suite]
+    graph_dir = args.graph_dir or ENGINES[args.engine][3]
+
+    config = load_profiles(args.output) if os.path.exists(args.output) else {"profiles": dict(), "families": dict()}
+    source = load_profiles(args.profiles) if args.profiles else config
+    names = args.candidates or sorted({**DEFAULT_PROFILES, **source["profiles"]})
+    candidates = {name: {args.backend: profile_params(source, name, args.backend)} for name in names}
+
+    scores = tune(args.engine, filenames, graph_dir, candidates, args.backend, {"time_limit": args.time_limit},
+                  sample=args.sample, repeat=args.repeat, seed=args.seed)
+
+    # Profiles that were tried are stored in the file, so it does not depend on the built-in ones
+    for name in names:
+        config["profiles"].setdefault(name, dict())[args.backend] = candidates[name][args.backend]
+    totals = dict()
+    for family, family_scores in scores.items():
+        if family_scores:
+            config["families"][family] = min(family_scores, key=family_scores.get)
+            print(f"{family}: {config['families'][family]}")
+        for name, score in family_scores.items():
+            totals[name] = totals.get(name, 0.0) + score
+    # Families that were not tuned get the profile that is best overall
+    if totals:
+        config["default"] = min(totals, key=totals.get)
+    config.setdefault("scores", dict())[args.backend] = scores
+    save_profiles(args.output, config)
+    print(f"Profiles saved to {args.output}, default: {config.get('default')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+""" Solution verifier for benchmark results.
+
+Streams result rows, loads each graph once as CSR arrays and checks every solution with vectorized adjacency
+lookups, outside of the timed solver runs. Exits with status 1 if any solution is wrong or any row has no
+solution (a failed run or a results file without the solution column), e.g.
+
+    python -m labsolvers verify results/bnc.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+from functools import lru_cache
+import numpy as np
+from labsolvers.benchmark import ENGINES
+from labsolvers.common.csr_graph import CSRGraph
+from labsolvers.common.results import iter_results
+
+# What the solution column of each engine holds
+SOLUTION_KINDS = {
+    "coloring": "coloring",
+    "clique": "clique",
+    "bnb": "clique",
+    "bnc": "clique",
+    "weighted_set": "independent_set",
+    "portfolio": "clique",
+}
+
+
+@lru_cache(maxsize=8)
+def load_graph(file_path: str) -> CSRGraph:
+    return CSRGraph.read_dimacs(file_path)
+
+
+@lru_cache(maxsize=8)
+def load_edges(file_path: str) -> tuple:
+    """ Source and target arrays of every edge in one direction """
+    sources, targets = load_graph(file_path).edges()
+    forward = sources < targets
+    return sources[forward], targets[forward]
+
+
+def _vertex_indices(graph: CSRGraph, vertices: list) -> tuple:
+    """ 0-based indices of 1-based vertex ids, with the problems found in the id list """
+    indices = np.asarray(vertices, dtype=np.int64).reshape(-1) - 1
+    errors = []
+    if len(indices) and (indices.min() < 0 or indices.max() >= len(graph)):
+        errors.append("vertex id out of range")
+        indices = indices[(indices >= 0) & (indices < len(graph))]
+    if len(np.unique(indices)) != len(indices):
+        errors.append("duplicated vertices")
+        indices = np.unique(indices)
+    return indices, errors
+
+
+def check_clique(graph: CSRGraph, solution: list, objective) -> list:
+    indices, errors = _vertex_indices(graph, solution)
+    subgraph = graph.induced(indices)
+    degrees = subgraph.degrees()
+    missing = np.flatnonzero(degrees != len(indices) - 1)
+    if len(missing):
+        vertex = subgraph.vertices[missing[0]]
+        errors.append(f"not a clique, vertex {vertex + 1} is adjacent to {degrees[missing[0]]} "
+                      f"of the other {len(indices) - 1} vertices")
+    if objective is not None and int(float(objective)) != len(solution):
+        errors.append(f"objective {objective} differs from the clique size {len(solution)}")
+    return errors
+
+
+def check_independent_set(graph: CSRGraph, solution: list, objective) -> list:
+    indices, errors = _vertex_indices(graph, solution)
+    subgraph = graph.induced(indices)
+    adjacent = np.flatnonzero(subgraph.degrees())
+    if len(adjacent):
+        errors.append(f"not an independent set, vertex {subgraph.vertices[adjacent[0]] + 1} has a neighbour in it")
+    return errors
+
+
+def check_coloring(graph: CSRGraph, solution: list, objective, file_path: str) -> list:
+    errors = []
+    colors = np.zeros(len(graph), dtype=np.int64)
+    seen = np.zeros(len(graph), dtype=np.int64)
+    for color, color_class in enumerate(solution, start=1):
+        indices, class_errors = _vertex_indices(graph, color_class)
+        errors.extend(f"colour {color}: {error}" for error in class_errors)
+        colors[indices] = color
+        seen[indices] += 1
+    if np.any(seen == 0):
+        errors.append(f"{np.count_nonzero(seen == 0)} vertices are not coloured, e.g. {np.argmin(seen) + 1}")
+    if np.any(seen > 1):
+        errors.append(f"{np.count_nonzero(seen > 1)} vertices have several colours, e.g. {np.argmax(seen) + 1}")
+    sources, targets = load_edges(file_path)
+    conflicts = np.flatnonzero((colors[sources] == colors[targets]) & (colors[sources] > 0))
+    if len(conflicts):
+        u, v = sources[conflicts[0]] + 1, targets[conflicts[0]] + 1
+        errors.append(f"{len(conflicts)} edges have equal colours, e.g. {u}-{v}")
+    n_colors = sum(1 for color_class in solution if len(color_class))
+    if objective is not None and int(float(objective)) != n_colors:
+        errors.append(f"objective {objective} differs from the {n_colors} colours used")
+    return errors
+
+
+def verify_row(row: dict, engine: str, graph_dir: str) -> list:
+    """ Violations found in one result row, None if the row has no solution to check """
+    solution = row.get("solution")
+    if isinstance(solution, str):
+        solution = json.loads(solution) if solution else None
+    if row.get("error") or solution is None:
+        return None
+    file_path = os.path.join(graph_dir, row["instance"])
+    graph = load_graph(file_path)
+    kind = SOLUTION_KINDS[engine]
+    if kind == "coloring":
+        return check_coloring(graph, solution, row.get("objective"), file_path)
+    if kind == "clique":
+        return check_clique(graph, solution, row.get("objective"))
+    return check_independent_set(graph, solution, row.get("objective"))
+
+
+def read_meta(results_path: str) -> dict:
+    """ Run settings stored by benchmark.py next to the results file """
+    meta_path = os.path.splitext(results_path)[0] + ".meta.json"
+    if not os.path.exists(meta_path):
+        return dict()
+    with open(meta_path, "r") as file:
+        return json.load(file)
+
+
+def verify_file(results_path: str, engine: str = None, graph_dir: str = None) -> tuple:
+    """ Returns (checked rows, rows without solution, violations) and prints every violation and missing solution """
+    meta = read_meta(results_path)
+    checked, missing, violations = 0, 0, 0
+    for row in iter_results(results_path):
+        row_engine = engine or row.get("engine") or meta.get("engine")
+        row_graph_dir = graph_dir or meta.get("graph_dir") or ENGINES[row_engine][3]
+        try:
+            errors = verify_row(row, row_engine, row_graph_dir)
+        except (OSError, ValueError) as error:
+            errors = [f"cannot verify: {error}"]
+        if errors is None:
+            missing += 1
+            reason = f"run failed: {row['error']}" if row.get("error") else "no solution recorded"
+            print(f"{results_path}: {row['instance']} run {row.get('run', 0)}: {reason}")
+            continue
+        checked += 1
+        for error in errors:
+            violations += 1
+            print(f"{results_path}: {row['instance']} run {row.get('run', 0)}: {error}")
+    return checked, missing, violations
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m labsolvers verify", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("results", nargs="+", help="results files (.jsonl or .csv) written by benchmark.py")
+    parser.add_argument("--engine", choices=sorted(SOLUTION_KINDS), help="engine of the results, if not recorded")
+    parser.add_argument("--graph-dir", help="directory with the graph files (default from the .meta.json file)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    failures = 0
+    for results_path in args.results:
+        checked, missing, violations = verify_file(results_path, args.engine, args.graph_dir)
+        print(f"{results_path}: {checked} solutions checked, {missing} without solution, {violations} violations")
+        failures += missing + violations
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,7 @@
-from time import time
-from pandas import DataFrame
+import numpy as np
+from labsolvers.common.csr_graph import CSRGraph
+from labsolvers.common.vector_coloring import iterated_greedy, jones_plassmann
+from labsolvers.week1.dsatur import DSaturBranchAndBound
 
 
 class ColoringProblem:
@@ -8,8 +10,13 @@ class ColoringProblem:
         self.colors = []
         self.maxColor = 0
 
-    def read_graph_from_file(self, filename):
-        with open("../graphs/" + filename, "r") as file:
+    def read_graph_from_file(self, filename, compact=False):
+        """ compact=True keeps the graph as CSR arrays, which also serve as neighbour_sets """
+        if compact:
+            self.neighbour_sets = CSRGraph.read_dimacs(filename)
+            self.colors = [0] * len(self.neighbour_sets)
+            return
+        with open(filename, "r") as file:
             for line in file:
                 line = line.rstrip()
                 if line[0] == "e":
@@ -69,6 +76,18 @@ class ColoringProblem:
                 self.maxColor += 1
             self.colors[vertex] = min_color
 
+    def vectorized_graph_coloring(self, priority: str = "degree", passes: int = 0, seed: int = 0):
+        """ Jones-Plassmann rounds over CSR arrays, then `passes` of iterated greedy recolouring """
+        graph = self.neighbour_sets
+        if not isinstance(graph, CSRGraph):
+            edges = [(u, v) for u, neighbours in enumerate(graph) for v in neighbours if u < v]
+            graph = CSRGraph.from_edges(len(graph), np.array(edges, dtype=np.int32).reshape(-1, 2))
+        colors = jones_plassmann(graph, priority, seed)
+        if passes:
+            colors = iterated_greedy(graph, colors, passes, seed)
+        self.colors = colors.tolist()
+        self.maxColor = int(colors.max(initial=0))
+
     def check(self):
         for i, neighbours in enumerate(self.neighbour_sets):
             if self.colors[i] == 0:
@@ -87,41 +106,37 @@ class ColoringProblem:
         return self.colors
 
 
-def run():
-    filenames = ["myciel3.col", "myciel7.col", "latin_square_10.col", "school1.col", "school1_nsh.col",
-                 "mulsol.i.1.col", "inithx.i.1.col", "anna.col", "huck.col", "jean.col", "miles1000.col",
-                 "miles1500.col", "fpsol2.i.1.col", "le450_5a.col", "le450_15b.col", "le450_25a.col",
-                 "games120.col", "queen11_11.col", "queen5_5.col"]
-    times, color_nums, color_groups = [], [], []
-    with open("report.txt", "w") as report_file:
-        for filename in filenames:
-            gp = ColoringProblem()
-            gp.read_graph_from_file(filename)
-            start = time()
-            gp.greedy_graph_coloring()
-            end = time()
-            if not gp.check():
-                error = "Error: incorrect coloring!!!"
-                print(error)
-                report_file.write(error)
-            time_sec = round(end - start, 3)
-            log_info = f"{filename}: num colors - {gp.number_of_colors()}, time - {time_sec} "
-            print(log_info)
-            report_file.write(log_info)
-            color_classes = {color: [] for color in range(1, gp.number_of_colors() + 1)}
-            colors = gp.get_colors()
-            for i, color in enumerate(colors, start=1):
-                color_classes[color].append(i)
-            report_file.write(str(list(color_classes.values())))
-            report_file.write("\n")
-
-            times.append(time_sec)
-            color_nums.append(gp.number_of_colors())
-            color_groups.append(list(color_classes.values()))
-
-    df = DataFrame({'Instance': filenames, 'Time, sec': times, "Colors": color_nums, "Color classes": color_groups})
-    df.to_excel('report.xlsx', sheet_name='Coloring', index=False)
-
-
-if __name__ == "__main__":
-    run()
+def load_instance(file_path: str, compact: bool = False) -> ColoringProblem:
+    gp = ColoringProblem()
+    gp.read_graph_from_file(file_path, compact)
+    return gp
+
+
+def solve_instance(gp: ColoringProblem, check: bool = False, exact: bool = False, time_limit: float = 60,
+                   method: str = "greedy", priority: str = "degree", ig_passes: int = 0) -> dict:
+    """ Verification is left to verify.py, outside of the timed run; check=True adds a "valid" field checked
+    inside it. method="jones_plassmann" colours with vectorized rounds for very large graphs, followed by ig_passes
+    of iterated greedy. exact=True improves the colouring by DSatur branch and bound for up to time_limit seconds
+    and reports the clique lower bound """
+    if method == "jones_plassmann":
+        gp.vectorized_graph_coloring(priority, ig_passes)
+    else:
+        gp.greedy_graph_coloring()
+    bounds = dict()
+    if exact:
+        solver = DSaturBranchAndBound(gp.neighbour_sets, time_limit=time_limit)
+        bounds = solver.run(gp.get_colors())
+        gp.colors = solver.colors
+        gp.maxColor = solver.upper_bound
+    color_classes = {color: [] for color in range(1, gp.number_of_colors() + 1)}
+    for i, color in enumerate(gp.get_colors(), start=1):
+        color_classes[color].append(i)
+    result = {
+        "objective": gp.number_of_colors(),
+        "solution": list(color_classes.values()),
+    }
+    if exact:
+        result.update(lower_bound=bounds["lower_bound"], optimal=bounds["optimal"], bnb_nodes=bounds["nodes"])
+    if check:
+        result["valid"] = gp.check()
+    return result
@@ -0,0 +1,157 @@
+import time
+from labsolvers.common.independent_sets import popcount
+from labsolvers.week2.clique import MaxCliqueProblem
+
+
+class DSaturBranchAndBound:
+    """ Exact graph coloring by DSatur branch and bound.
+
+    The lower bound is a clique from the week2 heuristic, whose vertices get the first colours. Vertices of
+    degree below the clique size are peeled off first and coloured last, as they always find a free colour.
+    The search stops as soon as a colouring with as many colours as the clique is found.
+    """
+
+    def __init__(self, neighbour_sets, time_limit: float = 60):
+        self.neighbour_sets = neighbour_sets
+        self.time_limit = time_limit
+        self.clique = []
+        self.lower_bound = 0
+        self.upper_bound = None
+        self.colors = None
+        self.nodes = 0
+        self.timed_out = False
+
+    def find_clique(self):
+        mcp = MaxCliqueProblem()
+        mcp.neighbour_sets = self.neighbour_sets
+        mcp.colors = [0] * len(self.neighbour_sets)
+        mcp.find_clique()
+        self.clique = list(mcp.get_clique())
+        self.lower_bound = len(self.clique)
+
+    def run(self, initial_colors: list = None) -> dict:
+        """ initial_colors (1-based, e.g. from greedy_graph_coloring) give the starting upper bound """
+        start_time = time.time()
+        n = len(self.neighbour_sets)
+        if initial_colors is not None and all(initial_colors):
+            self.colors = list(initial_colors)
+            self.upper_bound = max(self.colors, default=0)
+        if not self.clique:
+            self.find_clique()
+        if self.upper_bound is None or self.upper_bound > self.lower_bound:
+            core, peeled = self._peel(self.lower_bound)
+            core_colors = self._search(core, start_time)
+            if core_colors is not None:
+                colors = [0] * n
+                for vertex, color in zip(core, core_colors):
+                    colors[vertex] = color
+                self._color_peeled(colors, peeled)
+                if self.upper_bound is None or max(colors, default=0) < self.upper_bound:
+                    self.colors = colors
+                    self.upper_bound = max(colors, default=0)
+        return {
+            "lower_bound": self.lower_bound,
+            "upper_bound": self.upper_bound,
+            "optimal": self.upper_bound == self.lower_bound or not self.timed_out,
+            "nodes": self.nodes,
+            "time": round(time.time() - start_time, 3),
+        }
+
+    def _peel(self, k: int) -> tuple:
+        """ Splits the vertices into the k-core and the rest in removal order """
+        degrees = [len(neighbours) for neighbours in self.neighbour_sets]
+        removed = [False] * len(degrees)
+        stack = [vertex for vertex, degree in enumerate(degrees) if degree < k]
+        for vertex in stack:
+            removed[vertex] = True
+        peeled = []
+        while stack:
+            vertex = stack.pop()
+            peeled.append(vertex)
+            for neighbour in self.neighbour_sets[vertex]:
+                degrees[neighbour] -= 1
+                if not removed[neighbour] and degrees[neighbour] < k:
+                    removed[neighbour] = True
+                    stack.append(neighbour)
+        return [vertex for vertex in range(len(degrees)) if not removed[vertex]], peeled
+
+    def _color_peeled(self, colors: list, peeled: list):
+        """ Each peeled vertex has fewer than lower_bound neighbours coloured before it """
+        for vertex in reversed(peeled):
+            used = {colors[neighbour] for neighbour in self.neighbour_sets[vertex]}
+            color = 1
+            while color in used:
+                color += 1
+            colors[vertex] = color
+
+    def _search(self, core: list, start_time: float) -> list:
+        """ Best colouring of the core found below upper_bound, 1-based in core order, or None """
+        position = {vertex: i for i, vertex in enumerate(core)}
+        adjacency = [[position[u] for u in self.neighbour_sets[v] if u in position] for v in core]
+        degrees = [len(neighbours) for neighbours in adjacency]
+        m = len(core)
+        colors = [-1] * m
+        # Bitset of the colours taken by the neighbours of each vertex
+        forbidden = [0] * m
+        uncolored = set(range(m))
+        best = self.upper_bound if self.upper_bound is not None else m + 1
+        best_colors = None
+
+        def assign(vertex, color) -> list:
+            colors[vertex] = color
+            uncolored.discard(vertex)
+            bit = 1 << color
+            changed = [u for u in adjacency[vertex] if colors[u] < 0 and not forbidden[u] & bit]
+            for u in changed:
+                forbidden[u] |= bit
+            return changed
+
+        def unassign(vertex, changed):
+            mask = ~(1 << colors[vertex])
+            for u in changed:
+                forbidden[u] &= mask
+            colors[vertex] = -1
+            uncolored.add(vertex)
+
+        n_colors = 0
+        for vertex in self.clique:
+            if vertex in position:
+                assign(position[vertex], n_colors)
+                n_colors += 1
+
+        # Frames of [vertex, colours to try, next index, undo list of the current colour, colour count before]
+        stack = []
+        while True:
+            if not uncolored:
+                if n_colors < best:
+                    best, best_colors = n_colors, [color + 1 for color in colors]
+                    if best <= self.lower_bound:
+                        break
+            else:
+                self.nodes += 1
+                if self.nodes % 1000 == 0 and time.time() - start_time > self.time_limit:
+                    self.timed_out = True
+                    break
+                vertex = max(uncolored, key=lambda v: (popcount(forbidden[v]), degrees[v]))
+                options = [color for color in range(n_colors) if not forbidden[vertex] >> color & 1]
+                options.append(n_colors)
+                stack.append([vertex, options, 0, None, n_colors])
+            # Next untried colour of the deepest frame, backtracking over exhausted ones
+            while stack:
+                frame = stack[-1]
+                vertex, options, index, changed, previous_n_colors = frame
+                if changed is not None:
+                    unassign(vertex, changed)
+                    frame[3] = None
+                    n_colors = previous_n_colors
+                # A colour c is only worth trying if the colouring can still beat best
+                if index < len(options) and options[index] < best - 1:
+                    color = options[index]
+                    frame[2] = index + 1
+                    frame[3] = assign(vertex, color)
+                    n_colors = max(n_colors, color + 1)
+                    break
+                stack.pop()
+            if not stack:
+                break
+        return best_colors
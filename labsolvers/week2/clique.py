@@ -1,6 +1,8 @@
-import re
 import copy
+import re
 import random
+from labsolvers.common.csr_graph import CSRGraph
+from labsolvers.common.graph_cache import graph_data
 
 
 class MaxCliqueProblem:
@@ -10,7 +12,12 @@ class MaxCliqueProblem:
         self.colors = []
         self.best_clique = []
 
-    def read_graph_from_file(self, filename):
+    def read_graph_from_file(self, filename, compact=False):
+        """ compact=True keeps the graph as CSR arrays, which also serve as neighbour_sets """
+        if compact:
+            self.neighbour_sets = CSRGraph.read_dimacs(filename)
+            self.colors = [0] * len(self.neighbour_sets)
+            return
         with open(filename, "r") as file:
             for line in file:
                 line = line.rstrip()
@@ -32,10 +39,15 @@ class MaxCliqueProblem:
         for i in range(randomization):
             for _ in range(max_iter):
                 self._find_clique(i)
-                if len(self._get_clique()) > len(clique):
-                    clique = copy.deepcopy(self._get_clique())
+                if len(self.get_clique()) > len(clique):
+                    clique = copy.deepcopy(self.get_clique())
         self.best_clique = clique
 
+    def randomized_clique(self, randomization: int) -> list:
+        """ One greedy pass picking among the minimum degree vertices at random; the clique replaces best_clique """
+        self._find_clique(randomization)
+        return self.best_clique
+
     def _find_clique(self, randomization=None, first_iter=True, candidates=None, clique=None):
         if not first_iter and len(candidates) == 1:
             clique.append(candidates[0][0])
@@ -43,8 +55,9 @@ class MaxCliqueProblem:
 
         # calculate new degrees
         if first_iter:
-            candidates = [(i, len(self.neighbour_sets[i])) for i in range(len(self.neighbour_sets))]
-            candidates.sort(key=lambda tup: tup[1], reverse=True)
+            data = graph_data(self.neighbour_sets)
+            degrees = data.degrees.tolist()
+            candidates = [(i, degrees[i]) for i in data.degree_order]
             clique = []
         else:
             remaining_vertex_numbers = {vertex: True for vertex, degree in candidates}
@@ -103,11 +116,32 @@ class MaxCliqueProblem:
                     return False
         return True
 
-    def _get_clique(self):
+    def get_clique(self):
         return self.best_clique
 
     def get_clique_size(self):
         return len(self.best_clique)
 
     def get_best_clique(self):
-        return [1.0 if i in self.best_clique else 0.0 for i in range(len(self.neighbour_sets))]
\ No newline at end of file
+        """ Clique as 0/1 values per vertex, the initial solution of the exact solvers """
+        members = set(self.best_clique)
+        return [1.0 if i in members else 0.0 for i in range(len(self.neighbour_sets))]
+
+
+def load_instance(file_path: str, compact: bool = False) -> MaxCliqueProblem:
+    mcp = MaxCliqueProblem()
+    mcp.read_graph_from_file(file_path, compact)
+    return mcp
+
+
+def solve_instance(mcp: MaxCliqueProblem, check: bool = False) -> dict:
+    """ Verification is left to verify.py, outside of the timed run; check=True adds a "valid" field checked
+    inside it """
+    mcp.find_clique()
+    result = {
+        "objective": len(mcp.get_clique()),
+        "solution": [vertex + 1 for vertex in mcp.get_clique()],
+    }
+    if check:
+        result["valid"] = mcp.check()
+    return result
@@ -1,5 +1,6 @@
 import numpy as np
 from numpy import argsort
+from labsolvers.common.graph_cache import graph_data
 
 
 def _sort_desc_by_weight(graph, weights):
@@ -7,7 +8,7 @@ def _sort_desc_by_weight(graph, weights):
 
 
 def _sort_by_weight_div_degrees(graph, weights):
-    new_weights = np.array(weights) / np.array([graph.degree(i) + 1 for i in range(1, len(weights) + 1)])
+    new_weights = np.array(weights) / (graph_data(graph).degrees + 1)
     return list(argsort(new_weights)[::-1])
 
 
@@ -15,13 +16,14 @@ def _find_maximal_weighted_set(graph, weights, sort_func=_sort_by_weight_div_deg
     result = []
     deleted = [False] * len(weights)
     sorted_vertices: list = sort_func(graph, weights)
+    neighbours = graph_data(graph).neighbours
 
     for v in sorted_vertices:
         if deleted[v]:
             continue
         result.append(v + 1)
-        for neighbour in graph.neighbors(v + 1):
-            deleted[neighbour - 1] = True
+        for neighbour in neighbours[v]:
+            deleted[neighbour] = True
 
     return result, sum([weights[v - 1] for v in result])
 
@@ -0,0 +1,36 @@
+import re
+import networkx as nx
+import numpy as np
+from labsolvers.weighted_set.heuristic import find_maximal_weighted_set
+
+
+def read_graph_file(file_path: str):
+    result_graph = None
+    with open(file_path, "r") as file:
+        edges = []
+        num_edges = 0
+        for line in file:
+            line = line.rstrip()
+            if line[0] == "e":
+                start, finish = [int(number) for number in line[2:].split(" ")]
+                edges.append((start, finish))
+            elif line[0] == "p":
+                _, __, num_vertices, num_edges = re.split(r"\s+", line)
+                _, num_edges = int(num_vertices), int(num_edges)
+            else:
+                pass
+        if len(edges) != num_edges:
+            raise
+        result_graph = nx.Graph(edges)
+    return result_graph
+
+
+def load_instance(file_path: str) -> nx.Graph:
+    return read_graph_file(file_path)
+
+
+def solve_instance(graph: nx.Graph) -> dict:
+    num_nodes = graph.number_of_nodes()
+    weights = [np.ceil(10 * i / num_nodes) * 0.1 for i in range(1, num_nodes + 1)]
+    res, weight = find_maximal_weighted_set(graph, weights)
+    return {"objective": weight, "solution": res}
@@ -0,0 +1,83 @@
+import json
+import time
+from types import SimpleNamespace
+import pytest
+from labsolvers import benchmark
+from labsolvers.common.results import read_results
+
+# Stand-in engine: instances named slow* take 0.4 s per run, fail* raise after their first run
+
+
+def solve_instance(instance, **config):
+    if "slow" in instance:
+        time.sleep(0.4)
+    if "fail" in instance and instance in solved:
+        raise RuntimeError("solver failed")
+    solved.add(instance)
+    return {"objective": len(instance), "solution": [1]}
+
+
+solved = set()
+FAKE_ENGINE = SimpleNamespace(load_instance=lambda file_path: file_path, solve_instance=solve_instance)
+
+
+class ListSink:
+    def __init__(self):
+        self.rows = []
+
+    def write(self, row: dict):
+        self.rows.append((time.perf_counter(), row))
+
+
+@pytest.fixture(autouse=True)
+def fake_engine(monkeypatch):
+    # Workers are forked, so they see the patched loader too
+    monkeypatch.setattr(benchmark, "load_engine", lambda engine_name: FAKE_ENGINE)
+    solved.clear()
+
+
+def test_rows_are_written_as_runs_finish():
+    sink = ListSink()
+    start = time.perf_counter()
+    benchmark.run_parallel("coloring", ["slow.col", "a.col", "b.col"], ".", {}, [sink], jobs=3, repeat=3,
+                           poll_interval=0.05)
+    assert len(sink.rows) == 9
+    first_slow = min(written for written, row in sink.rows if row["instance"] == "slow.col")
+    # Fast instances are on disk long before the slow one finishes, and slow runs arrive one by one
+    assert all(written < first_slow for written, row in sink.rows if row["instance"] != "slow.col")
+    assert first_slow - start < 1.0
+
+
+def test_a_killed_worker_keeps_its_finished_runs():
+    sink = ListSink()
+    benchmark.run_parallel("coloring", ["slow.col"], ".", {}, [sink], jobs=1, repeat=6, kill_after=1.0,
+                           poll_interval=0.05)
+    rows = [row for _, row in sink.rows]
+    assert sorted(row["run"] for row in rows) == list(range(6))
+    finished = [row for row in rows if row["error"] is None]
+    assert finished and all(row["solution"] == [1] for row in finished)
+    assert any(row["error"] == "killed after 1.0s" for row in rows)
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_a_failing_run_keeps_the_earlier_runs(jobs):
+    sink = ListSink()
+    run = benchmark.run_parallel if jobs > 1 else benchmark.run_benchmark
+    kwargs = {"jobs": jobs, "poll_interval": 0.05} if jobs > 1 else {}
+    run("coloring", ["fail.col", "a.col"], ".", {}, [sink], repeat=3, **kwargs)
+    rows = {(row["instance"], row["run"]): row for _, row in sink.rows}
+    assert len(rows) == 6
+    assert rows[("fail.col", 0)]["error"] is None
+    assert rows[("fail.col", 1)]["error"] == rows[("fail.col", 2)]["error"] == "RuntimeError('solver failed')"
+    assert all(rows[("a.col", run_index)]["error"] is None for run_index in range(3))
+
+
+def test_csv_report_is_put_back_in_instance_order(tmp_path):
+    output = str(tmp_path / "results")
+    benchmark.main(["--engine", "coloring", "--instances", "slow.col", "a.col", "b.col", "--graph-dir", ".",
+                    "--repeat", "2", "--jobs", "3", "--output", output])
+    order = [(row["instance"], int(row["run"])) for row in read_results(output + ".csv")]
+    assert order == [(name, run_index) for name in ("slow.col", "a.col", "b.col") for run_index in range(2)]
+    with open(output + ".jsonl") as file:
+        completion = [json.loads(line)["instance"] for line in file]
+    assert completion[-1] == "slow.col" and sorted(completion) == sorted(name for name, _ in order)
@@ -0,0 +1,47 @@
+import networkx as nx
+import pytest
+
+pytest.importorskip("highspy")
+from labsolvers.BnC.branch_and_cut import BranchAndCut, CUT_PREFIXES
+from labsolvers.BnC.main import load_instance, solve_instance
+from labsolvers.common.stats import SolverStats
+
+
+def write_dimacs(graph: nx.Graph, path) -> str:
+    """ DIMACS file of a graph on 0..n-1, written with vertices 1..n """
+    lines = [f"p edge {graph.number_of_nodes()} {graph.number_of_edges()}"]
+    lines += [f"e {u + 1} {v + 1}" for u, v in graph.edges()]
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+def clique_number(graph: nx.Graph) -> int:
+    return max(len(clique) for clique in nx.find_cliques(graph))
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_root_purge_keeps_the_base_rows(tmp_path, seed):
+    graph = nx.gnp_random_graph(60, 0.5, seed=seed)
+    instance = load_instance(write_dimacs(graph, tmp_path / "g.clq"), backend="highs")
+    model = instance["problem_handler"].model
+    base_rows = set(model.get_row_names())
+    algorithm = BranchAndCut(instance["problem_handler"], 0, [0.0] * 60, instance["graph"], time_limit=60,
+                             stats=SolverStats(), root_tailing_tol=0.0)
+    algorithm.strengthen_root()
+    names = set(model.get_row_names())
+    assert base_rows <= names
+    assert all(name.startswith(CUT_PREFIXES) for name in names - base_rows)
+    assert algorithm.stats.phase_counts["root_rounds"] > 0
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_root_rounds_keep_the_optimum(tmp_path, seed):
+    graph = nx.gnp_random_graph(60, 0.5, seed=seed)
+    path = write_dimacs(graph, tmp_path / "g.clq")
+    results = [solve_instance(load_instance(path, backend="highs"), time_limit=120, root_max_rounds=rounds)
+               for rounds in (0, 100)]
+    for result in results:
+        clique = result["solution"]
+        assert all(graph.has_edge(u - 1, v - 1) for u in clique for v in clique if u != v)
+        assert result["objective"] == len(clique) == clique_number(graph)
+        assert result["proved_optimal"]
@@ -0,0 +1,104 @@
+import networkx as nx
+import pytest
+
+pytest.importorskip("highspy")
+from labsolvers.BnB.branch_and_bound import BranchAndBound
+from labsolvers.BnC.branch_and_cut import BranchAndCut
+from labsolvers.common.checkpoint import load_checkpoint, open_nodes
+from labsolvers.common.events import SearchStopped
+from labsolvers.common.node_store import NodeStore
+from labsolvers.common.problem import ProblemHandler
+from labsolvers.common.stats import SolverStats
+
+
+def dimacs_graph(n: int, density: float, seed: int) -> nx.Graph:
+    graph = nx.gnp_random_graph(n, density, seed=seed)
+    return nx.relabel_nodes(graph, {v: v + 1 for v in graph})
+
+
+def make_solver(engine: str, graph: nx.Graph, checkpoint_path: str, observers: list = (), best_first: bool = False):
+    """ Solver from an empty incumbent without the rounding heuristic, so the search has work left when stopped """
+    problem = ProblemHandler(graph=graph, backend="highs")
+    problem.design_problem()
+    n = graph.number_of_nodes()
+    kwargs = dict(time_limit=120, stats=SolverStats(observers=list(observers)), checkpoint_path=checkpoint_path,
+                  checkpoint_interval=0, primal_interval=0,
+                  node_store=NodeStore(n) if best_first else None)
+    if engine == "bnb":
+        return BranchAndBound(problem, 0, [0.0] * n, **kwargs)
+    return BranchAndCut(problem, 0, [0.0] * n, graph, root_max_rounds=0, **kwargs)
+
+
+class StopAfter:
+    """ Observer that stops the search once the solver has visited `nodes` nodes """
+
+    def __init__(self, nodes: int):
+        self.nodes = nodes
+        self.solver = None
+
+    def __call__(self, event: dict) -> bool:
+        return False
+
+    @property
+    def stopped(self) -> bool:
+        return self.solver is not None and self.solver.call_counter >= self.nodes
+
+
+def start(solver, best_first: bool):
+    if best_first:
+        solver.run_best_first()
+    else:
+        solver.run()
+
+
+def test_open_nodes_cover_the_unexplored_siblings():
+    branch_path = [(3, 1, True), (5, 0, False), (7, 1, True)]
+    assert open_nodes(branch_path, [[(9, 0)]]) == [
+        [(3, 1), (5, 0), (7, 1)],
+        [(3, 1), (5, 0), (7, 0)],
+        [(3, 0)],
+        [(9, 0)],
+    ]
+
+
+@pytest.mark.parametrize("best_first", [False, True])
+@pytest.mark.parametrize("engine", ["bnb", "bnc"])
+@pytest.mark.parametrize("seed", range(3))
+def test_stopped_search_resumes_to_the_optimum(tmp_path, engine, best_first, seed):
+    graph = dimacs_graph(60, 0.5, seed)
+    omega = max(len(clique) for clique in nx.find_cliques(graph))
+    path = str(tmp_path / "search.json")
+
+    observer = StopAfter(4)
+    stopped = observer.solver = make_solver(engine, graph, path, observers=[observer], best_first=best_first)
+    with pytest.raises(SearchStopped):
+        start(stopped, best_first)
+    checkpoint = load_checkpoint(path)
+    assert checkpoint["open_nodes"] and checkpoint["nodes"] == stopped.call_counter
+    assert checkpoint["best_obj_value"] < omega
+
+    resumed = make_solver(engine, graph, path, best_first=best_first)
+    resumed.resume(checkpoint)
+    clique = resumed.get_best_clique()
+    assert all(graph.has_edge(u, v) for u in clique for v in clique if u != v)
+    assert resumed.best_obj_value == len(clique) == omega
+    assert not resumed.incomplete
+    assert resumed.call_counter > checkpoint["nodes"]
+
+
+def test_finished_checkpoint_has_no_open_nodes(tmp_path):
+    graph = dimacs_graph(30, 0.5, 0)
+    path = str(tmp_path / "search.json")
+    solver = make_solver("bnb", graph, path)
+    solver.run()
+    solver.save_checkpoint(finished=True)
+    checkpoint = load_checkpoint(path)
+    assert checkpoint["open_nodes"] == []
+    assert checkpoint["best_obj_value"] == max(len(clique) for clique in nx.find_cliques(graph))
+
+
+def test_checkpoint_of_another_model_is_rejected(tmp_path):
+    path = str(tmp_path / "search.json")
+    make_solver("bnb", dimacs_graph(30, 0.5, 0), path).save_checkpoint()
+    with pytest.raises(ValueError, match="variables"):
+        make_solver("bnb", dimacs_graph(31, 0.5, 0), path).resume(load_checkpoint(path))
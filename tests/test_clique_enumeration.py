@@ -0,0 +1,52 @@
+import time
+import networkx as nx
+import pytest
+from labsolvers.common.clique_enumeration import (clique_number, maximal_cliques, maximum_cliques,
+                                                  parallel_maximal_cliques)
+
+
+def as_set(cliques) -> set:
+    return {frozenset(clique) for clique in cliques}
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("density", [0.1, 0.5, 0.9])
+def test_maximal_cliques_match_networkx(seed, density):
+    graph = nx.gnp_random_graph(40, density, seed=seed)
+    cliques = list(maximal_cliques(graph))
+    # Each clique once
+    assert len(cliques) == len(as_set(cliques))
+    assert as_set(cliques) == as_set(nx.find_cliques(graph))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_size_filter_and_maximum_cliques(seed):
+    graph = nx.gnp_random_graph(45, 0.6, seed=seed)
+    reference = as_set(nx.find_cliques(graph))
+    omega = max(len(clique) for clique in reference)
+    assert clique_number(graph) == omega
+    assert as_set(maximal_cliques(graph, min_size=omega - 1)) == {c for c in reference if len(c) >= omega - 1}
+    assert as_set(maximum_cliques(graph)) == {c for c in reference if len(c) == omega}
+
+
+def test_neighbour_set_lists_use_0_based_vertices():
+    graph = nx.gnp_random_graph(30, 0.4, seed=7)
+    neighbour_sets = [set(graph[v]) for v in range(30)]
+    assert as_set(maximal_cliques(neighbour_sets)) == as_set(nx.find_cliques(graph))
+    assert clique_number([]) == 0 and list(maximal_cliques([])) == []
+
+
+def test_parallel_enumeration_keeps_the_serial_order():
+    graph = nx.gnp_random_graph(80, 0.3, seed=2)
+    assert list(parallel_maximal_cliques(graph, n_jobs=2, chunk_size=8)) == list(maximal_cliques(graph))
+
+
+def test_enumeration_scales_on_sparse_graphs():
+    # The degeneracy order keeps the candidate sets small; it used to take minutes to compute at this size
+    graph = nx.gnm_random_graph(8000, 40000, seed=0)
+    start = time.perf_counter()
+    cliques = maximal_cliques(graph)
+    next(cliques)
+    assert time.perf_counter() - start < 5
+    assert 1 + sum(1 for _ in cliques) == sum(1 for _ in nx.find_cliques(graph))
+    assert time.perf_counter() - start < 30
@@ -0,0 +1,44 @@
+import time
+import networkx as nx
+import pytest
+from labsolvers.BnC.decomposition import root_subproblems, solve_decomposed
+from labsolvers.common.independent_sets import bits, popcount
+
+
+def dimacs_graph(graph: nx.Graph) -> nx.Graph:
+    return nx.relabel_nodes(graph, {v: v + 1 for v in graph})
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_every_maximal_clique_lies_in_the_subproblem_of_its_earliest_vertex(seed):
+    graph = dimacs_graph(nx.gnp_random_graph(50, 0.3, seed=seed))
+    nodes, adjacency, subproblems = root_subproblems(graph)
+    degeneracy = max(nx.core_number(graph).values())
+    assert sorted(vertex for vertex, _ in subproblems) == list(range(50))
+    assert max(popcount(candidates) for _, candidates in subproblems) <= degeneracy
+    rank = {vertex: i for i, (vertex, _) in enumerate(subproblems)}
+    later = dict(subproblems)
+    for clique in nx.find_cliques(graph):
+        positions = [nodes.index(v) for v in clique]
+        first = min(positions, key=rank.get)
+        assert set(positions) - {first} <= set(bits(later[first]))
+
+
+def test_root_subproblems_scale_on_sparse_graphs():
+    graph = dimacs_graph(nx.gnm_random_graph(8000, 40000, seed=0))
+    start = time.perf_counter()
+    _, __, subproblems = root_subproblems(graph)
+    assert time.perf_counter() - start < 10
+    assert max(popcount(candidates) for _, candidates in subproblems) <= max(nx.core_number(graph).values())
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+@pytest.mark.parametrize("seed", range(3))
+def test_decomposition_finds_the_clique_number(seed, n_jobs):
+    pytest.importorskip("highspy")
+    graph = dimacs_graph(nx.gnp_random_graph(40, 0.4, seed=seed))
+    result = solve_decomposed(graph, [1], time_limit=120, backend="highs", n_jobs=n_jobs)
+    clique = result["solution"]
+    assert all(v in graph[u] for u in clique for v in clique if u != v)
+    assert result["objective"] == len(clique) == max(len(c) for c in nx.find_cliques(graph))
+    assert result["proved_optimal"]
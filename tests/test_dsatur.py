@@ -0,0 +1,90 @@
+import networkx as nx
+import pytest
+from labsolvers.week1.coloring import ColoringProblem, solve_instance
+from labsolvers.week1.dsatur import DSaturBranchAndBound
+
+
+def chromatic_number(neighbour_sets: list) -> int:
+    """ Smallest k with a proper k-colouring, by plain backtracking """
+    n = len(neighbour_sets)
+    colors = [0] * n
+
+    def extend(vertex, k, used):
+        if vertex == n:
+            return True
+        # A new colour only as the next unused one, so colour permutations are not tried again
+        for color in range(1, min(used + 1, k) + 1):
+            if all(colors[u] != color for u in neighbour_sets[vertex]):
+                colors[vertex] = color
+                if extend(vertex + 1, k, max(used, color)):
+                    return True
+        colors[vertex] = 0
+        return False
+
+    return next(k for k in range(n + 1) if extend(0, k, 0))
+
+
+def is_proper(neighbour_sets: list, colors: list) -> bool:
+    return all(colors[v] >= 1 for v in range(len(colors))) and \
+        all(colors[u] != colors[v] for u in range(len(colors)) for v in neighbour_sets[u])
+
+
+def neighbour_sets_of(graph: nx.Graph) -> list:
+    graph = nx.convert_node_labels_to_integers(graph)
+    return [set(graph[v]) for v in range(graph.number_of_nodes())]
+
+
+@pytest.mark.parametrize("seed", range(15))
+@pytest.mark.parametrize("density", [0.2, 0.5, 0.8])
+def test_exact_colouring_matches_brute_force(seed, density):
+    neighbour_sets = neighbour_sets_of(nx.gnp_random_graph(12, density, seed=seed))
+    solver = DSaturBranchAndBound(neighbour_sets)
+    bounds = solver.run()
+    assert bounds["optimal"] and bounds["lower_bound"] <= solver.upper_bound
+    assert is_proper(neighbour_sets, solver.colors)
+    assert solver.upper_bound == max(solver.colors) == chromatic_number(neighbour_sets)
+
+
+@pytest.mark.parametrize("graph", [
+    nx.cycle_graph(7),
+    nx.petersen_graph(),
+    nx.mycielski_graph(4),
+    nx.complement(nx.cycle_graph(7)),
+    nx.wheel_graph(8),
+], ids=["odd_cycle", "petersen", "mycielski4", "cycle_complement", "wheel"])
+def test_graphs_whose_clique_bound_is_not_tight(graph):
+    neighbour_sets = neighbour_sets_of(graph)
+    solver = DSaturBranchAndBound(neighbour_sets)
+    bounds = solver.run()
+    chi = chromatic_number(neighbour_sets)
+    assert bounds["lower_bound"] < chi
+    assert bounds["optimal"] and solver.upper_bound == chi and is_proper(neighbour_sets, solver.colors)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_exact_mode_improves_the_greedy_colouring(seed):
+    gp = ColoringProblem()
+    gp.neighbour_sets = neighbour_sets_of(nx.gnp_random_graph(14, 0.5, seed=seed))
+    gp.colors = [0] * 14
+    result = solve_instance(gp, exact=True, check=True)
+    assert result["valid"] and result["optimal"]
+    assert result["objective"] == chromatic_number(gp.neighbour_sets)
+    assert sorted(v for color_class in result["solution"] for v in color_class) == list(range(1, 15))
+
+
+def test_low_degree_vertices_are_coloured_after_the_core():
+    # A 5-clique with a long path hanging off it: the path is peeled and coloured greedily afterwards
+    graph = nx.complete_graph(5)
+    nx.add_path(graph, range(4, 30))
+    neighbour_sets = neighbour_sets_of(graph)
+    solver = DSaturBranchAndBound(neighbour_sets)
+    solver.run()
+    assert solver.upper_bound == 5 and is_proper(neighbour_sets, solver.colors)
+
+
+def test_time_limit_keeps_the_best_colouring_found():
+    neighbour_sets = neighbour_sets_of(nx.gnp_random_graph(70, 0.5, seed=0))
+    solver = DSaturBranchAndBound(neighbour_sets, time_limit=0.0)
+    bounds = solver.run()
+    assert is_proper(neighbour_sets, solver.colors)
+    assert bounds["lower_bound"] <= solver.upper_bound == max(solver.colors)
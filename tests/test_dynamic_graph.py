@@ -0,0 +1,110 @@
+import random
+import pytest
+from labsolvers.common.csr_graph import CSRGraph
+from labsolvers.common.dynamic_graph import DynamicClique, DynamicColoring
+from labsolvers.common.graph_cache import graph_data
+from labsolvers.week1.coloring import ColoringProblem
+from labsolvers.week2.clique import MaxCliqueProblem
+
+
+def random_neighbour_sets(n: int, density: float, seed: int) -> list:
+    rng = random.Random(seed)
+    neighbour_sets = [set() for _ in range(n)]
+    for u in range(n):
+        for v in range(u + 1, n):
+            if rng.random() < density:
+                neighbour_sets[u].add(v)
+                neighbour_sets[v].add(u)
+    return neighbour_sets
+
+
+def random_edits(neighbour_sets: list, steps: int, seed: int):
+    """ Yields (u, v, add) with add True for an absent edge, so every step changes the graph """
+    rng = random.Random(seed)
+    n = len(neighbour_sets)
+    for _ in range(steps):
+        u, v = rng.sample(range(n), 2)
+        yield u, v, v not in neighbour_sets[u]
+
+
+def coloring_problem(n: int, density: float, seed: int) -> ColoringProblem:
+    gp = ColoringProblem()
+    gp.neighbour_sets = random_neighbour_sets(n, density, seed)
+    gp.colors = [0] * n
+    gp.greedy_graph_coloring()
+    return gp
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("density", [0.1, 0.5, 0.9])
+def test_recolouring_stays_proper(seed, density):
+    gp = coloring_problem(40, density, seed)
+    dc = DynamicColoring(gp, max_chain=20)
+    for u, v, add in random_edits(gp.neighbour_sets, 300, seed):
+        if add:
+            dc.add_edge(u, v)
+        else:
+            dc.remove_edge(u, v)
+        assert gp.check()
+        assert gp.maxColor == max(gp.colors) == len(dc.classes) - 1
+        assert all(dc.classes[1:])
+        assert all(vertex in dc.classes[color] for vertex, color in enumerate(gp.colors))
+    assert dc.updates == 300
+
+
+def test_removals_never_add_colours():
+    gp = coloring_problem(30, 0.5, 0)
+    dc = DynamicColoring(gp)
+    edges = [(u, v) for u in range(30) for v in gp.neighbour_sets[u] if u < v]
+    random.Random(0).shuffle(edges)
+    for u, v in edges:
+        before = gp.maxColor
+        dc.remove_edge(u, v)
+        assert gp.check() and gp.maxColor <= before
+    assert not any(gp.neighbour_sets)
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("density", [0.2, 0.6, 0.9])
+def test_best_clique_stays_a_clique(seed, density):
+    mcp = MaxCliqueProblem()
+    mcp.neighbour_sets = random_neighbour_sets(40, density, seed)
+    mcp.colors = [0] * 40
+    dynamic = DynamicClique(mcp)
+    mcp.best_clique = dynamic._extend([0])
+    for u, v, add in random_edits(mcp.neighbour_sets, 300, seed):
+        if add:
+            dynamic.add_edge(u, v)
+        else:
+            dynamic.remove_edge(u, v)
+        assert mcp.check()
+        assert len(mcp.best_clique) >= 1
+
+
+def test_added_edge_can_grow_the_clique():
+    mcp = MaxCliqueProblem()
+    mcp.neighbour_sets = [{1, 2}, {0, 2}, {0, 1, 3}, {2}]
+    mcp.best_clique = [0, 1, 2]
+    dynamic = DynamicClique(mcp)
+    dynamic.apply(added=[(0, 3), (1, 3)])
+    assert sorted(mcp.best_clique) == [0, 1, 2, 3] and dynamic.improvements == 1
+
+
+def test_compact_graphs_are_rejected():
+    gp = ColoringProblem()
+    gp.neighbour_sets = CSRGraph.from_edges(3, [(0, 1), (1, 2)])
+    gp.colors = [1, 2, 1]
+    with pytest.raises(TypeError):
+        DynamicColoring(gp)
+
+
+def test_edits_invalidate_the_graph_cache():
+    gp = coloring_problem(20, 0.3, 1)
+    dc = DynamicColoring(gp)
+    graph_data(gp.neighbour_sets).degrees
+    u, v, _ = next(random_edits(gp.neighbour_sets, 1, 1))
+    if v in gp.neighbour_sets[u]:
+        dc.remove_edge(u, v)
+    else:
+        dc.add_edge(u, v)
+    assert graph_data(gp.neighbour_sets).degrees.tolist() == [len(neighbours) for neighbours in gp.neighbour_sets]
@@ -0,0 +1,45 @@
+import time
+import networkx as nx
+import pytest
+from labsolvers.common.csr_graph import CSRGraph
+from labsolvers.common.graph_cache import GraphCache
+from labsolvers.common.independent_sets import smallest_last_order
+
+
+def later_neighbours(graph: nx.Graph, order: list, nodes: list) -> int:
+    """ Most neighbours of a vertex that come before it in the smallest-last order """
+    position = {nodes[i]: rank for rank, i in enumerate(order)}
+    return max((sum(position[u] < position[v] for u in graph[v]) for v in graph), default=0)
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("density", [0.05, 0.3, 0.8])
+def test_core_numbers_and_smallest_last_order_match_networkx(seed, density):
+    graph = nx.gnp_random_graph(60, density, seed=seed)
+    data = GraphCache().get(graph)
+    cores = nx.core_number(graph)
+    assert data.core_numbers.tolist() == [cores[v] for v in data.nodes]
+    assert sorted(data.degeneracy_order) == list(range(60))
+    assert later_neighbours(graph, data.degeneracy_order, data.nodes) == max(cores.values())
+    assert smallest_last_order(data.adjacency) == data.degeneracy_order
+
+
+def test_graph_types_give_the_same_cores():
+    graph = nx.gnm_random_graph(200, 800, seed=3)
+    csr = CSRGraph.from_edges(200, sorted(graph.edges()))
+    neighbour_sets = [set(graph[v]) for v in range(200)]
+    degeneracy = max(nx.core_number(graph).values())
+    for data in (GraphCache().get(g) for g in (graph, csr, neighbour_sets)):
+        # Ties may break differently with the neighbour order, the degeneracy bound holds for every type
+        assert data.core_numbers.tolist() == [nx.core_number(graph)[v] for v in range(200)]
+        assert later_neighbours(graph, data.degeneracy_order, list(range(200))) == degeneracy
+
+
+def test_smallest_last_order_is_linear_on_sparse_graphs():
+    # The order used to cost a scan of all remaining vertices per removal, 80 s at this size
+    graph = nx.gnm_random_graph(8000, 40000, seed=0)
+    start = time.perf_counter()
+    data = GraphCache().get(graph)
+    order = data.degeneracy_order
+    assert time.perf_counter() - start < 10
+    assert later_neighbours(graph, order, data.nodes) == max(nx.core_number(graph).values())
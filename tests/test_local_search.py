@@ -0,0 +1,74 @@
+import random
+import networkx as nx
+import pytest
+from labsolvers.common.local_search import improve_clique, round_to_clique
+
+
+def random_neighbour_sets(n: int, density: float, seed: int) -> list:
+    rng = random.Random(seed)
+    neighbour_sets = [set() for _ in range(n)]
+    for u in range(n):
+        for v in range(u + 1, n):
+            if rng.random() < density:
+                neighbour_sets[u].add(v)
+                neighbour_sets[v].add(u)
+    return neighbour_sets
+
+
+def is_clique(neighbour_sets: list, clique: list) -> bool:
+    return len(set(clique)) == len(clique) and all(v in neighbour_sets[u] for u in clique for v in clique if u != v)
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("density", [0.1, 0.5, 0.9])
+def test_rounding_gives_a_maximal_clique(seed, density):
+    neighbour_sets = random_neighbour_sets(40, density, seed)
+    rng = random.Random(seed)
+    # LP values with many ties, as a fractional vertex LP has
+    values = [rng.choice([0.0, 0.25, 0.5, 1.0, rng.random()]) for _ in range(40)]
+    clique = round_to_clique(neighbour_sets, values)
+    assert is_clique(neighbour_sets, clique)
+    outside = set(range(40)) - set(clique)
+    assert not any(all(u in neighbour_sets[v] for v in clique) for u in outside)
+
+
+def test_rounding_uses_positions_of_the_sorted_nx_nodes():
+    # Vertices 1..n of a DIMACS graph are positions 0..n-1 of the LP solution
+    graph = nx.Graph([(1, 2), (2, 3), (3, 1), (3, 4)])
+    assert sorted(round_to_clique(graph, [0.5, 0.5, 1.0, 0.9])) == [2, 3]
+    assert sorted(round_to_clique(graph, [1.0, 0.9, 0.8, 0.7])) == [0, 1, 2]
+
+
+def test_rounding_prefers_larger_values():
+    neighbour_sets = random_neighbour_sets(30, 0.5, 0)
+    values = [0.0] * 30
+    values[7] = 1.0
+    assert round_to_clique(neighbour_sets, values)[0] == 7
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_local_search_keeps_a_clique_no_smaller_than_the_start(seed):
+    neighbour_sets = random_neighbour_sets(50, 0.6, 100 + seed)
+    start = round_to_clique(neighbour_sets, [random.Random(seed).random() for _ in range(50)])
+    clique = improve_clique(neighbour_sets, start, max_steps=200, seed=seed)
+    assert is_clique(neighbour_sets, clique)
+    assert len(clique) >= len(start)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_branch_and_bound_incumbents_from_rounding_are_cliques(seed):
+    pytest.importorskip("highspy")
+    from labsolvers.BnB.branch_and_bound import BranchAndBound
+    from labsolvers.common.problem import ProblemHandler
+    graph = nx.gnp_random_graph(35, 0.6, seed=seed)
+    graph = nx.relabel_nodes(graph, {v: v + 1 for v in graph})
+    problem = ProblemHandler(graph=graph, backend="highs")
+    problem.design_problem()
+    # The rounding heuristic at every node, from an empty incumbent
+    algorithm = BranchAndBound(problem, 0, [0.0] * 35, time_limit=60, primal_interval=1)
+    algorithm.run()
+    clique = algorithm.get_best_clique()
+    neighbour_sets = {v: set(graph[v]) for v in graph}
+    assert all(v in neighbour_sets[u] for u in clique for v in clique if u != v)
+    assert len(clique) == algorithm.best_obj_value == max(len(c) for c in nx.find_cliques(graph))
+    assert algorithm.stats.phase_counts["primal_heuristic"] > 0
@@ -0,0 +1,88 @@
+import os
+import random
+import pytest
+from labsolvers.common.node_store import NodeStore
+
+
+def random_node(rng: random.Random, num_vars: int) -> list:
+    return sorted((var_index, rng.randint(0, 1)) for var_index in rng.sample(range(num_vars), rng.randint(0, 6)))
+
+
+def test_encode_decode_round_trip():
+    store = NodeStore(21)
+    node = [(0, 1), (3, 0), (8, 1), (20, 1)]
+    store.push(node, 5.0)
+    assert store.pop() == (5.0, node)
+
+
+@pytest.mark.parametrize("max_in_memory", [None, 7, 50])
+@pytest.mark.parametrize("seed", range(5))
+def test_pops_follow_priority_through_spills_and_reloads(tmp_path, max_in_memory, seed):
+    rng = random.Random(seed)
+    store = NodeStore(30, spill_dir=str(tmp_path), max_in_memory=max_in_memory, reload_size=4)
+    reference = []
+    for step in range(1500):
+        if reference and rng.random() < 0.45:
+            assert store.best_bound() >= max(bound for bound, _ in reference)
+            bound, node = store.pop()
+            # Ties are allowed in any order
+            assert bound == max(bound for bound, _ in reference)
+            reference.remove((bound, node))
+        else:
+            bound = rng.randint(0, 20) + rng.choice([0.0, 0.5, rng.random()])
+            node = random_node(rng, 30)
+            store.push(node, bound)
+            reference.append((bound, node))
+        assert len(store) == len(reference)
+    if max_in_memory is not None:
+        assert store.spilled > 0
+    while reference:
+        bound, node = store.pop()
+        assert bound == max(bound for bound, _ in reference)
+        reference.remove((bound, node))
+    assert len(store) == 0 and store.best_bound() is None
+    assert store.reloaded == store.spilled and not store.segments
+    store.close()
+
+
+def test_priority_orders_nodes_and_bound_is_kept(tmp_path):
+    store = NodeStore(10, spill_dir=str(tmp_path), max_in_memory=3, reload_size=2)
+    for i in range(10):
+        # Priority against the bound order
+        store.push([(i, 1)], bound=float(i), priority=float(-i))
+    assert store.best_bound() == 9.0
+    assert [store.pop() for _ in range(10)] == [(float(i), [(i, 1)]) for i in range(10)]
+
+
+def test_best_bound_drops_as_spilled_chunks_are_used(tmp_path):
+    store = NodeStore(8, spill_dir=str(tmp_path), max_in_memory=16, reload_size=4)
+    for i in range(17):
+        store.push([], float(i))
+    assert len(store.segments) == 1 and store.best_bound() == 16.0
+    bounds = [store.pop()[0] for _ in range(13)]
+    assert bounds == [float(i) for i in range(16, 3, -1)]
+    # Only the last chunk of the segment is left
+    assert store.best_bound() == 3.0
+
+
+def test_all_fixings_and_close_remove_spill_files(tmp_path):
+    store = NodeStore(12, spill_dir=str(tmp_path), max_in_memory=4, reload_size=2)
+    nodes = [[(i, 1), (11 - i, 0)] for i in range(11)]
+    for i, node in enumerate(nodes):
+        store.push(node, float(i))
+    assert os.listdir(tmp_path)
+    assert store.all_fixings() == [sorted(node) for node in reversed(nodes)]
+    store.pop()
+    assert len(store.all_fixings()) == 10
+    store.close()
+    assert not os.listdir(tmp_path) and len(store) == 0
+
+
+def test_own_spill_dir_is_deleted():
+    store = NodeStore(4, max_in_memory=2)
+    for i in range(5):
+        store.push([(i % 4, 1)], float(i))
+    spill_dir = store.spill_dir
+    assert os.path.isdir(spill_dir)
+    store.close()
+    assert not os.path.exists(spill_dir)
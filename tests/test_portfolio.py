@@ -0,0 +1,43 @@
+import multiprocessing
+import time
+import networkx as nx
+import pytest
+from labsolvers import portfolio
+from labsolvers.common.incumbent import SharedIncumbent
+from labsolvers.week2.clique import MaxCliqueProblem
+
+
+def write_dimacs(graph: nx.Graph, path) -> str:
+    """ DIMACS file of a graph on 0..n-1, written with vertices 1..n """
+    lines = [f"p edge {graph.number_of_nodes()} {graph.number_of_edges()}"]
+    lines += [f"e {u + 1} {v + 1}" for u, v in graph.edges()]
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+@pytest.mark.parametrize("randomization", range(4))
+def test_randomized_clique_is_a_clique(tmp_path, randomization):
+    mcp = MaxCliqueProblem()
+    mcp.read_graph_from_file(write_dimacs(nx.gnp_random_graph(60, 0.6, seed=randomization), tmp_path / "g.clq"))
+    clique = mcp.randomized_clique(randomization)
+    assert clique is mcp.get_clique() and clique and mcp.check()
+
+
+def test_local_search_offers_only_cliques(tmp_path):
+    graph = nx.gnp_random_graph(60, 0.6, seed=1)
+    shared = SharedIncumbent(multiprocessing.get_context("spawn"))
+    portfolio._run_local_search(write_dimacs(graph, tmp_path / "g.clq"), time.time() + 0.5, shared)
+    offers = shared.drain(timeout=1.0)
+    assert offers and shared.best == len(offers[-1][1])
+    for source, clique in offers:
+        assert source == "local_search"
+        assert all(graph.has_edge(u - 1, v - 1) for u in clique for v in clique if u != v)
+
+
+def test_portfolio_proves_the_clique_number(tmp_path):
+    pytest.importorskip("highspy")
+    graph = nx.gnp_random_graph(50, 0.5, seed=3)
+    instance = portfolio.load_instance(write_dimacs(graph, tmp_path / "g.clq"), backend="highs")
+    result = portfolio.solve_instance(instance, time_limit=120)
+    assert result["objective"] == max(len(clique) for clique in nx.find_cliques(graph))
+    assert result["proved_by"] in ("bnb", "bnc") and result["engines"][result["proved_by"]]["proved_optimal"]
@@ -0,0 +1,71 @@
+import networkx as nx
+import pytest
+from labsolvers.common.reduced_cost import reduced_cost_fixings
+
+
+def dimacs_graph(n: int, density: float, seed: int) -> nx.Graph:
+    graph = nx.gnp_random_graph(n, density, seed=seed)
+    return nx.relabel_nodes(graph, {v: v + 1 for v in graph})
+
+
+def test_only_variables_at_a_bound_with_a_large_reduced_cost_are_fixed():
+    values = [0.0, 1.0, 0.5, 0.0, 1.0, 0.0]
+    reduced_costs = [-3.0, 2.5, -3.0, -0.5, 3.0, 0.0]
+    constrained = [False, False, False, False, True, False]
+    # obj 10.2 and incumbent 8: a flip costing more than 1.2 leaves no clique of size 9
+    assert reduced_cost_fixings(10.2, values, reduced_costs, 8, constrained) == [(0, 0.0), (1, 1.0)]
+    # With a weaker incumbent nothing can be fixed
+    assert reduced_cost_fixings(10.2, values, reduced_costs, 6, constrained) == []
+
+
+def root_lp(graph: nx.Graph):
+    pytest.importorskip("highspy")
+    from labsolvers.common.problem import ProblemHandler
+    problem = ProblemHandler(graph=graph, backend="highs")
+    problem.design_problem()
+    assert problem.model.solve()
+    return problem
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("density", [0.3, 0.6, 0.85])
+def test_root_fixings_keep_every_maximum_clique(seed, density):
+    graph = dimacs_graph(35, density, seed)
+    cliques = list(nx.find_cliques(graph))
+    omega = max(len(clique) for clique in cliques)
+    problem = root_lp(graph)
+    model = problem.model
+    # Incumbent one below the optimum: every maximum clique is a better solution that must survive the fixings
+    fixings = reduced_cost_fixings(model.get_objective_value(), model.get_values(), model.get_reduced_costs(),
+                                   omega - 1, [False] * 35)
+    for clique in (clique for clique in cliques if len(clique) == omega):
+        positions = {problem.nodes.index(v) for v in clique}
+        assert all((index in positions) == (value == 1.0) for index, value in fixings)
+
+
+@pytest.mark.parametrize("engine", ["bnb", "bnc"])
+@pytest.mark.parametrize("seed", range(4))
+def test_fixing_on_and_off_reach_the_same_optimum(engine, seed):
+    pytest.importorskip("highspy")
+    from labsolvers.BnB.branch_and_bound import BranchAndBound
+    from labsolvers.BnC.branch_and_cut import BranchAndCut
+    from labsolvers.common.problem import ProblemHandler
+    graph = dimacs_graph(50, 0.6, seed)
+    best = max(nx.find_cliques(graph), key=len)
+    # Start from a clique one below the optimum, where a wrong fixing would lose the only improvement
+    start = sorted(best)[1:]
+    results = []
+    for reduced_cost_fixing in (False, True):
+        problem = ProblemHandler(graph=graph, backend="highs")
+        problem.design_problem()
+        initial = [1.0 if v in start else 0.0 for v in problem.nodes]
+        kwargs = dict(time_limit=120, reduced_cost_fixing=reduced_cost_fixing, primal_interval=0)
+        solver = (BranchAndBound(problem, len(start), initial, **kwargs) if engine == "bnb" else
+                  BranchAndCut(problem, len(start), initial, graph, **kwargs))
+        solver.run()
+        clique = solver.get_best_clique()
+        assert all(graph.has_edge(u, v) for u in clique for v in clique if u != v)
+        assert not solver.incomplete
+        results.append((solver.best_obj_value, solver.stats.phase_counts["rc_fixed"]))
+    assert results[0][0] == results[1][0] == len(best)
+    assert results[0][1] == 0 and results[1][1] > 0
@@ -0,0 +1,81 @@
+import json
+import pytest
+from labsolvers.common.solver_params import (DEFAULT_PROFILES, graph_family, instance_params, load_profiles,
+                                             profile_params, save_profiles)
+
+
+def write(tmp_path, content) -> str:
+    path = tmp_path / "profiles.json"
+    path.write_text(content if isinstance(content, str) else json.dumps(content))
+    return str(path)
+
+
+@pytest.mark.parametrize("content", [
+    "",
+    "{\"profiles\": {",
+    "{'profiles': {}}",
+])
+def test_invalid_json_is_a_value_error_naming_the_file(tmp_path, content):
+    path = write(tmp_path, content)
+    with pytest.raises(ValueError, match="profiles.json"):
+        load_profiles(path)
+
+
+@pytest.mark.parametrize("content", [
+    [],
+    "\"dual\"",
+    {"profiles": []},
+    {"families": "brock"},
+    {"profiles": {"fast": ["lpmethod", 2]}},
+    {"profiles": {"fast": {"cplex": 2}}},
+    {"families": {"brock": {"cplex": {}}}},
+    {"default": 3},
+])
+def test_badly_laid_out_file_is_a_value_error(tmp_path, content):
+    with pytest.raises(ValueError, match="profiles.json"):
+        load_profiles(write(tmp_path, content))
+
+
+def test_missing_file_is_an_os_error(tmp_path):
+    with pytest.raises(OSError):
+        load_profiles(str(tmp_path / "missing.json"))
+
+
+def test_round_trip_and_defaults(tmp_path):
+    config = {"profiles": {"fast": {"highs": {"presolve": "off"}}}, "families": {"brock": "fast"}, "default": "dual"}
+    path = str(tmp_path / "profiles.json")
+    save_profiles(path, config)
+    assert load_profiles(path) == config
+    assert load_profiles(write(tmp_path, {})) == {"profiles": {}, "families": {}}
+
+
+def test_instance_params_by_family(tmp_path):
+    config = load_profiles(write(tmp_path, {"profiles": {"fast": {"highs": {"presolve": "off"}}},
+                                            "families": {"brock": "fast"}, "default": "dual"}))
+    assert instance_params(config, "graphs/brock200_1.clq", "highs") == {"presolve": "off"}
+    assert instance_params(config, "graphs/brock200_1.clq", "cplex") == {}
+    assert instance_params(config, "graphs/C125.9.clq", "highs") == DEFAULT_PROFILES["dual"]["highs"]
+    assert instance_params({"profiles": {}, "families": {}}, "graphs/C125.9.clq", "highs") == {}
+
+
+def test_unknown_profile_is_a_key_error():
+    with pytest.raises(KeyError, match="missing"):
+        profile_params({"families": {"brock": "missing"}}, "missing", "highs")
+
+
+@pytest.mark.parametrize("file_path, family", [
+    ("brock200_1.clq", "brock"),
+    ("dir/p_hat300-1.clq", "p_hat"),
+    ("C125.9.clq", "C"),
+    ("MANN_a27.clq", "MANN"),
+    ("johnson8-2-4.clq", "johnson"),
+])
+def test_graph_family(file_path, family):
+    assert graph_family(file_path) == family
+
+
+def test_unknown_highs_option_is_rejected():
+    pytest.importorskip("highspy")
+    from labsolvers.common.lp_backend import create_backend
+    with pytest.raises(ValueError, match="no_such_option"):
+        create_backend("highs", {"no_such_option": 1})
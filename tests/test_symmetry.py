@@ -0,0 +1,118 @@
+import networkx as nx
+import pytest
+from networkx.algorithms.isomorphism import GraphMatcher
+from labsolvers.common.symmetry import adjacency_matrix, orbital_nodes, orbits
+
+
+def integer_graph(graph: nx.Graph) -> nx.Graph:
+    return nx.convert_node_labels_to_integers(nx.Graph(graph), ordering="sorted")
+
+
+def twin_graph(seed: int) -> nx.Graph:
+    """ Two copies of a random graph joined by a perfect matching, so swapping the copies is an automorphism """
+    base = nx.gnp_random_graph(9, 0.5, seed=seed)
+    graph = nx.disjoint_union(base, base)
+    graph.add_edges_from((v, v + 9) for v in range(9))
+    return graph
+
+
+SYMMETRIC_GRAPHS = {
+    "petersen": nx.petersen_graph(),
+    "cube": integer_graph(nx.hypercube_graph(3)),
+    "cycle_complement": nx.complement(nx.cycle_graph(9)),
+    "circulant": nx.circulant_graph(12, [1, 3, 4]),
+    "rook": integer_graph(nx.cartesian_product(nx.complete_graph(3), nx.complete_graph(4))),
+    "cliques": nx.disjoint_union_all([nx.complete_graph(3), nx.complete_graph(3), nx.complete_graph(4)]),
+    "paley": integer_graph(nx.paley_graph(13).to_undirected()),
+    **{f"twins{seed}": twin_graph(seed) for seed in range(3)},
+}
+
+
+def true_orbits(graph: nx.Graph) -> list:
+    parent = {v: v for v in graph}
+
+    def find(v):
+        while parent[v] != v:
+            v = parent[v]
+        return v
+
+    for mapping in GraphMatcher(graph, graph).isomorphisms_iter():
+        for source, target in mapping.items():
+            parent[find(source)] = find(target)
+    groups = dict()
+    for v in sorted(graph):
+        groups.setdefault(find(v), []).append(v)
+    return sorted(groups.values())
+
+
+@pytest.mark.parametrize("name", ["petersen", "cube", "cycle_complement", "circulant", "rook", "cliques", "paley"])
+def test_orbits_of_symmetric_graphs(name):
+    graph = SYMMETRIC_GRAPHS[name]
+    assert orbits(adjacency_matrix(graph, sorted(graph))) == true_orbits(graph)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_orbits_never_join_inequivalent_vertices(seed):
+    graph = nx.gnp_random_graph(12, 0.4, seed=seed)
+    found = orbits(adjacency_matrix(graph, sorted(graph)), budget=5)
+    owner = {v: i for i, orbit in enumerate(true_orbits(graph)) for v in orbit}
+    assert all(len({owner[v] for v in orbit}) == 1 for orbit in found)
+
+
+def best_in_node(graph: nx.Graph, node: list) -> int:
+    """ Largest clique that agrees with the fixings of a node, by brute force """
+    ones = [v for v, value in node if value == 1.0]
+    zeros = {v for v, value in node if value == 0.0}
+    if any(not graph.has_edge(u, v) for u in ones for v in ones if u != v):
+        return 0
+    allowed = set(graph) - zeros - set(ones)
+    for v in ones:
+        allowed &= set(graph[v])
+    rest = graph.subgraph(allowed)
+    return len(ones) + max((len(clique) for clique in nx.find_cliques(rest)), default=0)
+
+
+@pytest.mark.parametrize("depth", [1, 2, 3])
+@pytest.mark.parametrize("name", sorted(SYMMETRIC_GRAPHS))
+def test_orbital_nodes_keep_a_maximum_clique(name, depth):
+    graph = SYMMETRIC_GRAPHS[name]
+    nodes = orbital_nodes(adjacency_matrix(graph, sorted(graph)), depth)
+    assert nodes is not None
+    omega = max(len(clique) for clique in nx.find_cliques(graph))
+    assert max(best_in_node(graph, node) for node in nodes) == omega
+    # Vertices fixed to 1 in a node are pairwise adjacent
+    for node in nodes:
+        ones = [v for v, value in node if value == 1.0]
+        assert all(graph.has_edge(u, v) for u in ones for v in ones if u != v)
+
+
+def test_asymmetric_graphs_have_no_orbital_nodes():
+    # The smallest asymmetric graphs have 6 vertices
+    graph = nx.Graph([(0, 1), (1, 2), (2, 3), (3, 4), (2, 4), (1, 5), (4, 5)])
+    assert true_orbits(graph) == [[v] for v in range(6)]
+    assert orbital_nodes(adjacency_matrix(graph, sorted(graph))) is None
+
+
+@pytest.mark.parametrize("engine", ["bnb", "bnc"])
+@pytest.mark.parametrize("name", ["circulant", "paley", "twins0", "twins1"])
+def test_orbital_branching_reaches_the_optimum(engine, name):
+    pytest.importorskip("highspy")
+    from labsolvers.BnB.branch_and_bound import BranchAndBound
+    from labsolvers.BnC.branch_and_cut import BranchAndCut
+    from labsolvers.common.problem import ProblemHandler
+    graph = nx.relabel_nodes(SYMMETRIC_GRAPHS[name], {v: v + 1 for v in SYMMETRIC_GRAPHS[name]})
+    omega = max(len(clique) for clique in nx.find_cliques(graph))
+    for depth in (0, 1, 2):
+        problem = ProblemHandler(graph=graph, backend="highs")
+        problem.design_problem()
+        n = graph.number_of_nodes()
+        kwargs = dict(time_limit=120, primal_interval=0)
+        solver = (BranchAndBound(problem, 0, [0.0] * n, **kwargs) if engine == "bnb" else
+                  BranchAndCut(problem, 0, [0.0] * n, graph, **kwargs))
+        if depth:
+            solver.run_nodes(orbital_nodes(adjacency_matrix(problem.graph, problem.nodes), depth))
+        else:
+            solver.run()
+        clique = solver.get_best_clique()
+        assert all(graph.has_edge(u, v) for u in clique for v in clique if u != v)
+        assert solver.best_obj_value == len(clique) == omega
@@ -0,0 +1,74 @@
+import networkx as nx
+import numpy as np
+import pytest
+from labsolvers.common.csr_graph import CSRGraph
+from labsolvers.common.vector_coloring import first_free_colors, iterated_greedy, jones_plassmann
+from labsolvers.week1.coloring import ColoringProblem
+
+
+def csr_graph(graph: nx.Graph) -> CSRGraph:
+    return CSRGraph.from_edges(graph.number_of_nodes(), np.array(list(graph.edges()), dtype=np.int32).reshape(-1, 2))
+
+
+def assert_proper(graph: nx.Graph, colors: np.ndarray):
+    assert len(colors) == graph.number_of_nodes() and (colors >= 1).all()
+    assert all(colors[u] != colors[v] for u, v in graph.edges())
+    assert colors.max(initial=0) <= max((d for _, d in graph.degree()), default=0) + 1
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_first_free_colors_match_a_plain_scan(seed):
+    rng = np.random.default_rng(seed)
+    graph = nx.gnp_random_graph(60, 0.2, seed=seed)
+    vertices = np.array(sorted(nx.maximal_independent_set(graph, seed=seed)))
+    colors = rng.integers(0, 6, 60).astype(np.int32)
+    colors[vertices] = 0
+    expected = []
+    for v in vertices:
+        taken = {int(colors[u]) for u in graph[v]}
+        expected.append(next(c for c in range(1, 62) if c not in taken))
+    assert first_free_colors(csr_graph(graph), vertices, colors).tolist() == expected
+
+
+@pytest.mark.parametrize("priority", ["degree", "random"])
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("density", [0.02, 0.1, 0.5])
+def test_jones_plassmann_colourings_are_proper(priority, seed, density):
+    graph = nx.gnp_random_graph(200, density, seed=seed)
+    assert_proper(graph, jones_plassmann(csr_graph(graph), priority, seed))
+
+
+def test_isolated_vertices_and_empty_graphs():
+    assert jones_plassmann(CSRGraph.from_edges(0, [])).tolist() == []
+    assert jones_plassmann(CSRGraph.from_edges(4, [(0, 1)])).tolist().count(1) == 3
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_iterated_greedy_stays_proper_and_never_adds_colours(seed):
+    graph = nx.gnp_random_graph(150, 0.1, seed=seed)
+    csr = csr_graph(graph)
+    start = jones_plassmann(csr, "random", seed)
+    counts = [int(start.max())]
+    for passes in range(1, 7):
+        colors = iterated_greedy(csr, start, passes, seed)
+        assert_proper(graph, colors)
+        counts.append(int(colors.max()))
+    assert counts == sorted(counts, reverse=True)
+
+
+def test_iterated_greedy_recolours_a_colouring_with_one_colour_per_vertex():
+    graph = nx.gnp_random_graph(100, 0.05, seed=1)
+    csr = csr_graph(graph)
+    colors = iterated_greedy(csr, np.arange(1, 101, dtype=np.int32), passes=1)
+    # assert_proper also bounds the colours by the largest degree plus one
+    assert_proper(graph, colors)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_vectorized_coloring_of_a_coloring_problem(compact):
+    graph = nx.gnp_random_graph(120, 0.15, seed=4)
+    gp = ColoringProblem()
+    gp.neighbour_sets = csr_graph(graph) if compact else [set(graph[v]) for v in range(120)]
+    gp.colors = [0] * 120
+    gp.vectorized_graph_coloring(passes=3)
+    assert gp.check() and gp.maxColor == max(gp.colors)